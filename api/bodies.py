@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+
+
+class BodyError(ValueError):
+    pass
+
+
+def iter_ndjson(stream, *, chunk_size: int = CHUNK_SIZE):
+    # One JSON document per line, read from the request stream chunk by chunk.
+    buffer = b''
+    line_no = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        lines = buffer.split(b'\n')
+        buffer = lines.pop()
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield _loads(line, line_no)
+    if buffer.strip():
+        yield _loads(buffer, line_no + 1)
+
+
+def _loads(line: bytes, line_no: int):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise BodyError(f'Invalid JSON on line {line_no}: {e}') from None
+
+
+def iter_json_array(stream, *, chunk_size: int = CHUNK_SIZE):
+    # Incrementally decode the elements of a top-level JSON array without
+    # holding the whole body in memory. `pos` walks the buffer: each element
+    # is one call into the C scanner at `pos` plus one regex match for the
+    # separator, and the consumed prefix is only dropped when a new chunk is
+    # appended, so nothing is re-sliced per element.
+    scan = json.JSONDecoder().scan_once
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            text = text_decoder.decode(b'', final=True)
+        else:
+            text = text_decoder.decode(chunk)
+        buffer = buffer[pos:] + text
+        pos = 0
+
+    def next_char():
+        # Skip whitespace and return the next significant character ('' at EOF).
+        nonlocal pos
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            fill()
+
+    if next_char() != '[':
+        raise BodyError('Expected a JSON array')
+    pos += 1
+
+    if next_char() == ']':
+        return
+    while True:
+        try:
+            value, end = scan(buffer, pos)
+        except StopIteration as e:
+            error = json.JSONDecodeError('Expecting value', buffer, e.value)
+        except ValueError as e:
+            error = e
+        else:
+            separator = SEPARATOR.match(buffer, end)
+            if separator:
+                pos = separator.end()
+                yield value
+                if separator.group(1) == ']':
+                    return
+                continue
+            if not NUMBER_TAIL.match(buffer, WHITESPACE.match(buffer, end).end()):
+                raise BodyError('Expected "," or "]" in JSON array')
+            # The element runs to the end of the buffer, so a number could
+            # still be incomplete ("1." or "2e"): decode it again once more
+            # has been read.
+            error = None
+        if eof:
+            if error is None:
+                raise BodyError('Expected "," or "]" in JSON array')
+            raise BodyError(f'Invalid JSON array element: {error}')
+        fill()
+        # Whitespace after a separator can continue into the new chunk.
+        pos = WHITESPACE.match(buffer, pos).end()
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+MISSING = object()
+
+
+def _default(value):
+    # The non-JSON types a student row can hold, tagged so a read returns
+    # what the database did.
+    if isinstance(value, decimal.Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    raise TypeError(f'Cannot cache {type(value).__name__}')
+
+
+def _object_hook(obj):
+    if len(obj) == 1:
+        if '__decimal__' in obj:
+            return decimal.Decimal(obj['__decimal__'])
+        if '__datetime__' in obj:
+            return datetime.datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return datetime.date.fromisoformat(obj['__date__'])
+    return obj
+
+
+def dumps(value) -> bytes:
+    # Values in Redis are JSON rather than pickles: a shared cache must not be
+    # able to run code in the workers that read it. Tuples come back as lists.
+    return json.dumps(value, default=_default, separators=(',', ':')).encode()
+
+
+def loads(raw):
+    return json.loads(raw, object_hook=_object_hook)
+
+
+class LRUCache:
+    # In-process backend: least-recently-used eviction once max_entries is
+    # reached, and per-entry TTL checked lazily on read.
+
+    shared = False
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'sets': 0, 'deletes': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def get_many(self, keys) -> list:
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ttl: float | None = None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def set_if(self, guard, expected, items: dict, ttl: float | None = None) -> bool:
+        # Writes `items` only if `guard` still holds `expected`, as one step.
+        with self._lock:
+            entry = self._data.get(guard)
+            if entry is None or entry[1] != expected or (entry[0] is not None and entry[0] <= time.monotonic()):
+                return False
+            for key, value in items.items():
+                self._store(key, value, ttl)
+            return True
+
+    def _store(self, key, value, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (time.monotonic() + ttl if ttl else None, value)
+        self._data.move_to_end(key)
+        self.stats['sets'] += 1
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.stats['deletes'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> dict:
+        with self._lock:
+            return dict(self.stats, backend='memory', entries=len(self._data), max_entries=self.max_entries)
+
+
+class RedisCache:
+    # Optional shared backend so every worker sees the same entries and
+    # invalidations. Requires the `redis` package.
+
+    shared = True
+
+    # KEYS[1] is the guard and ARGV[1] its expected value; ARGV[2] is the TTL
+    # in ms (0: none); KEYS[i] gets ARGV[i + 1] for i >= 2.
+    SET_IF = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+  return 0
+end
+for i = 2, #KEYS do
+  if ARGV[2] == '0' then
+    redis.call('SET', KEYS[i], ARGV[i + 1])
+  else
+    redis.call('SET', KEYS[i], ARGV[i + 1], 'PX', ARGV[2])
+  end
+end
+return 1
+"""
+
+    def __init__(self, url: str, ttl: float = 60.0, prefix: str = 'enrollment:'):
+        import redis
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._set_if = self._client.register_script(self.SET_IF)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'sets': 0, 'deletes': 0}
+
+    def _bump(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            self._bump('misses')
+            return MISSING
+        self._bump('hits')
+        return loads(raw)
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        self._client.set(self.prefix + key, dumps(value), px=int(ttl * 1000) if ttl else None)
+        self._bump('sets')
+
+    def get_many(self, keys) -> list:
+        # One MGET round-trip instead of one GET per key.
+        keys = list(keys)
+        if not keys:
+            return []
+        values = []
+        for raw in self._client.mget([self.prefix + key for key in keys]):
+            self._bump('misses' if raw is None else 'hits')
+            values.append(MISSING if raw is None else loads(raw))
+        return values
+
+    def set_if(self, guard, expected, items: dict, ttl: float | None = None) -> bool:
+        # Compare-and-set in one Lua call, so no write to `guard` can land
+        # between the check and the SETs.
+        ttl = self.ttl if ttl is None else ttl
+        keys = [self.prefix + guard] + [self.prefix + key for key in items]
+        args = [dumps(expected), int(ttl * 1000) if ttl else 0] + [dumps(value) for value in items.values()]
+        if not self._set_if(keys=keys, args=args):
+            return False
+        with self._lock:
+            self.stats['sets'] += len(items)
+        return True
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+        self._bump('deletes')
+
+    def clear(self):
+        for key in self._client.scan_iter(self.prefix + '*'):
+            self._client.delete(key)
+
+    def info(self) -> dict:
+        with self._lock:
+            return dict(self.stats, backend='redis')
+
+
+class StudentCache:
+    # Read-through cache for student payloads. Single students are keyed by
+    # ID and dropped one by one by the writes that change them; list/search
+    # pages live under a generation token that every write replaces, so one
+    # write drops all cached pages without scanning keys.
+
+    GENERATION_KEY = 'students:generation'
+
+    def __init__(self, backend):
+        self.backend = backend
+        # Seconds between table-version checks; see watch_versions().
+        self.version_poll = 0.0
+        self._polled_at = None
+        self._version = None
+        self._lock = threading.Lock()
+        self.stats = {'student_hits': 0, 'student_misses': 0, 'list_hits': 0, 'list_misses': 0}
+
+    def watch_versions(self, interval: float):
+        # An in-process backend under several workers never hears about the
+        # other workers' writes. Callers then read the student table's change
+        # counter whenever poll_due() says so and hand it to saw_version().
+        # A shared backend gets every worker's invalidations and needs none.
+        if not self.backend.shared:
+            self.version_poll = interval
+
+    def poll_due(self) -> bool:
+        # True at most once per `version_poll` seconds.
+        if not self.version_poll:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if self._polled_at is not None and now - self._polled_at < self.version_poll:
+                return False
+            self._polled_at = now
+            return True
+
+    def saw_version(self, state):
+        # state: (version, updated_at) from the repository, or None. Once the
+        # counter has moved, some process wrote, and only that process knows
+        # which students changed: drop everything.
+        version = state and state[0]
+        with self._lock:
+            seen, self._version = self._version, version
+        if seen is not None and version != seen:
+            self.backend.clear()
+
+    def _count(self, kind: str, value):
+        with self._lock:
+            self.stats[kind + ('_misses' if value is MISSING else '_hits')] += 1
+        return value
+
+    def token(self) -> str:
+        # Current write generation. Take it before reading from the database and
+        # pass it to set_*: if a write happened in between, the set is skipped.
+        # The backend compares the token and writes in one step (set_if).
+        generation = self.backend.get(self.GENERATION_KEY)
+        if generation is MISSING:
+            generation = uuid.uuid4().hex
+            self.backend.set(self.GENERATION_KEY, generation, ttl=0)
+        return generation
+
+    def get_student(self, student_id: int):
+        return self._count('student', self.backend.get(f'student:{student_id}'))
+
+    def set_student(self, student_id: int, payload, token: str):
+        self.backend.set_if(self.GENERATION_KEY, token, {f'student:{student_id}': payload})
+
+    def get_students(self, student_ids) -> dict:
+        # student_id -> cached payload, for the IDs that are cached.
+        student_ids = list(student_ids)
+        values = self.backend.get_many([f'student:{student_id}' for student_id in student_ids])
+        found = {}
+        for student_id, value in zip(student_ids, values):
+            if self._count('student', value) is not MISSING:
+                found[student_id] = value
+        return found
+
+    def set_students(self, payloads: dict, token: str):
+        if payloads:
+            self.backend.set_if(self.GENERATION_KEY, token,
+                                {f'student:{student_id}': payload for student_id, payload in payloads.items()})
+
+    def get_list(self, params, token: str):
+        return self._count('list', self.backend.get(self._list_key(params, token)))
+
+    def set_list(self, params, payload, token: str):
+        self.backend.set_if(self.GENERATION_KEY, token, {self._list_key(params, token): payload})
+
+    @staticmethod
+    def _list_key(params, token: str) -> str:
+        return f'students:list:{token}:{params!r}'
+
+    def invalidate(self, *student_ids: int):
+        # New generation first: a reader's set_if either lands before it (and
+        # the delete below removes the entry) or fails against it.
+        self.backend.set(self.GENERATION_KEY, uuid.uuid4().hex, ttl=0)
+        for student_id in student_ids:
+            self.backend.delete(f'student:{student_id}')
+
+    def clear(self):
+        self.backend.clear()
+
+    def info(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        return {'lookups': stats, 'backend': self.backend.info()}
+
+
+def create_cache(config) -> StudentCache:
+    if config['CACHE_BACKEND'] == 'redis':
+        backend = RedisCache(config['CACHE_REDIS_URL'], ttl=config['CACHE_TTL'])
+    else:
+        backend = LRUCache(max_entries=config['CACHE_MAX_ENTRIES'], ttl=config['CACHE_TTL'])
+    return StudentCache(backend)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import zlib
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/xml',
+    'text/html',
+    'text/plain',
+}
+
+
+class _Gzip:
+    def __init__(self, level: int = 6):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        # Sync-flush so every streamed chunk can be decoded as soon as it arrives.
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class _Brotli:
+    def __init__(self, module, quality: int = 5):
+        self._c = module.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _Zstd:
+    def __init__(self, module, level: int = 3):
+        self._module = module
+        self._c = module.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(self._module.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+def _brotli_module():
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            return None
+    return brotli
+
+
+def _zstd_module():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def available_encoders(preference) -> dict:
+    # Content-Encoding token -> compressor factory, in the configured order,
+    # skipping codecs whose module is not installed.
+    encoders = {}
+    for name in preference:
+        if name == 'gzip':
+            encoders[name] = _Gzip
+        elif name == 'br':
+            module = _brotli_module()
+            if module is not None:
+                encoders[name] = lambda module=module: _Brotli(module)
+        elif name == 'zstd':
+            module = _zstd_module()
+            if module is not None:
+                encoders[name] = lambda module=module: _Zstd(module)
+    return encoders
+
+
+def compress(data: bytes, encoder) -> bytes:
+    c = encoder()
+    return c.chunk(data) + c.finish()
+
+
+def compress_chunks(chunks, encoder, charset: str = 'utf-8'):
+    c = encoder()
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            if chunk:
+                yield c.chunk(chunk)
+        yield c.finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def compress_response(response, accept_encodings, encoders: dict, *, min_size: int = 1024):
+    # Negotiates Content-Encoding against the client's Accept-Encoding and
+    # compresses buffered bodies above `min_size` bytes; streamed bodies are
+    # always compressed chunk by chunk since their size is unknown up front.
+    if not encoders or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    encoding = accept_encodings.best_match(list(encoders))
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_chunks(response.response, encoders[encoding])
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(compress(body, encoders[encoding]))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # Same resource, different bytes: only weakly equal to the identity ETag.
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+
+class Validators:
+    def __init__(self, etag: str, last_modified=None, version=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.version = version
+
+    def not_modified(self, request) -> bool:
+        # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110).
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        since = request.if_modified_since
+        if since is not None and self.last_modified is not None:
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def apply(self, response):
+        response.set_etag(self.etag)
+        if self.last_modified is not None:
+            response.last_modified = self.last_modified
+        return response
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from api.xmlwriter import XML_DECLARATION, rows_xml, tags
+
+
+def ndjson_chunks(batches, dumps):
+    for columns, rows in batches:
+        yield ''.join(dumps(dict(zip(columns, row))) + '\n' for row in rows)
+
+
+def json_array_chunks(batches, dumps, *, key: str = 'students'):
+    yield '{"%s": [' % key
+    first = True
+    for columns, rows in batches:
+        chunk = ','.join(dumps(dict(zip(columns, row))) for row in rows)
+        yield chunk if first else ',' + chunk
+        first = False
+    yield ']}\n'
+
+
+def xml_chunks(batches, *, key: str = 'students'):
+    open_tag, close_tag = tags(key)
+    yield XML_DECLARATION + '<response>' + open_tag
+    for columns, rows in batches:
+        yield rows_xml(columns, rows)
+    yield close_tag + '</response>'
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import datetime
+import fnmatch
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Admin jobs (/admin/seed, /admin/run-tests) run on JobRunner's in-process
+# thread pool and queue; the endpoints only enqueue them and return the job ID.
+# Seeding runs entirely in this process on the already-imported seed/ code.
+# Test runs are the deliberate exception: each shard is a child interpreter
+# (`python -m api.jobs`, see run_unittests), started from a queued job and
+# never from a request thread. Run in this process, test_api would rebuild
+# SystemConfig and import this server's `app`, and then write to the live
+# database, caches and token store. The price is one interpreter start per
+# shard, not per request.
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+
+
+def _alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (OSError, TypeError):
+        pass
+    return True
+
+
+JOB_ID = re.compile(r'[0-9a-f]{32}')
+INFO_FIELDS = ('id', 'kind', 'params', 'status', 'created_at', 'started_at', 'finished_at', 'result', 'error')
+
+
+class Job:
+    # One background run, kept as two files in the job directory so every
+    # worker process can answer for it: <id>.json (status, timings, result;
+    # replaced atomically on each change) and <id>.log (output, appended a
+    # line at a time). Any number of readers can follow the log from their
+    # own offset while it is being written.
+
+    def __init__(self, directory: str, state: dict):
+        self.directory = directory
+        self.state = state
+        self.id = state['id']
+        self._partial = ''
+        self._out = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, directory: str, kind: str, params: dict) -> 'Job':
+        job = cls(directory, {
+            'id': uuid.uuid4().hex, 'kind': kind, 'params': params, 'status': 'queued',
+            'created_at': _now(), 'started_at': None, 'finished_at': None, 'result': None, 'error': None,
+            # Ordering (the timestamps above are per second) and the owning process.
+            'created_ns': time.time_ns(), 'finished_ns': None, 'pid': os.getpid(),
+        })
+        open(job.log_path, 'ab').close()
+        job._save()
+        return job
+
+    @classmethod
+    def load(cls, directory: str, job_id: str):
+        # None for unknown (or malformed) IDs; the ID check keeps requests to
+        # files named like a job.
+        if not JOB_ID.fullmatch(job_id):
+            return None
+        try:
+            with open(os.path.join(directory, job_id + '.json'), encoding='utf-8') as f:
+                return cls(directory, json.load(f))
+        except FileNotFoundError:
+            return None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, self.id + '.json')
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.directory, self.id + '.log')
+
+    @property
+    def status(self) -> str:
+        return self.state['status']
+
+    @property
+    def result(self):
+        return self.state['result']
+
+    @property
+    def error(self):
+        return self.state['error']
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('succeeded', 'failed')
+
+    def _save(self):
+        temp = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, default=str)
+        os.replace(temp, self.path)
+
+    def _refresh(self):
+        # Re-read the state another process may have written. A job whose
+        # worker died (recycled, killed) can never finish, so say so.
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        if state['status'] not in ('succeeded', 'failed') and not _alive(state.get('pid')):
+            state.update(status='failed', error='Worker process exited before the job finished')
+        with self._lock:
+            self.state = state
+
+    def write(self, text: str):
+        # File-like and print-like at once: usable as a log callback and as
+        # the stream of a unittest runner. Only whole lines reach the file.
+        if not text:
+            return
+        with self._lock:
+            parts = (self._partial + text).split('\n')
+            self._partial = parts.pop()
+            if parts:
+                self._append(''.join(part + '\n' for part in parts))
+
+    def _append(self, text: str):
+        if self._out is None:
+            self._out = open(self.log_path, 'a', encoding='utf-8')
+        self._out.write(text)
+        self._out.flush()
+
+    def log(self, line: str):
+        self.write(line + '\n')
+
+    def flush(self):
+        pass
+
+    def _start(self):
+        with self._lock:
+            self.state.update(status='running', started_at=_now(), pid=os.getpid())
+            self._save()
+
+    def _finish(self, status: str, result=None, error=None):
+        with self._lock:
+            if self._partial:
+                self._append(self._partial + '\n')
+                self._partial = ''
+            if self._out is not None:
+                self._out.close()
+                self._out = None
+            self.state.update(status=status, result=result, error=error, finished_at=_now(),
+                              finished_ns=time.time_ns())
+            self._save()
+
+    def lines(self, offset: int = 0, *, poll: float = 0.2, timeout: float = None):
+        # Lines after `offset`, read from the log as they are written until
+        # the job finishes, or until `timeout` seconds have passed (so a
+        # follower holds its worker thread for a bounded time; it can resume
+        # from the lines it has read). Works in any process.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        index = 0
+        pending = b''
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            while True:
+                data = f.read()
+                if not data:
+                    self._refresh()
+                    finished = self.done
+                    # Output is written before the final status, so read once more.
+                    data = f.read()
+                    if not data:
+                        if finished or (deadline is not None and time.monotonic() >= deadline):
+                            return
+                        time.sleep(poll)
+                        continue
+                pending += data
+                *complete, pending = pending.split(b'\n')
+                for line in complete:
+                    if index >= offset:
+                        yield line.decode('utf-8', 'replace')
+                    index += 1
+
+    def delete(self):
+        for path in (self.path, self.log_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def info(self) -> dict:
+        self._refresh()
+        output_lines = 0
+        try:
+            with open(self.log_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 16), b''):
+                    output_lines += chunk.count(b'\n')
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            info = {field: self.state.get(field) for field in INFO_FIELDS}
+        info['output_lines'] = output_lines
+        return info
+
+
+class _Prefixed:
+    def __init__(self, job: Job, prefix: str):
+        self.job = job
+        self.prefix = prefix
+        self._line_start = True
+
+    def write(self, text):
+        out = []
+        for part in text.splitlines(keepends=True):
+            if self._line_start:
+                out.append(self.prefix)
+            out.append(part)
+            self._line_start = part.endswith('\n')
+        self.job.write(''.join(out))
+
+    def flush(self):
+        pass
+
+
+# Last line a shard process prints: its counts as JSON (not part of the output).
+RESULT_MARKER = '##shard-result '
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def matching_test_modules(start_dir: str, pattern: str) -> list:
+    # The allowlist: test_*.py modules shipped in start_dir that match `pattern`.
+    return sorted(name[:-3] for name in os.listdir(start_dir)
+                  if fnmatch.fnmatch(name, 'test_*.py') and fnmatch.fnmatch(name, pattern))
+
+
+def _test_classes(suite):
+    # Flatten a loaded suite into one suite per TestCase class, keeping the
+    # test order inside each class (test_api's steps depend on it).
+    groups = OrderedDict()
+
+    def walk(item):
+        if isinstance(item, unittest.TestSuite):
+            for child in item:
+                walk(child)
+        else:
+            groups.setdefault(type(item), unittest.TestSuite()).addTest(item)
+
+    walk(suite)
+    return list(groups.values())
+
+
+def run_unittests(job: Job, *, start_dir: str, modules: list, shards: int = 1, env=None) -> dict:
+    # Runs the given test modules in `shards` child processes (`python -m
+    # api.jobs`), never in this one: each child builds its own app from `env`,
+    # so the tests cannot reach this process's database, caches or tokens.
+    # Every shard runs every shards-th test class, each class in order.
+    job.log(f"Running {len(modules)} module(s) in {shards} shard(s): {', '.join(modules)}")
+    results = [None] * shards
+
+    def run_shard(index):
+        stream = _Prefixed(job, f"[shard {index}] ") if shards > 1 else job
+        proc = subprocess.Popen([sys.executable, '-u', '-m', 'api.jobs', start_dir, str(index), str(shards), *modules],
+                                cwd=ROOT_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding='utf-8', errors='replace')
+        for line in proc.stdout:
+            if line.startswith(RESULT_MARKER):
+                results[index] = json.loads(line[len(RESULT_MARKER):])
+            else:
+                stream.write(line)
+        if proc.wait() != 0 and results[index] is None:
+            stream.write(f"Shard exited with status {proc.returncode}\n")
+
+    threads = [threading.Thread(target=run_shard, args=(i,), name=f'{threading.current_thread().name}-shard{i}')
+               for i in range(shards)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = {key: sum(r[key] for r in results if r) for key in ('tests', 'failures', 'errors', 'skipped')}
+    summary['ok'] = all(r is not None and r['ok'] for r in results)
+    return summary
+
+
+def _run_shard(start_dir: str, index: int, shards: int, modules: list) -> int:
+    # Child side of run_unittests.
+    sys.path.insert(0, start_dir)
+    classes = _test_classes(unittest.defaultTestLoader.loadTestsFromNames(modules))[index::shards]
+    result = unittest.TextTestRunner(stream=sys.stdout, verbosity=2).run(unittest.TestSuite(classes))
+    counts = {'tests': result.testsRun, 'failures': len(result.failures), 'errors': len(result.errors),
+              'skipped': len(result.skipped), 'ok': result.wasSuccessful()}
+    print(RESULT_MARKER + json.dumps(counts), flush=True)
+    return 0 if result.wasSuccessful() else 1
+
+
+class JobRunner:
+    # Runs admin jobs (seeding, test suites) on a small thread pool in the
+    # process that accepted them, so that request returns at once with the
+    # job's ID. Status and output live in `directory` (see Job), so with
+    # serve.py any worker answers for any job. Finished jobs are kept until
+    # `history` newer ones have finished.
+
+    def __init__(self, directory: str, *, workers: int = 2, history: int = 50, wrap=None):
+        # `wrap(fn)` runs fn in whatever context jobs need (e.g. an app context).
+        self.directory = directory
+        self.history = history
+        self._wrap = wrap or (lambda fn: fn())
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='admin-job')
+        os.makedirs(directory, exist_ok=True)
+
+    def submit(self, kind: str, fn, params=None) -> Job:
+        # fn(job) -> result dict; an exception marks the job failed.
+        job = Job.create(self.directory, kind, params or {})
+        self._prune()
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn):
+        job._start()
+        try:
+            result = self._wrap(lambda: fn(job))
+        except Exception as e:
+            job.log(f"Error: {e}")
+            job._finish('failed', error=str(e))
+            return
+        ok = not (isinstance(result, dict) and result.get('ok') is False)
+        job._finish('succeeded' if ok else 'failed', result=result)
+
+    def _prune(self):
+        finished = sorted((job for job in self.jobs() if job.done), key=lambda job: job.state['finished_ns'] or 0)
+        for job in finished[:max(len(finished) - self.history, 0)]:
+            job.delete()
+
+    def get(self, job_id: str):
+        return Job.load(self.directory, job_id)
+
+    def jobs(self) -> list:
+        # Every job in the directory, oldest first, whichever process runs it.
+        found = (Job.load(self.directory, name[:-len('.json')])
+                 for name in os.listdir(self.directory) if name.endswith('.json'))
+        return sorted((job for job in found if job is not None), key=lambda job: job.state['created_ns'])
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+if __name__ == '__main__':
+    # python -m api.jobs <start_dir> <shard index> <shards> <module>...
+    sys.exit(_run_shard(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4:]))
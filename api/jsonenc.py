@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+# Optional fast JSON encoding for format_response. orjson output is kept
+# equivalent to Flask's provider: sorted keys, Decimal (gpa) as str(value),
+# dates as HTTP dates, floats in shortest round-trip form.
+
+
+def create_dumps(preference: str, default):
+    # dumps(obj) -> bytes, or None to keep Flask's jsonify.
+    if preference == 'stdlib':
+        return None
+    try:
+        import orjson
+    except ImportError:
+        if preference == 'orjson':
+            raise
+        return None
+
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=default, option=options)
+
+    return dumps
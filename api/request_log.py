@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+class JsonFormatter(logging.Formatter):
+    # One JSON object per line; structured fields come from `extra={'fields': {...}}`.
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _Listener(QueueListener):
+    # Keeps its own `running` flag, so stop() is safe to call more than once
+    # (explicitly and again at exit) without looking at QueueListener's thread.
+    running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def stop(self):
+        # Drains whatever is still queued.
+        if self.running:
+            self.running = False
+            super().stop()
+
+
+def setup_logging(logger, *, path: str, max_bytes: int, backup_count: int, level=logging.INFO):
+    # Request threads only enqueue records; a QueueListener thread does the
+    # formatting, file writes and rotation. Returns the listener (or None if
+    # this logger is already set up).
+    if any(isinstance(h, QueueHandler) for h in logger.handlers):
+        return None
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                       encoding='utf-8', delay=True)
+    file_handler.setFormatter(JsonFormatter())
+    file_handler.setLevel(level)
+
+    records = queue.SimpleQueue()
+    listener = _Listener(records, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(level)
+    return listener
+
+
+def stop_listener(listener):
+    # Drains whatever is still queued; safe to call more than once.
+    if listener is not None:
+        listener.stop()
+
+
+def restart_listener(listener):
+    # The listener thread does not survive fork(): in the child, retire the
+    # inherited listener (stopping it would queue a sentinel for a thread
+    # that is not there) and return a new one on the same queue and handlers.
+    if listener is None:
+        return None
+    listener.running = False
+    child = _Listener(listener.queue, *listener.handlers, respect_handler_level=listener.respect_handler_level)
+    child.start()
+    atexit.register(stop_listener, child)
+    return child
+
+
+def parse_sample_rates(spec: str) -> dict:
+    # "GET /students=0.1, GET /students/<int:student_id>=0.05" -> {route: rate}
+    rates = {}
+    for item in (spec or '').split(','):
+        if '=' not in item:
+            continue
+        route, rate = item.rsplit('=', 1)
+        rates[route.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+# How long a revocation lasts for a token without an `exp` claim.
+NO_EXP_REVOCATION = 365 * 24 * 3600.0
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class MemoryRevocations:
+    # Revoked digests for a single process. Entries are swept once their
+    # token would have expired anyway.
+
+    def __init__(self, sweep_interval: float = 60.0):
+        self.sweep_interval = sweep_interval
+        self._revoked = {}
+        self._swept_at = time.time()
+        self._lock = threading.Lock()
+
+    def _sweep(self, now: float):
+        if now - self._swept_at >= self.sweep_interval:
+            for digest in [d for d, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[digest]
+            self._swept_at = now
+
+    def add(self, digest: bytes, expires_at: float):
+        with self._lock:
+            self._revoked[digest] = expires_at
+            self._sweep(time.time())
+
+    def contains(self, digest: bytes) -> bool:
+        now = time.time()
+        with self._lock:
+            self._sweep(now)
+            exp = self._revoked.get(digest)
+        return exp is not None and exp > now
+
+    def count(self) -> int:
+        with self._lock:
+            self._sweep(time.time())
+            return len(self._revoked)
+
+
+class RedisRevocations:
+    # Shared denylist for CACHE_BACKEND=redis: one key per revoked digest,
+    # expiring with the token, so Redis does the sweeping.
+
+    def __init__(self, url: str, prefix: str = 'enrollment:revoked:'):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def add(self, digest: bytes, expires_at: float):
+        ttl_ms = max(int((expires_at - time.time()) * 1000), 1)
+        self._client.set(self.prefix + digest.hex(), b'1', px=ttl_ms)
+
+    def contains(self, digest: bytes) -> bool:
+        return bool(self._client.exists(self.prefix + digest.hex()))
+
+    def count(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(self.prefix + '*'))
+
+
+def create_revocations(config, students, *, wrap=None):
+    # Revocations must be seen by every worker process: Redis when the cache
+    # already uses it, otherwise the token_revocation table (re-read in the
+    # background, through `wrap`).
+    if config['CACHE_BACKEND'] == 'redis':
+        return RedisRevocations(config['CACHE_REDIS_URL'])
+    from database.revocations import RevocationTable
+    return RevocationTable(students, refresh=config['TOKEN_REVOCATION_REFRESH'], wrap=wrap)
+
+
+class TokenCache:
+    # Bounded LRU of already-verified JWTs keyed by SHA-256 digest, so a token
+    # reused across requests is only signature-checked once. Entries expire at
+    # the token's own `exp`; revoked tokens are rejected until they would have
+    # expired anyway. `revocations` (MemoryRevocations, RedisRevocations or
+    # database.revocations.RevocationTable) holds the revoked digests.
+    # Callers hash the token once with token_digest() and pass the digest.
+
+    def __init__(self, max_entries: int = 10000, max_ttl: float = 1800.0, revocations=None):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.revocations = revocations if revocations is not None else MemoryRevocations()
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'revoked_rejections': 0}
+
+    def _expiry(self, payload) -> float:
+        # exp is a UTC epoch timestamp; cap how long tokens without one stay cached.
+        now = time.time()
+        exp = payload.get('exp') if isinstance(payload, dict) else None
+        if isinstance(exp, (int, float)):
+            return min(float(exp), now + self.max_ttl)
+        return now + self.max_ttl
+
+    @staticmethod
+    def _revoked_until(payload) -> float:
+        # Until the token's own exp (not capped like cache entries): after
+        # that jwt.decode rejects it anyway. Tokens without exp never expire.
+        exp = payload.get('exp') if isinstance(payload, dict) else None
+        if isinstance(exp, (int, float)):
+            return float(exp)
+        return time.time() + NO_EXP_REVOCATION
+
+    def is_revoked(self, digest: bytes) -> bool:
+        revoked = self.revocations.contains(digest)
+        if revoked:
+            with self._lock:
+                self._data.pop(digest, None)
+                self.stats['revoked_rejections'] += 1
+        return revoked
+
+    def get(self, digest: bytes):
+        with self._lock:
+            entry = self._data.get(digest)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[digest]
+                self.stats['misses'] += 1
+                return None
+            self._data.move_to_end(digest)
+            self.stats['hits'] += 1
+            return payload
+
+    def put(self, digest: bytes, payload):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[digest] = (payload, self._expiry(payload))
+            self._data.move_to_end(digest)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def revoke(self, digest: bytes, payload=None):
+        with self._lock:
+            self._data.pop(digest, None)
+        self.revocations.add(digest, self._revoked_until(payload))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> dict:
+        revoked = self.revocations.count()
+        with self._lock:
+            return dict(self.stats, entries=len(self._data), revoked=revoked, max_entries=self.max_entries)
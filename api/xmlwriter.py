@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import datetime
+import re
+from decimal import Decimal
+
+# Produces the same documents as dicttoxml(data, custom_root='response',
+# attr_type=False) for the shapes the API returns, without building an
+# element tree: values are escaped and concatenated straight into strings.
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" ?>'
+_VALID_TAG = re.compile(r'[A-Za-z_][\w.-]*\Z')
+_tags = {}
+
+
+def escape(text: str) -> str:
+    # Same entity set as dicttoxml (quotes included).
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if "'" in text:
+        text = text.replace("'", '&apos;')
+    return text
+
+
+def scalar(value) -> str:
+    if value is None:
+        return ''
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, str):
+        return escape(value)
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return escape(str(value))
+
+
+def tags(key) -> tuple:
+    # (open, close) tag pair for a dict key, cached. Keys that are not valid
+    # element names become <key name="...">, as dicttoxml does.
+    pair = _tags.get(key)
+    if pair is None:
+        name = str(key).replace(' ', '_')
+        if _VALID_TAG.match(name) and not name.lower().startswith('xml'):
+            pair = (f'<{name}>', f'</{name}>')
+        else:
+            pair = (f'<key name="{escape(name)}">', '</key>')
+        _tags[key] = pair
+    return pair
+
+
+def _value(value) -> str:
+    if isinstance(value, dict):
+        return ''.join(_element(k, v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ''.join('<item>' + _value(v) + '</item>' for v in value)
+    return scalar(value)
+
+
+def _element(key, value) -> str:
+    open_tag, close_tag = tags(key)
+    return open_tag + _value(value) + close_tag
+
+
+def rows_xml(columns, rows) -> str:
+    # <item> elements for DB rows; the per-column tags are built once per batch.
+    pairs = [tags(col) for col in columns]
+    return ''.join(
+        '<item>' + ''.join(
+            open_tag + scalar(value) + close_tag for (open_tag, close_tag), value in zip(pairs, row)
+        ) + '</item>'
+        for row in rows
+    )
+
+
+def iter_xml(data: dict, *, root: str = 'response', chunk_items: int = 500):
+    # Document in chunks: one per scalar/dict field, and one per `chunk_items`
+    # entries of list fields, so large lists never become one giant string.
+    yield XML_DECLARATION + f'<{root}>'
+    for key, value in data.items():
+        if isinstance(value, (list, tuple)) and len(value) > chunk_items:
+            open_tag, close_tag = tags(key)
+            yield open_tag
+            for start in range(0, len(value), chunk_items):
+                yield _value(value[start:start + chunk_items])
+            yield close_tag
+        else:
+            yield _element(key, value)
+    yield f'</{root}>'
+
+
+def to_xml(data: dict, *, root: str = 'response') -> str:
+    return ''.join(iter_xml(data, root=root))
@@ -1,39 +1,198 @@
-from flask import Flask, request, jsonify, make_response, render_template, redirect
-from flask_mysqldb import MySQL
+from flask import Flask, Response, g, request, jsonify, make_response, render_template, redirect, stream_with_context
+from flask.logging import default_handler
 import jwt
 import datetime
 from functools import wraps
 from config.config import SystemConfig
-import dicttoxml
-import logging
-from logging.handlers import RotatingFileHandler
+from database import timing as query_timing
+from database.extension import PooledMySQL
+from database.pool import reset_after_fork
+from database.aggregates import StudentAggregates
+from database.catalog import RESOURCES, STUDENT_EXPANSIONS, CatalogRepository
+from database.search import TrigramIndex
+from database.students import (STUDENT_FIELDS, DuplicateStudent, SearchIndexMissing, VersionConflict,
+                               create_repository)
+from api.bodies import BodyError, iter_json_array, iter_ndjson
+from api.cache import MISSING, create_cache
+from api.compression import available_encoders, compress_response
+from api.conditional import Validators
+from api.tokens import TokenCache, create_revocations, token_digest
+from api.jobs import JobRunner, run_unittests, matching_test_modules
+from api.export import ndjson_chunks, json_array_chunks, xml_chunks
+from api.jsonenc import create_dumps
+from api.xmlwriter import to_xml
+from api.metrics import ROW_BUCKETS, Registry, statement_kind
+from api.request_log import parse_sample_rates, restart_listener, setup_logging
+import bisect
+import cProfile
+import io
 import os
-import subprocess
-import sys
+import pstats
+import random
+import re
+import time
 from pathlib import Path
 
 app = Flask(__name__)
 app.config.from_object(SystemConfig)
 
 # Configure Logging
-if not os.path.exists('logs'):
-    os.mkdir('logs')
-
-if not app.logger.hasHandlers():
-    file_handler = RotatingFileHandler('logs/api.log', maxBytes=10240, backupCount=10)
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-    ))
-    file_handler.setLevel(logging.INFO)
-    app.logger.addHandler(file_handler)
-    app.logger.setLevel(logging.INFO)
+request_log_listener = setup_logging(
+    app.logger,
+    path=app.config['LOG_FILE'],
+    max_bytes=app.config['LOG_MAX_BYTES'],
+    backup_count=app.config['LOG_BACKUP_COUNT'],
+)
+if request_log_listener is not None:
+    # Everything goes through the background queue instead of stderr.
+    app.logger.removeHandler(default_handler)
     app.logger.info('Enrollment API startup')
 
+log_sample_rates = parse_sample_rates(app.config['LOG_SAMPLE_RATES'])
+
 @app.before_request
 def log_request_info():
-    app.logger.info(f"Request: {request.method} {request.url} - IP: {request.remote_addr}")
+    g.request_started = time.perf_counter()
+    g.query_stats = query_timing.begin()
+
+@app.after_request
+def log_request_completion(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    stats = g.get('query_stats')
+    rule = request.url_rule.rule if request.url_rule else None
+    _observe_request(rule or '<unmatched>', response.status_code, elapsed, stats)
+
+    route = f"{request.method} {rule or request.path}"
+    rate = log_sample_rates.get(route, 1.0)
+    # Errors are always logged; successful requests on busy routes are sampled.
+    if response.status_code < 400 and rate < 1.0 and random.random() >= rate:
+        return response
+
+    app.logger.info('request', extra={'fields': {
+        'method': request.method,
+        'path': request.path,
+        'route': route,
+        'status': response.status_code,
+        'latency_ms': round(elapsed * 1000, 3),
+        'response_bytes': response.content_length,
+        'db_ms': round(stats.seconds * 1000, 3) if stats else None,
+        'db_queries': stats.queries if stats else None,
+        'pool_wait_ms': round(stats.pool_wait * 1000, 3) if stats else None,
+        'remote_addr': request.remote_addr,
+        'sample_rate': rate,
+    }})
+    return response
+
+@app.before_request
+def start_profiler():
+    # Opt-in cProfile summary for local requests: ?profile=1 with PROFILING_ENABLED.
+    if request.args.get('profile') == '1' and app.config['PROFILING_ENABLED'] and _is_local_request():
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def profile_summary(response):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(40)
+    summary = make_response(out.getvalue(), 200)
+    summary.mimetype = 'text/plain'
+    summary.headers['X-Profiled-Status'] = str(response.status_code)
+    return summary
+
+@app.after_request
+def compress(response):
+    # Runs before the hooks above, so logged response sizes are the compressed ones.
+    return compress_response(response, request.accept_encodings, encoders,
+                             min_size=app.config['COMPRESSION_MIN_SIZE'])
+
+encoders = available_encoders(e.strip() for e in app.config['COMPRESSION_ENCODINGS'].split(',') if e.strip())
+fast_dumps = create_dumps(app.config['JSON_ENCODER'], app.json.default)
+
+mysql = PooledMySQL(app)
+# All student SQL goes through this; STORAGE_BACKEND=sqlite runs without a MySQL server.
+students = create_repository(app.config, mysql)
+# Read-only departments/instructors/courses/enrollments and student ?expand=.
+catalog = CatalogRepository(students, chunk_size=app.config['BATCH_GET_CHUNK_SIZE'])
+
+# Name search: `backend` drops to 'trigram' if the FULLTEXT index turns out to be missing.
+search_state = {'backend': app.config['SEARCH_BACKEND']}
+search_index = TrigramIndex(ttl=app.config['SEARCH_INDEX_TTL'])
+# Department/course figures for /stats, kept current by the write routes.
+aggregates = StudentAggregates(ttl=app.config['AGGREGATE_TTL'])
+
 
-mysql = MySQL(app)
+def _in_app_context(fn):
+    with app.app_context():
+        return fn()
+
+
+student_cache = create_cache(app.config)
+# Revocations are shared by all workers (Redis or the token_revocation table).
+token_cache = TokenCache(max_entries=app.config['TOKEN_CACHE_SIZE'],
+                         revocations=create_revocations(app.config, students, wrap=_in_app_context))
+
+
+# Background admin jobs (/admin/seed, /admin/run-tests), run in this process;
+# their status and output are files in ADMIN_JOB_DIR, readable from any worker.
+jobs = JobRunner(app.config['ADMIN_JOB_DIR'], workers=app.config['ADMIN_JOB_WORKERS'],
+                 history=app.config['ADMIN_JOB_HISTORY'], wrap=_in_app_context)
+
+# Metrics (Prometheus text format at /metrics)
+metrics = Registry()
+http_latency = metrics.histogram('http_request_duration_seconds', 'Wall time per request.', labels=('method', 'route', 'status'))
+http_db_time = metrics.histogram('http_request_db_seconds', 'Time spent in DB calls per request.', labels=('route',))
+http_db_rows = metrics.histogram('http_request_db_rows', 'Rows fetched per request.', labels=('route',), buckets=ROW_BUCKETS)
+http_pool_wait = metrics.histogram('http_request_pool_wait_seconds', 'Time spent waiting for a pooled connection per request.', labels=('route',))
+db_query_latency = metrics.histogram('db_query_duration_seconds', 'Time spent in cursor.execute/executemany.', labels=('statement',))
+db_fetch_latency = metrics.histogram('db_fetch_duration_seconds', 'Time spent fetching result rows.')
+db_slow_queries = metrics.counter('db_slow_queries_total', 'Statements slower than SLOW_QUERY_MS.', labels=('statement',))
+serialization_latency = metrics.histogram('response_serialization_seconds', 'Time spent in format_response.', labels=('format',))
+metrics.gauge('db_pool_connections', 'Pooled connections by state.',
+              lambda: {(state,): mysql.pool.stats()[state] for state in ('in_use', 'idle')}, labels=('state',))
+metrics.gauge('db_pool_wait_seconds_total', 'Total time spent waiting for pooled connections.',
+              lambda: {(): mysql.pool.stats()['wait_time_total']})
+
+def _observe_query(query, seconds, rows):
+    if query is None:
+        db_fetch_latency.observe(seconds)
+        return
+    kind = statement_kind(query)
+    db_query_latency.observe(seconds, kind)
+    slow_ms = app.config['SLOW_QUERY_MS']
+    if slow_ms and seconds * 1000 >= slow_ms:
+        db_slow_queries.inc(kind)
+        query_text = query.decode(errors='replace') if isinstance(query, bytes) else str(query)
+        app.logger.warning('slow query', extra={'fields': {
+            'db_ms': round(seconds * 1000, 3),
+            'query': query_text[:2000],
+        }})
+
+query_timing.add_listener(_observe_query)
+
+def after_fork():
+    # Runs in each worker right after the preloaded app is forked (serve.py):
+    # connections, reserved ID blocks and the log thread are per process.
+    global request_log_listener
+    reset_after_fork()
+    students.after_fork()
+    if app.config['SERVER_WORKERS'] > 1:
+        # Other workers' writes never reach this worker's in-process cache.
+        student_cache.watch_versions(app.config['CACHE_VERSION_POLL'])
+    request_log_listener = restart_listener(request_log_listener)
+
+def _observe_request(route, status_code, elapsed, stats):
+    http_latency.observe(elapsed, request.method, route, str(status_code))
+    if stats is not None:
+        http_db_time.observe(stats.seconds, route)
+        http_db_rows.observe(stats.rows, route)
+        http_pool_wait.observe(stats.pool_wait, route)
 
 
 def _is_local_request() -> bool:
@@ -66,60 +225,53 @@ def admin_required(f):
     return decorated
 
 
-def _run_python_script(relative_path: str, timeout_seconds: int = 180) -> dict:
-    script_path = (Path(app.root_path) / relative_path).resolve()
-    if not script_path.exists():
-        return {"ok": False, "returncode": None, "output": f"Script not found: {script_path}"}
-
+def authenticate():
+    # The bearer-token check behind token_required (also used by the ASGI
+    # mode): None when the request may proceed, otherwise the 401 response.
+    token = request.headers.get('Authorization')
+    if not token:
+        return jsonify({'message': 'Token is missing!'}), 401
     try:
-        completed = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=str(Path(app.root_path).resolve()),
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-        )
-        output = (completed.stdout or "") + ("\n" if completed.stderr else "") + (completed.stderr or "")
-        output = output.strip()
-        return {
-            "ok": completed.returncode == 0,
-            "returncode": completed.returncode,
-            "output": output if output else "(no output)",
-        }
-    except subprocess.TimeoutExpired:
-        return {"ok": False, "returncode": None, "output": f"Timed out after {timeout_seconds}s"}
+        if token.startswith('Bearer '):
+            token = token.split(" ")[1]
+        digest = token_digest(token)
+        if token_cache.is_revoked(digest):
+            return jsonify({'message': 'Token has been revoked!'}), 401
+        # Signature/expiry are only checked the first time a token is seen.
+        data = token_cache.get(digest)
+        if data is None:
+            data = jwt.decode(token, app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
+            token_cache.put(digest, data)
+    except jwt.ExpiredSignatureError:
+        return jsonify({'message': 'Token has expired!'}), 401
+    except jwt.InvalidTokenError:
+        return jsonify({'message': 'Token is invalid!'}), 401
     except Exception as e:
-        app.logger.exception("Failed to run script")
-        return {"ok": False, "returncode": None, "output": str(e)}
+        return jsonify({'message': f'Token error: {str(e)}'}), 401
+    return None
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        if not token:
-            return jsonify({'message': 'Token is missing!'}), 401
-        try:
-            if token.startswith('Bearer '):
-                token = token.split(" ")[1]
-            data = jwt.decode(token, app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
-        except jwt.ExpiredSignatureError:
-            return jsonify({'message': 'Token has expired!'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'message': 'Token is invalid!'}), 401
-        except Exception as e:
-            return jsonify({'message': f'Token error: {str(e)}'}), 401
+        error = authenticate()
+        if error is not None:
+            return error
         return f(*args, **kwargs)
     return decorated
 
 def format_response(data, status_code=200):
     fmt = request.args.get('format', 'json')
+    started = time.perf_counter()
     if fmt == 'xml':
-        xml = dicttoxml.dicttoxml(data, custom_root='response', attr_type=False)
-        response = make_response(xml)
+        response = make_response(to_xml(data))
         response.headers['Content-Type'] = 'application/xml'
     else:
-        response = make_response(jsonify(data))
+        if fast_dumps is not None:
+            response = make_response(fast_dumps(data) + b'\n')
+        else:
+            response = make_response(jsonify(data))
         response.headers['Content-Type'] = 'application/json'
+    serialization_latency.observe(time.perf_counter() - started, 'xml' if fmt == 'xml' else 'json')
     
     response.status_code = status_code
     return response
@@ -144,178 +296,864 @@ def login():
 def index():
     return redirect('/ui')
 
+STUDENT_REQUIRED_FIELDS = ['student_id', 'student_name', 'year_level', 'gpa', 'dept_id']
+
+def _validate_student(data, require_id=True):
+    # Shared by create_student and the bulk endpoint; returns an error message or None.
+    if not data or not isinstance(data, dict):
+        return 'No input data provided'
+
+    for field in STUDENT_REQUIRED_FIELDS:
+        if field not in data and (require_id or field != 'student_id'):
+            return f'Missing field: {field}'
+
+    try:
+        if 'student_id' in data:
+            int(data['student_id'])
+        int(data['year_level'])
+        int(data['dept_id'])
+        float(data['gpa'])
+    except (TypeError, ValueError):
+        return 'Invalid data types'
+    return None
+
+def _student_row(data):
+    student_id = int(data['student_id']) if 'student_id' in data else None
+    return (student_id, data['student_name'], int(data['year_level']),
+            float(data['gpa']), int(data['dept_id']))
+
 @app.route('/students', methods=['POST'])
 @token_required
 def create_student():
     data = request.get_json()
-    if not data:
-        return format_response({'message': 'No input data provided'}, 400)
-    
-    required_fields = ['student_id', 'student_name', 'year_level', 'gpa', 'dept_id']
-    for field in required_fields:
-        if field not in data:
-            return format_response({'message': f'Missing field: {field}'}, 400)
+    error = _validate_student(data)
+    if error:
+        return format_response({'message': error}, 400)
 
-    # Validation
     try:
-        int(data['student_id'])
-        int(data['year_level'])
-        int(data['dept_id'])
-        float(data['gpa'])
-    except ValueError:
-        return format_response({'message': 'Invalid data types'}, 400)
+        students.create(_student_row(data))
+        search_index.add(int(data['student_id']), data['student_name'])
+        aggregates.put(int(data['student_id']), int(data['dept_id']), float(data['gpa']))
+        student_cache.invalidate(int(data['student_id']))
+        return format_response({'message': 'Student created successfully'}, 201)
+    except DuplicateStudent:
+        return format_response({'message': 'Student ID already exists'}, 409)
+    except Exception as e:
+        return format_response({'message': str(e)}, 500)
+
+# Attempts for rows sent without a student_id whose allocated ID turns out to be taken.
+BULK_ID_ATTEMPTS = 3
+
+def _write_new_id_rows(pending, rows):
+    # Rows sent without a student_id get one from the shared ID sequence and
+    # are always inserted, never upserted onto another student. An ID from a
+    # block reserved earlier may since have been used by an explicit-ID write
+    # (POST /students); such rows drop the block and retry with fresh IDs
+    # instead of being rejected.
+    results = []
+    for attempt in range(BULK_ID_ATTEMPTS):
+        if attempt:
+            students.discard_ids()
+        batch = [(index, (student_id,) + row[1:])
+                 for (index, row), student_id in zip(pending, students.allocate_ids(len(pending)))]
+        rows.update(batch)
+        pending = []
+        for result in students.write_batch(batch):
+            if result['status'] == 'rejected' and attempt < BULK_ID_ATTEMPTS - 1:
+                pending.append((result['index'], rows[result['index']]))
+            else:
+                results.append(result)
+        if not pending:
+            break
+    return results
+
+def _write_bulk_batch(batch, upsert):
+    rows = dict(batch)
+    given = [(index, row) for index, row in batch if row[0] is not None]
+    new = [(index, row) for index, row in batch if row[0] is None]
+    results = students.write_batch(given, upsert=upsert) if given else []
+    if new:
+        results += _write_new_id_rows(new, rows)
+    written = [r for r in results if r['status'] != 'rejected']
+    for result in written:
+        row = rows[result['index']]
+        search_index.add(result['student_id'], row[1])
+        aggregates.put(result['student_id'], row[4], row[3])
+    if written:
+        student_cache.invalidate(*(r['student_id'] for r in written))
+    return results
+
+@app.route('/students/bulk', methods=['POST'])
+@token_required
+def bulk_create_students():
+    # Body is a JSON array or NDJSON (Content-Type: application/x-ndjson), parsed
+    # incrementally from the request stream and written in executemany batches.
+    upsert = request.args.get('upsert', '').lower() in ('1', 'true', 'yes')
+    batch_size = app.config['BULK_BATCH_SIZE']
+    if request.mimetype == 'application/x-ndjson':
+        items = iter_ndjson(request.stream)
+    else:
+        items = iter_json_array(request.stream)
 
+    results = []
+    batch = []
+    status_code = 200
+    message = None
     try:
-        cur = mysql.connection.cursor()
+        for index, data in enumerate(items):
+            error = _validate_student(data, require_id=False)
+            if error:
+                student_id = data.get('student_id') if isinstance(data, dict) else None
+                results.append({'index': index, 'student_id': student_id, 'status': 'rejected', 'reason': error})
+                continue
+            batch.append((index, _student_row(data)))
+            if len(batch) >= batch_size:
+                results.extend(_write_bulk_batch(batch, upsert))
+                batch = []
+        results.extend(_write_bulk_batch(batch, upsert))
+    except BodyError as e:
+        # Batches before the malformed element are already committed.
+        status_code, message = 400, str(e)
+    except Exception as e:
+        return format_response({'message': str(e)}, 500)
+
+    results.sort(key=lambda r: r['index'])
+    summary = {status: 0 for status in ('created', 'updated', 'rejected')}
+    for result in results:
+        summary[result['status']] += 1
+    response = dict(summary, results=results)
+    if message:
+        response['message'] = message
+    return format_response(response, status_code)
+
+def _page_args():
+    # Keyset pagination: `after` is the last student_id of the previous page.
+    try:
+        limit = int(request.args.get('limit', app.config['STUDENTS_PAGE_SIZE']))
+        after = request.args.get('after')
+        after = int(after) if after else None
+    except ValueError:
+        return None, None, 'Invalid limit or after cursor'
+    if limit < 1:
+        return None, None, 'limit must be at least 1'
+    return min(limit, app.config['STUDENTS_MAX_PAGE_SIZE']), after, None
+
+def _fields_arg():
+    # ?fields=a,b -> column tuple in table order (student_id always included),
+    # or None for every column.
+    raw = request.args.get('fields')
+    if not raw:
+        return None, None
+    requested = {f.strip() for f in raw.split(',') if f.strip()}
+    unknown = requested - set(STUDENT_FIELDS)
+    if unknown:
+        return None, f"Unknown field(s): {', '.join(sorted(unknown))}"
+    requested.add('student_id')
+    if len(requested) == len(STUDENT_FIELDS):
+        return None, None
+    return tuple(c for c in STUDENT_FIELDS if c in requested), None
+
+def _expand_arg(columns=None):
+    # ?expand=department,enrollments -> tuple of relations, or an error message.
+    raw = request.args.get('expand')
+    if not raw:
+        return (), None
+    expand = tuple(dict.fromkeys(e.strip() for e in raw.split(',') if e.strip()))
+    unknown = set(expand) - set(STUDENT_EXPANSIONS)
+    if unknown:
+        return None, f"Unknown expand value(s): {', '.join(sorted(unknown))}"
+    if 'department' in expand and columns and 'dept_id' not in columns:
+        return None, 'expand=department needs dept_id in fields'
+    return expand, None
+
+def _load_search_rows():
+    return students.name_rows(app.config['EXPORT_BATCH_SIZE'])
+
+def _refresh_search_index():
+    # Rebuild thread for the trigram index, with its own app context (and
+    # pooled connection), so no request waits for the full name scan.
+    with app.app_context():
         try:
-            cur.execute("INSERT INTO student (student_id, student_name, year_level, gpa, dept_id) VALUES (%s, %s, %s, %s, %s)",
-                        (data['student_id'], data['student_name'], data['year_level'], data['gpa'], data['dept_id']))
-            mysql.connection.commit()
-            return format_response({'message': 'Student created successfully'}, 201)
-        finally:
-            cur.close()
+            search_index.refresh(_load_search_rows)
+        except Exception:
+            app.logger.exception("Failed to rebuild the trigram search index")
+
+def _student_page(search_query, match, by_relevance, limit, after, columns=None):
+    backend = search_state['backend']
+    if search_query and match != 'prefix' and backend == 'trigram':
+        return _trigram_student_page(search_query, by_relevance, limit, after, columns)
+    return students.page(search=search_query, match=match, by_relevance=by_relevance,
+                         limit=limit, after=after, backend=backend, columns=columns)
+
+def _trigram_student_page(term, by_relevance, limit, after, columns=None):
+    if not search_index.refresh_in_background(_refresh_search_index):
+        # Until the first build is done, search with LIKE on the table.
+        return students.page(search=term, by_relevance=by_relevance, limit=limit, after=after,
+                             backend='like', columns=columns)
+    ids = search_index.search(term)
+    if by_relevance:
+        page, has_more = search_index.rank(term, ids)[:limit], False
+    else:
+        if after is not None:
+            ids = ids[bisect.bisect_right(ids, after):]
+        page, has_more = ids[:limit], len(ids) > limit
+    if not page:
+        return {'students': [], 'next': None}
+
+    by_id = students.get_many(page, columns)
+    # The index can briefly lag other writers; skip IDs that no longer exist.
+    rows = [by_id[i] for i in page if i in by_id]
+    return {'students': rows, 'next': page[-1] if has_more else None}
+
+def _student_validators():
+    # ETag / Last-Modified from the student table's change counter, or None
+    # when the table_version migration has not been applied.
+    return _validators_for(students.version())
+
+def _validators_for(state):
+    if state is None:
+        return None
+    version, updated_at = state
+    etag = f"student-{version}-{request.args.get('format', 'json')}"
+    columns, _ = _fields_arg()
+    if columns:
+        etag += '-' + '.'.join(columns)
+    return Validators(etag, updated_at, version)
+
+def _row_validators(student):
+    # GET /students/<id>: the ETag comes from the row's own row_version, so it
+    # only changes when this student does and can be sent back as If-Match.
+    # No Last-Modified: rows have no timestamp of their own.
+    etag = f"student-{student['student_id']}-v{student['row_version']}-{request.args.get('format', 'json')}"
+    columns, _ = _fields_arg()
+    if columns:
+        etag += '-' + '.'.join(columns)
+    return Validators(etag)
+
+def _row_etag_sent(student_id):
+    # Whether If-None-Match holds an ETag of this student (see ROW_ETAG).
+    if not request.if_none_match:
+        return False
+    for tag in request.if_none_match.as_set(include_weak=True):
+        match = ROW_ETAG.match(tag)
+        if match and int(match.group(1)) == student_id:
+            return True
+    return False
+
+def _not_modified_row(current):
+    # current: {student_id, row_version} or None; the 304 response, or None.
+    if current is None:
+        return None
+    validators = _row_validators(current)
+    return validators.apply(make_response('', 304)) if validators.not_modified(request) else None
+
+def _row_columns(columns):
+    # Projection for a single-student read: row_version is always fetched for the ETag.
+    if columns and 'row_version' not in columns:
+        return columns + ('row_version',)
+    return columns
+
+def _with_validators(response, validators):
+    if validators and response.status_code == 200:
+        validators.apply(response)
+    return response
+
+def _parse_ids(values):
+    # Requested IDs as ints, de-duplicated in input order, or an error message.
+    try:
+        ids = list(dict.fromkeys(int(v) for v in values))
+    except (TypeError, ValueError):
+        return None, 'ids must be integers'
+    if not ids:
+        return None, 'No ids provided'
+    if len(ids) > app.config['BATCH_GET_MAX_IDS']:
+        return None, f"At most {app.config['BATCH_GET_MAX_IDS']} ids per request"
+    return ids, None
+
+# The helpers below are shared by the WSGI views here and the coroutines in
+# asgi.py, which run the cache and formatting steps on a worker thread.
+
+def _list_args():
+    # GET /students query -> ((search, match, by_relevance, limit, after,
+    # columns), expand, error message).
+    search_query = request.args.get('search')
+    match = request.args.get('match', 'contains')
+    by_relevance = request.args.get('order') == 'relevance'
+    if match not in ('contains', 'prefix'):
+        return None, None, 'match must be contains or prefix'
+    limit, after, error = _page_args()
+    columns, fields_error = _fields_arg()
+    expand, expand_error = _expand_arg(columns)
+    error = error or fields_error or expand_error
+    if error:
+        return None, None, error
+    return (search_query, match, by_relevance, limit, after, columns), expand, None
+
+def _cached_page(args, version):
+    # (cache key, cache token, cached page or MISSING). Keying on the table
+    # version keeps other workers' writes from being served out of this
+    # process's cache.
+    cache_key = args + (version,)
+    cache_token = student_cache.token()
+    return cache_key, cache_token, student_cache.get_list(cache_key, cache_token)
+
+def _search_fallback(args):
+    app.logger.warning("No FULLTEXT index on student_name; using the in-process trigram index")
+    search_state['backend'] = 'trigram'
+    return _student_page(*args)
+
+def _page_response(page, validators, expand=()):
+    if expand:
+        page = dict(page, students=catalog.expand_students(page['students'], expand))
+    return _with_validators(format_response(page), validators)
+
+def _batch_args(values):
+    # Batch lookup request -> (ids, columns, expand, error message).
+    ids, error = _parse_ids(values)
+    columns, fields_error = _fields_arg()
+    expand, expand_error = _expand_arg(columns)
+    return ids, columns, expand, error or fields_error or expand_error
+
+def _check_cache_version():
+    # Throttled check for the other workers' writes (StudentCache.watch_versions).
+    if student_cache.poll_due():
+        student_cache.saw_version(students.version())
+
+def _cached_students(ids):
+    # (cache token, student_id -> cached full row).
+    cache_token = student_cache.token()
+    return cache_token, {student_id: payload['student']
+                         for student_id, payload in student_cache.get_students(ids).items()}
+
+def _cache_students(rows, cache_token):
+    student_cache.set_students({i: {'student': row} for i, row in rows.items()}, cache_token)
+
+def _id_chunks(ids):
+    chunk_size = app.config['BATCH_GET_CHUNK_SIZE']
+    return [ids[start:start + chunk_size] for start in range(0, len(ids), chunk_size)]
+
+def _batch_response(ids, found, columns, validators, expand=()):
+    rows = [found[i] for i in ids if i in found]
+    if columns:
+        rows = [{c: row[c] for c in columns} for row in rows]
+    body = {'students': catalog.expand_students(rows, expand), 'missing': [i for i in ids if i not in found]}
+    return _with_validators(format_response(body), validators)
+
+def _cached_student(student_id):
+    # (cache token, cached full row or None).
+    cache_token = student_cache.token()
+    cached = student_cache.get_student(student_id)
+    return cache_token, (cached['student'] if cached is not MISSING else None)
+
+def _student_response(student, columns, expand=()):
+    # 304 or the student, carrying its row-level validators.
+    validators = None if expand else _row_validators(student)
+    if validators and validators.not_modified(request):
+        return validators.apply(make_response('', 304))
+    if columns:
+        student = {c: student[c] for c in columns}
+    if expand:
+        student = catalog.expand_students([student], expand)[0]
+    return _with_validators(format_response({'student': student}), validators)
+
+def _batch_get(values, conditional=False):
+    ids, columns, expand, error = _batch_args(values)
+    if error:
+        return format_response({'message': error}, 400)
+    try:
+        # Table-level validators only for GET ?ids= without expand.
+        validators = _student_validators() if conditional and not expand else None
+        if validators and validators.not_modified(request):
+            return validators.apply(make_response('', 304))
+
+        # Cached full rows first, then one IN (...) query per chunk of misses.
+        _check_cache_version()
+        cache_token, found = _cached_students(ids)
+        for chunk in _id_chunks([i for i in ids if i not in found]):
+            rows = students.get_many(chunk, columns)
+            if not columns:
+                _cache_students(rows, cache_token)
+            found.update(rows)
+        return _batch_response(ids, found, columns, validators, expand)
     except Exception as e:
-        if 'Duplicate entry' in str(e):
-            return format_response({'message': 'Student ID already exists'}, 409)
         return format_response({'message': str(e)}, 500)
 
+@app.route('/students/batch-get', methods=['POST'])
+@token_required
+def batch_get_students():
+    # Body: {"ids": [...]}; same response as GET /students?ids=...
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('ids'), list):
+        return format_response({'message': 'Body must be {"ids": [...]}'}, 400)
+    return _batch_get(data['ids'])
+
 @app.route('/students', methods=['GET'])
 @token_required
 def get_students():
-    search_query = request.args.get('search')
+    if 'ids' in request.args:
+        return _batch_get([v for v in request.args['ids'].split(',') if v.strip()], conditional=True)
+    args, expand, error = _list_args()
+    if error:
+        return format_response({'message': error}, 400)
     try:
-        cur = mysql.connection.cursor()
-        try:
-            if search_query:
-                query = "SELECT * FROM student WHERE student_name LIKE %s"
-                cur.execute(query, ('%' + search_query + '%',))
-            else:
-                cur.execute("SELECT * FROM student")
-            
-            rows = cur.fetchall()
-            students = []
-            if rows:
-                columns = [col[0] for col in cur.description]
-                for row in rows:
-                    students.append(dict(zip(columns, row)))
-            return format_response({'students': students})
-        finally:
-            cur.close()
+        validators = _student_validators()
+        version = validators and validators.version
+        if expand:
+            # Related tables have no change counter, so expanded responses get no ETag.
+            validators = None
+        if validators and validators.not_modified(request):
+            return validators.apply(make_response('', 304))
+
+        cache_key, cache_token, page = _cached_page(args, version)
+        if page is MISSING:
+            try:
+                page = _student_page(*args)
+            except SearchIndexMissing:
+                page = _search_fallback(args)
+            student_cache.set_list(cache_key, page, cache_token)
+        return _page_response(page, validators, expand)
     except Exception as e:
         return format_response({'message': str(e)}, 500)
 
+@app.route('/students/export', methods=['GET'])
+@token_required
+def export_students():
+    # Full-table export streamed in batches; memory use does not grow with the table.
+    fmt = request.args.get('format', 'json')
+    columns, error = _fields_arg()
+    if error:
+        return format_response({'message': error}, 400)
+    batches = students.export_batches(app.config['EXPORT_BATCH_SIZE'], columns)
+    dumps = (lambda obj: fast_dumps(obj).decode()) if fast_dumps else app.json.dumps
+    if fmt == 'ndjson':
+        chunks, mimetype = ndjson_chunks(batches, dumps), 'application/x-ndjson'
+    elif fmt == 'xml':
+        chunks, mimetype = xml_chunks(batches), 'application/xml'
+    else:
+        chunks, mimetype = json_array_chunks(batches, dumps), 'application/json'
+    return Response(stream_with_context(chunks), mimetype=mimetype)
+
 @app.route('/students/<int:student_id>', methods=['GET'])
 @token_required
 def get_student(student_id):
+    columns, error = _fields_arg()
+    expand, expand_error = _expand_arg(columns)
+    error = error or expand_error
+    if error:
+        return format_response({'message': error}, 400)
     try:
-        cur = mysql.connection.cursor()
-        try:
-            cur.execute("SELECT * FROM student WHERE student_id = %s", (student_id,))
-            row = cur.fetchone()
-            
-            if row:
-                columns = [col[0] for col in cur.description]
-                student = dict(zip(columns, row))
-                return format_response({'student': student})
-            else:
+        # The cache comes first: a hit (304 or not) needs no database round trip.
+        _check_cache_version()
+        cache_token, student = _cached_student(student_id)
+        if student is None:
+            if not expand and _row_etag_sent(student_id):
+                # Conditional miss: compare row_version (a primary-key read)
+                # before fetching and serializing the whole row.
+                not_modified = _not_modified_row(students.get(student_id, ('student_id', 'row_version')))
+                if not_modified is not None:
+                    return not_modified
+            # Only full rows go into the cache; projections are served from it.
+            student = students.get(student_id, _row_columns(columns))
+            if not student:
                 return format_response({'message': 'Student not found'}, 404)
-        finally:
-            cur.close()
+            if not columns:
+                student_cache.set_student(student_id, {'student': student}, cache_token)
+        return _student_response(student, columns, expand)
+    except Exception as e:
+        return format_response({'message': str(e)}, 500)
+
+@app.route('/students/<int:student_id>/enrollments', methods=['GET'])
+@token_required
+def get_student_enrollments(student_id):
+    # Each enrollment with its course and department, from one joined query.
+    try:
+        enrollments = catalog.student_enrollments(student_id)
+        if enrollments is None:
+            return format_response({'message': 'Student not found'}, 404)
+        return format_response({'student_id': student_id, 'enrollments': enrollments})
+    except Exception as e:
+        return format_response({'message': str(e)}, 500)
+
+def _list_resource(resource):
+    limit, after, error = _page_args()
+    filters = {}
+    for column in RESOURCES[resource][3]:
+        value = request.args.get(column)
+        if value is None:
+            continue
+        if column == 'semester':
+            filters[column] = value
+            continue
+        try:
+            filters[column] = int(value)
+        except ValueError:
+            error = error or f'Invalid {column}'
+    if error:
+        return format_response({'message': error}, 400)
+    try:
+        return format_response(catalog.page(resource, limit=limit, after=after, filters=filters))
+    except Exception as e:
+        return format_response({'message': str(e)}, 500)
+
+def _get_resource(resource, item_id, name):
+    try:
+        item = catalog.get(resource, item_id)
+        if item is None:
+            return format_response({'message': f'{name.capitalize()} not found'}, 404)
+        return format_response({name: item})
+    except Exception as e:
+        return format_response({'message': str(e)}, 500)
+
+@app.route('/departments', methods=['GET'])
+@token_required
+def get_departments():
+    return _list_resource('departments')
+
+@app.route('/departments/<int:dept_id>', methods=['GET'])
+@token_required
+def get_department(dept_id):
+    return _get_resource('departments', dept_id, 'department')
+
+@app.route('/instructors', methods=['GET'])
+@token_required
+def get_instructors():
+    return _list_resource('instructors')
+
+@app.route('/instructors/<int:instr_id>', methods=['GET'])
+@token_required
+def get_instructor(instr_id):
+    return _get_resource('instructors', instr_id, 'instructor')
+
+@app.route('/courses', methods=['GET'])
+@token_required
+def get_courses():
+    return _list_resource('courses')
+
+@app.route('/courses/<int:course_id>', methods=['GET'])
+@token_required
+def get_course(course_id):
+    return _get_resource('courses', course_id, 'course')
+
+@app.route('/enrollments', methods=['GET'])
+@token_required
+def get_enrollments():
+    return _list_resource('enrollments')
+
+@app.route('/enrollments/<int:enroll_id>', methods=['GET'])
+@token_required
+def get_enrollment(enroll_id):
+    return _get_resource('enrollments', enroll_id, 'enrollment')
+
+def _load_aggregate_students():
+    for _, rows in students.export_batches(app.config['EXPORT_BATCH_SIZE'], ('student_id', 'dept_id', 'gpa')):
+        yield from rows
+
+def _refresh_aggregates(wait=False):
+    # Both loads run on the current app context's one connection.
+    aggregates.refresh(_load_aggregate_students, catalog.enrollment_totals, wait=wait)
+
+def _refresh_aggregates_in_background():
+    # The rebuild thread gets its own app context (and pooled connection).
+    with app.app_context():
+        try:
+            _refresh_aggregates()
+        except Exception:
+            app.logger.exception("Failed to rebuild the /stats aggregates")
+
+def _aggregates_ready():
+    # Starts a rebuild when stale; requests never wait for the full scan.
+    return aggregates.refresh_in_background(_refresh_aggregates_in_background)
+
+def _stats_pending():
+    response = format_response({'message': 'Statistics are being computed, retry shortly'}, 503)
+    response.headers['Retry-After'] = '1'
+    return response
+
+@app.route('/stats/departments', methods=['GET'])
+@token_required
+def department_stats():
+    # Student count and average GPA per department, from the in-process aggregates.
+    if not _aggregates_ready():
+        return _stats_pending()
+    try:
+        rows = aggregates.departments()
+        names = catalog.get_many('departments', [r['dept_id'] for r in rows if r['dept_id'] is not None])
+        for row in rows:
+            row['dept_name'] = names.get(row['dept_id'], {}).get('dept_name')
+        return format_response({'departments': rows, 'staleness': aggregates.staleness('departments')})
+    except Exception as e:
+        return format_response({'message': str(e)}, 500)
+
+@app.route('/stats/courses', methods=['GET'])
+@token_required
+def course_stats():
+    # Enrollment count and average grade per course and semester.
+    semester = request.args.get('semester')
+    if not _aggregates_ready():
+        return _stats_pending()
+    try:
+        rows = aggregates.courses()
+        if semester:
+            rows = [r for r in rows if r['semester'] == semester]
+        courses = catalog.get_many('courses', {r['course_id'] for r in rows if r['course_id'] is not None})
+        for row in rows:
+            course = courses.get(row['course_id'], {})
+            row['course_code'] = course.get('course_code')
+            row['title'] = course.get('title')
+        return format_response({'courses': rows, 'staleness': aggregates.staleness('courses')})
     except Exception as e:
         return format_response({'message': str(e)}, 500)
 
-@app.route('/students/<int:student_id>', methods=['PUT'])
+# ETag of GET /students/<id> (see _row_validators): student-<id>-v<row_version>-<format>[-<fields>]
+ROW_ETAG = re.compile(r'student-(\d+)-v(\d+)-')
+
+def _if_match_versions(student_id):
+    # If-Match as row_version values: None when absent or "*", otherwise the
+    # versions the client will accept. Takes a bare row_version ("3") or the
+    # ETag of GET /students/<id>; weak tags count too, since compressed
+    # responses weaken the ETag. Returns (versions, error_response).
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None, None
+    versions = []
+    for tag in if_match.as_set(include_weak=True):
+        match = ROW_ETAG.match(tag)
+        if tag.isdigit():
+            versions.append(int(tag))
+        elif match and int(match.group(1)) == student_id:
+            versions.append(int(match.group(2)))
+    if not versions:
+        return None, format_response({'message': "If-Match must be a row_version or this student's ETag"}, 412)
+    return versions, None
+
+def _version_conflict(e):
+    return format_response({'message': 'Student was modified by another request',
+                            'row_version': e.current_version}, 412)
+
+@app.route('/students/<int:student_id>', methods=['PUT', 'PATCH'])
 @token_required
 def update_student(student_id):
+    # Both methods apply a partial update: only the fields sent are changed.
     data = request.get_json()
     if not data:
         return format_response({'message': 'No input data provided'}, 400)
-    
-    try:
-        cur = mysql.connection.cursor()
-        try:
-            # Check if student exists
-            cur.execute("SELECT * FROM student WHERE student_id = %s", (student_id,))
-            if not cur.fetchone():
-                return format_response({'message': 'Student not found'}, 404)
 
-            update_fields = []
-            values = []
-            if 'student_name' in data:
-                update_fields.append("student_name = %s")
-                values.append(data['student_name'])
-            if 'year_level' in data:
-                try:
-                    values.append(int(data['year_level']))
-                    update_fields.append("year_level = %s")
-                except ValueError:
-                    return format_response({'message': 'Invalid year_level'}, 400)
-            if 'gpa' in data:
-                try:
-                    values.append(float(data['gpa']))
-                    update_fields.append("gpa = %s")
-                except ValueError:
-                    return format_response({'message': 'Invalid gpa'}, 400)
-            if 'dept_id' in data:
-                try:
-                    values.append(int(data['dept_id']))
-                    update_fields.append("dept_id = %s")
-                except ValueError:
-                    return format_response({'message': 'Invalid dept_id'}, 400)
-                
-            if not update_fields:
-                 return format_response({'message': 'No fields to update'}, 400)
-                 
-            values.append(student_id)
-            query = f"UPDATE student SET {', '.join(update_fields)} WHERE student_id = %s"
-            cur.execute(query, tuple(values))
-            mysql.connection.commit()
-            return format_response({'message': 'Student updated successfully'})
-        finally:
-            cur.close()
+    fields = {}
+    if 'student_name' in data:
+        fields['student_name'] = data['student_name']
+    for field, convert in (('year_level', int), ('gpa', float), ('dept_id', int)):
+        if field in data:
+            try:
+                fields[field] = convert(data[field])
+            except (TypeError, ValueError):
+                return format_response({'message': f'Invalid {field}'}, 400)
+    if not fields:
+        return format_response({'message': 'No fields to update'}, 400)
+    expected, error = _if_match_versions(student_id)
+    if error:
+        return error
+
+    try:
+        version = students.update(student_id, fields, expected)
+        if version is None:
+            return format_response({'message': 'Student not found'}, 404)
+        if 'student_name' in fields:
+            search_index.add(student_id, fields['student_name'])
+        aggregates.update(student_id, fields)
+        student_cache.invalidate(student_id)
+        return format_response({'message': 'Student updated successfully', 'row_version': version})
+    except VersionConflict as e:
+        return _version_conflict(e)
     except Exception as e:
         return format_response({'message': str(e)}, 500)
 
 @app.route('/students/<int:student_id>', methods=['DELETE'])
 @token_required
 def delete_student(student_id):
+    expected, error = _if_match_versions(student_id)
+    if error:
+        return error
     try:
-        cur = mysql.connection.cursor()
-        try:
-            cur.execute("DELETE FROM student WHERE student_id = %s", (student_id,))
-            mysql.connection.commit()
-            affected_rows = cur.rowcount
-            
-            if affected_rows > 0:
-                return format_response({'message': 'Student deleted successfully'})
-            else:
-                return format_response({'message': 'Student not found'}, 404)
-        finally:
-            cur.close()
+        if students.delete(student_id, expected):
+            search_index.remove(student_id)
+            aggregates.remove(student_id)
+            student_cache.invalidate(student_id)
+            return format_response({'message': 'Student deleted successfully'})
+        else:
+            return format_response({'message': 'Student not found'}, 404)
+    except VersionConflict as e:
+        return _version_conflict(e)
     except Exception as e:
         return format_response({'message': str(e)}, 500)
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    if not app.config['METRICS_PUBLIC'] and not _is_local_request():
+        return format_response({'message': 'Forbidden'}, 403)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/ui', methods=['GET'])
 def ui_home():
     # This UI is intended for local development/testing only.
     return render_template('test.html')
 
 
+def _job_accepted(job):
+    return jsonify({
+        'job_id': job.id,
+        'status_url': f'/admin/jobs/{job.id}',
+        'output_url': f'/admin/jobs/{job.id}/output',
+    }), 202
+
+
+def _int_params(data, defaults):
+    # {name: int} from a JSON body, falling back to `defaults`; (params, error).
+    params = {}
+    for name, default in defaults.items():
+        value = data.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            return None, f'{name} must be a non-negative integer'
+        params[name] = value
+    return params, None
+
+
+def _seed_job(job, params):
+    # Same generators as `python -m seed`, called in-process: the LOAD DATA
+    # loader against MySQL, repository inserts against SQLite.
+    if app.config['STORAGE_BACKEND'] == 'sqlite':
+        from seed.embedded import seed_repository
+        report = seed_repository(students, log=job.log, **params)
+    else:
+        from seed.cli import seed_database
+        report = seed_database(log=job.log, fast_names=True, **params)
+    # The seeders bypass the write routes: rebuild instead of waiting for AGGREGATE_TTL.
+    student_cache.clear()
+    aggregates.invalidate()
+    try:
+        _refresh_aggregates(wait=True)
+    except Exception:
+        aggregates.invalidate()
+        app.logger.exception("Failed to rebuild aggregates after seeding")
+    return {'ok': True, 'tables': report}
+
+
 @app.route('/admin/seed', methods=['POST'])
 @admin_required
 def admin_seed_database():
-    result = _run_python_script('tests/insert_data.py')
-    status = 200 if result.get('ok') else 500
-    return jsonify(result), status
+    params, error = _int_params(request.get_json(silent=True) or {},
+                                {'instructors': 15, 'students': 50, 'enrollments': 100, 'seed': 0})
+    if error:
+        return jsonify({'message': error}), 400
+    job = jobs.submit('seed', lambda job: _seed_job(job, params), params)
+    return _job_accepted(job)
+
+
+@app.route('/admin/pool', methods=['GET'])
+@admin_required
+def admin_pool_stats():
+    return jsonify(mysql.pool.stats())
+
+
+@app.route('/admin/cache', methods=['GET', 'DELETE'])
+@admin_required
+def admin_cache():
+    if request.method == 'DELETE':
+        student_cache.clear()
+    return jsonify(student_cache.info())
+
+
+@app.route('/admin/aggregates', methods=['GET', 'POST'])
+@admin_required
+def admin_aggregates():
+    # POST starts a rebuild of the /stats aggregates (e.g. after running the seed CLI).
+    if request.method == 'POST':
+        aggregates.invalidate()
+        _aggregates_ready()
+        return jsonify({view: aggregates.staleness(view) for view in ('departments', 'courses')}), 202
+    return jsonify({view: aggregates.staleness(view) for view in ('departments', 'courses')})
+
+
+@app.route('/admin/tokens', methods=['GET'])
+@admin_required
+def admin_token_cache():
+    return jsonify(token_cache.info())
+
+
+@app.route('/admin/tokens/revoke', methods=['POST'])
+@admin_required
+def admin_revoke_token():
+    data = request.get_json(silent=True) or {}
+    token = data.get('token')
+    if not token:
+        return jsonify({'message': 'Missing field: token'}), 400
+    try:
+        payload = jwt.decode(token, app.config['JWT_SECRET_KEY'], algorithms=["HS256"])
+    except jwt.ExpiredSignatureError:
+        return jsonify({'message': 'Token has already expired'})
+    except jwt.InvalidTokenError:
+        return jsonify({'message': 'Token is invalid!'}), 400
+    token_cache.revoke(token_digest(token), payload)
+    return jsonify({'message': 'Token revoked'})
+
+
+def _test_env():
+    # Environment for test processes: none of this server's settings (they
+    # come from the environment), so the tests run on their hermetic defaults
+    # (in-memory SQLite, in-process cache, temp log file) instead of the live
+    # database, Redis and log.
+    env = {name: value for name, value in os.environ.items() if not hasattr(SystemConfig, name)}
+    env['STORAGE_BACKEND'] = 'sqlite'
+    return env
 
 
 @app.route('/admin/run-tests', methods=['POST'])
 @admin_required
 def admin_run_tests():
-    result = _run_python_script('tests/test_api.py')
-    status = 200 if result.get('ok') else 500
-    return jsonify(result), status
+    data = request.get_json(silent=True) or {}
+    pattern = data.get('pattern', 'test_api.py')
+    tests_dir = str(Path(app.root_path) / 'tests')
+    # Only test modules shipped in tests/ can be selected.
+    modules = matching_test_modules(tests_dir, pattern) if isinstance(pattern, str) and '/' not in pattern else []
+    if not modules:
+        return jsonify({'message': 'pattern must match test modules in tests/, e.g. test_*.py'}), 400
+    params, error = _int_params(data, {'shards': 1})
+    if error or params['shards'] < 1:
+        return jsonify({'message': error or 'shards must be at least 1'}), 400
+    params['pattern'] = pattern
+    job = jobs.submit('tests', lambda job: run_unittests(job, start_dir=tests_dir, modules=modules,
+                                                         shards=params['shards'], env=_test_env()), params)
+    return _job_accepted(job)
+
+
+@app.route('/admin/jobs', methods=['GET'])
+@admin_required
+def admin_jobs():
+    return jsonify({'jobs': [job.info() for job in reversed(jobs.jobs())]})
+
+
+@app.route('/admin/jobs/<job_id>', methods=['GET'])
+@admin_required
+def admin_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'message': 'Job not found'}), 404
+    return jsonify(job.info())
+
+
+@app.route('/admin/jobs/<job_id>/output', methods=['GET'])
+@admin_required
+def admin_job_output(job_id):
+    # Plain-text output, streamed while the job runs; ?offset=N skips lines
+    # already read. The stream ends after ADMIN_JOB_OUTPUT_TIMEOUT seconds
+    # even if the job is still running, so it cannot pin a worker thread.
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'message': 'Job not found'}), 404
+    offset = request.args.get('offset', 0, type=int)
+    lines = (line + '\n' for line in job.lines(max(offset, 0), timeout=app.config['ADMIN_JOB_OUTPUT_TIMEOUT']))
+    return Response(stream_with_context(lines), mimetype='text/plain')
 
 if __name__ == '__main__':
     app.run(debug=True, use_reloader=False)
\ No newline at end of file
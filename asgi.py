@@ -0,0 +1,223 @@
+import asyncio
+import io
+import sys
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import make_response, request
+
+import app as api
+from api.cache import MISSING
+from database.aio import create_async_repository
+from database.students import SearchIndexMissing
+
+# Async serving mode: `uvicorn asgi:application`. The hot student reads
+# (GET /students, GET /students?ids=..., GET /students/<id>) run as
+# coroutines on an async connection pool, so one process keeps many DB
+# requests in flight. They run inside a normal Flask request context and
+# share their parsing, caching and response helpers with the WSGI views, so
+# before/after_request hooks (logging, metrics, compression), token checks
+# and format_response behave exactly as in the WSGI app. Anything that can
+# block or burn CPU (cache backends, serialization, compression, the token
+# check) runs via asyncio.to_thread, off the event loop. Every other route,
+# and reads the async path does not cover (expand=, the trigram search
+# backend, ?profile=1, HEAD), goes to the Flask app on asgiref's thread pool.
+
+app = api.app
+students = create_async_repository(app.config, api.students)
+wsgi = WsgiToAsgi(app)
+
+
+def _environ(scope, body=b''):
+    # WSGI environ for a request context; mirrors what asgiref builds.
+    script_name = scope.get('root_path', '').encode('utf8').decode('latin1')
+    path_info = scope['path'].encode('utf8').decode('latin1')
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin1')
+        environ[key] = environ[key] + ',' + value if key in environ else value
+    return environ
+
+
+async def _check_cache_version():
+    # See app._check_cache_version; the counter is read on the event loop.
+    if api.student_cache.poll_due():
+        await asyncio.to_thread(api.student_cache.saw_version, await students.version())
+
+
+async def get_students():
+    if 'ids' in request.args:
+        return await _batch_get([v for v in request.args['ids'].split(',') if v.strip()])
+    args, _, error = api._list_args()
+    if error:
+        return api.format_response({'message': error}, 400)
+    try:
+        validators = api._validators_for(await students.version())
+        if validators and validators.not_modified(request):
+            return validators.apply(make_response('', 304))
+
+        cache_key, cache_token, page = await asyncio.to_thread(api._cached_page, args,
+                                                               validators and validators.version)
+        if page is MISSING:
+            try:
+                search_query, match, by_relevance, limit, after, columns = args
+                page = await students.page(search=search_query, match=match, by_relevance=by_relevance, limit=limit,
+                                           after=after, backend=api.search_state['backend'], columns=columns)
+            except SearchIndexMissing:
+                page = await asyncio.to_thread(api._search_fallback, args)
+            await asyncio.to_thread(api.student_cache.set_list, cache_key, page, cache_token)
+        return await asyncio.to_thread(api._page_response, page, validators)
+    except Exception as e:
+        return api.format_response({'message': str(e)}, 500)
+
+
+async def _batch_get(values):
+    ids, columns, _, error = api._batch_args(values)
+    if error:
+        return api.format_response({'message': error}, 400)
+    try:
+        validators = api._validators_for(await students.version())
+        if validators and validators.not_modified(request):
+            return validators.apply(make_response('', 304))
+
+        # Cache first, then every chunk of misses as a concurrent IN (...) query.
+        await _check_cache_version()
+        cache_token, found = await asyncio.to_thread(api._cached_students, ids)
+        chunks = api._id_chunks([i for i in ids if i not in found])
+        for rows in await asyncio.gather(*(students.get_many(chunk, columns) for chunk in chunks)):
+            if not columns:
+                await asyncio.to_thread(api._cache_students, rows, cache_token)
+            found.update(rows)
+        return await asyncio.to_thread(api._batch_response, ids, found, columns, validators)
+    except Exception as e:
+        return api.format_response({'message': str(e)}, 500)
+
+
+async def get_student(student_id):
+    columns, error = api._fields_arg()
+    if error:
+        return api.format_response({'message': error}, 400)
+    try:
+        await _check_cache_version()
+        cache_token, student = await asyncio.to_thread(api._cached_student, student_id)
+        if student is None:
+            if api._row_etag_sent(student_id):
+                not_modified = api._not_modified_row(await students.get(student_id, ('student_id', 'row_version')))
+                if not_modified is not None:
+                    return not_modified
+            student = await students.get(student_id, api._row_columns(columns))
+            if not student:
+                return api.format_response({'message': 'Student not found'}, 404)
+            if not columns:
+                await asyncio.to_thread(api.student_cache.set_student, student_id, {'student': student}, cache_token)
+        return await asyncio.to_thread(api._student_response, student, columns)
+    except Exception as e:
+        return api.format_response({'message': str(e)}, 500)
+
+
+# Flask endpoint name -> coroutine serving it.
+ASYNC_VIEWS = {
+    'get_students': get_students,
+    'get_student': get_student,
+}
+
+
+def _async_view(scope):
+    # (coroutine, URL arguments) when this request is served natively, else (None, None).
+    if scope['method'] != 'GET':
+        return None, None
+    args = parse_qs(scope['query_string'].decode('latin1'))
+    if 'expand' in args or 'profile' in args:
+        return None, None
+    if ('search' in args and args.get('match', ['contains'])[0] != 'prefix'
+            and api.search_state['backend'] == 'trigram'):
+        return None, None
+    adapter = app.url_map.bind('localhost')
+    try:
+        endpoint, view_args = adapter.match(scope['path'], method='GET')
+    except Exception:
+        return None, None
+    view = ASYNC_VIEWS.get(endpoint)
+    return (view, view_args) if view else (None, None)
+
+
+def _finish(response):
+    return app.process_response(app.make_response(response))
+
+
+async def _dispatch(view, view_args, scope, send):
+    with app.request_context(_environ(scope)):
+        try:
+            response = app.preprocess_request()
+            if response is None:
+                # The revocation check may reach Redis or the database.
+                response = await asyncio.to_thread(api.authenticate)
+            if response is None:
+                response = await view(**view_args)
+            # after_request compresses the body and writes the request log.
+            response = await asyncio.to_thread(_finish, response)
+        except Exception as e:
+            response = app.make_response(app.handle_exception(e))
+        headers = [(k.lower().encode('latin1'), v.encode('latin1')) for k, v in response.headers.items()]
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await students.start()
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await students.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    view, view_args = _async_view(scope) if scope['type'] == 'http' else (None, None)
+    if view is None:
+        await wsgi(scope, receive, send)
+        return
+    await _dispatch(view, view_args, scope, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run('asgi:application', host='127.0.0.1', port=5000)
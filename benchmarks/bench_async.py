@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.load import HttpClient, run_benchmark
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+READ_ENDPOINTS = ('list', 'search', 'single')
+
+# How each serving mode is started when no URL is given.
+SERVERS = {
+    'wsgi': [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--with-threads', '--port', '{port}'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:application', '--log-level', 'warning', '--port', '{port}'],
+}
+
+
+def start_server(mode: str, port: int, timeout: float = 30.0):
+    command = [part.format(port=port) for part in SERVERS[mode]]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{mode} server exited with status {process.returncode}')
+        try:
+            urllib.request.urlopen(url + '/ui', timeout=1).close()
+            return process, url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode} server did not start within {timeout}s')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Compare the WSGI (threaded Flask) and ASGI (asgi.py) serving modes.')
+    parser.add_argument('--wsgi-url', help='benchmark a running WSGI server instead of starting one')
+    parser.add_argument('--asgi-url', help='benchmark a running ASGI server instead of starting one')
+    parser.add_argument('--port', type=int, default=5100, help='first port for servers started here (default: 5100)')
+    parser.add_argument('--concurrency', default='16,64,256', help='comma-separated client concurrency levels (default: %(default)s)')
+    parser.add_argument('--requests', type=int, default=1000, help='requests per endpoint and level (default: 1000)')
+    parser.add_argument('--warmup', type=int, default=50, help='untimed warm-up requests per phase (default: 50)')
+    parser.add_argument('--endpoints', default=','.join(READ_ENDPOINTS), help='comma-separated subset of %(default)s')
+    parser.add_argument('--students', type=int, default=0, help='seed this many students first (default: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for data and request mix (default: 0)')
+    parser.add_argument('--output', default='benchmarks/async_results.json', help='where to write results (default: %(default)s)')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    levels = [int(c) for c in args.concurrency.split(',') if c]
+    endpoints = [e for e in args.endpoints.split(',') if e]
+    unknown = set(endpoints) - set(READ_ENDPOINTS)
+    if unknown:
+        print(f"Error: unknown endpoint: {', '.join(sorted(unknown))}")
+        return 2
+    if os.environ.get('STORAGE_BACKEND', 'mysql') != 'mysql':
+        print('Warning: the comparison is only meaningful against MySQL (STORAGE_BACKEND=mysql)')
+    if args.students:
+        from seed.cli import seed_database
+        seed_database(students=args.students, seed=args.seed, fast_names=True)
+
+    results = {}
+    for offset, mode in enumerate(SERVERS):
+        process = None
+        url = getattr(args, f'{mode}_url')
+        if url is None:
+            process, url = start_server(mode, args.port + offset)
+        try:
+            client = HttpClient(url)
+            results[mode] = {}
+            for level in levels:
+                print(f"{mode} @ concurrency {level}")
+                phase = run_benchmark(client, endpoints=endpoints, formats=('json',), requests_per_phase=args.requests,
+                                      concurrency=level, warmup=args.warmup, seed=args.seed,
+                                      log=lambda line: print('  ' + line))
+                results[mode][str(level)] = phase
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+
+    print(f"\n{'phase':<14}{'clients':>8}{'wsgi req/s':>12}{'asgi req/s':>12}{'speedup':>9}"
+          f"{'wsgi p95':>11}{'asgi p95':>11}")
+    for level in levels:
+        for key, wsgi in results['wsgi'][str(level)].items():
+            asgi = results['asgi'][str(level)][key]
+            speedup = asgi['throughput'] / wsgi['throughput'] if wsgi['throughput'] else 0.0
+            print(f"{key:<14}{level:>8}{wsgi['throughput']:>12.1f}{asgi['throughput']:>12.1f}{speedup:>8.2f}x"
+                  f"{wsgi['p95_ms']:>9.1f}ms{asgi['p95_ms']:>9.1f}ms")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'requests_per_phase': args.requests,
+            'concurrency': levels,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import sys
+import os
+import datetime
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import jwt
+
+import app as app_module
+from api.tokens import TokenCache, token_digest
+from app import app, token_required
+
+ROUNDS = 20000
+
+
+@app.route('/_bench/auth')
+@token_required
+def _bench_auth():
+    return 'ok'
+
+
+def _report(label: str, seconds: float, rounds: int):
+    print(f"{label:<40} {seconds / rounds * 1e6:8.2f} us/op")
+
+
+def bench_auth(rounds: int = ROUNDS):
+    secret = app.config['JWT_SECRET_KEY']
+    token = jwt.encode({
+        'user': 'bench',
+        'exp': datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=30),
+    }, secret, algorithm="HS256")
+
+    # The backend the app is configured with (Redis or the token_revocation
+    # table), as token_required sees it.
+    revocations = app_module.token_cache.revocations
+    print(f"Auth micro-benchmarks ({rounds} rounds, {type(revocations).__name__})")
+
+    seconds = timeit.timeit(lambda: jwt.decode(token, secret, algorithms=["HS256"]), number=rounds)
+    _report("jwt.decode (HS256)", seconds, rounds)
+
+    seconds = timeit.timeit(lambda: token_digest(token), number=rounds)
+    _report("token_digest (SHA-256)", seconds, rounds)
+
+    digest = token_digest(token)
+    cache = TokenCache(revocations=revocations)
+    cache.put(digest, jwt.decode(token, secret, algorithms=["HS256"]))
+    with app.app_context():
+        cache.is_revoked(digest)
+        seconds = timeit.timeit(lambda: (cache.is_revoked(digest), cache.get(digest)), number=rounds)
+    _report("TokenCache revocation check + lookup", seconds, rounds)
+
+    # Whole request through token_required, without and with the cache.
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    request_rounds = max(rounds // 10, 1)
+    for label, size in (("request, cache disabled", 0), ("request, cache enabled", app.config['TOKEN_CACHE_SIZE'] or 10000)):
+        app_module.token_cache = TokenCache(max_entries=size, revocations=revocations)
+        client.get('/_bench/auth', headers=headers)
+        seconds = timeit.timeit(lambda: client.get('/_bench/auth', headers=headers), number=request_rounds)
+        _report(label, seconds, request_rounds)
+
+
+if __name__ == '__main__':
+    bench_auth(int(sys.argv[1]) if len(sys.argv) > 1 else ROUNDS)
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.config import SystemConfig
+
+ENDPOINTS = ('login', 'list', 'search', 'single', 'create', 'update', 'delete')
+FORMATS = ('json', 'xml')
+# Writes use IDs far above anything the seeders hand out, and clean up after themselves.
+WRITE_ID_BASE = 1_000_000_000
+
+
+class InProcessClient:
+    # Drives the app through Flask's test client: no HTTP server or sockets,
+    # so the numbers cover the app layer plus whatever storage it is configured with.
+
+    def __init__(self):
+        from app import app, students
+        self._app = app
+        self.repository = students
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, headers: dict, body=None) -> tuple:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self._app.test_client()
+        response = client.open(path, method=method, headers=headers, json=body)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, headers: dict, body=None) -> tuple:
+        data = None
+        headers = dict(headers)
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    # Nearest-rank percentile of an already sorted list.
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list, errors: int, seconds: float) -> dict:
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        'requests': count,
+        'errors': errors,
+        'seconds': round(seconds, 4),
+        'throughput': round(count / seconds, 2) if seconds > 0 else 0.0,
+        'mean_ms': round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def run_phase(client, requests: list, concurrency: int, expected: tuple) -> dict:
+    # `requests` is a list of (method, path, headers, body); each one is timed on its own.
+    def timed(req):
+        started = time.perf_counter()
+        try:
+            status, _ = client.request(*req)
+        except Exception:
+            status = None
+        return time.perf_counter() - started, status in expected
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed, requests))
+    seconds = time.perf_counter() - started
+    latencies = [latency for latency, _ in outcomes]
+    errors = sum(1 for _, ok in outcomes if not ok)
+    return summarize(latencies, errors, seconds)
+
+
+def login_headers() -> dict:
+    credentials = f"{SystemConfig.API_USERNAME}:{SystemConfig.API_PASSWORD}"
+    return {'Authorization': 'Basic ' + base64.b64encode(credentials.encode()).decode()}
+
+
+def fetch_token(client) -> str:
+    status, body = client.request('POST', '/login', login_headers())
+    if status != 200:
+        raise RuntimeError(f'Login failed with status {status}')
+    return json.loads(body)['token']
+
+
+def sample_students(client, headers: dict, limit: int = 1000) -> list:
+    status, body = client.request('GET', f'/students?limit={limit}', headers)
+    if status != 200:
+        raise RuntimeError(f'GET /students failed with status {status}')
+    students = json.loads(body)['students']
+    if not students:
+        raise RuntimeError('No students to benchmark against; seed the database first')
+    return students
+
+
+def search_terms(students: list, rng: random.Random, count: int) -> list:
+    # Substrings of real names, so searches return something.
+    terms = []
+    for _ in range(count):
+        name = rng.choice(students)['student_name'].split()[-1]
+        start = rng.randrange(max(len(name) - 3, 1))
+        terms.append(name[start:start + 4])
+    return terms
+
+
+def build_requests(endpoint: str, fmt: str, count: int, *, auth: dict, students: list,
+                   rng: random.Random, write_ids: list) -> tuple:
+    # Returns (requests, accepted status codes) for one endpoint/format phase.
+    if endpoint == 'login':
+        return [('POST', '/login', login_headers(), None)] * count, (200,)
+    suffix = f'format={fmt}'
+    if endpoint == 'list':
+        return [('GET', f'/students?limit=100&{suffix}', auth, None)] * count, (200,)
+    if endpoint == 'search':
+        terms = search_terms(students, rng, count)
+        return [('GET', f'/students?search={urllib.request.quote(t)}&limit=100&{suffix}', auth, None)
+                for t in terms], (200,)
+    if endpoint == 'single':
+        return [('GET', f"/students/{rng.choice(students)['student_id']}?{suffix}", auth, None)
+                for _ in range(count)], (200,)
+    dept_ids = sorted({s['dept_id'] for s in students})
+    if endpoint == 'create':
+        return [('POST', f'/students?{suffix}', auth, {
+            'student_id': student_id,
+            'student_name': f'Bench Student {student_id}',
+            'year_level': rng.randint(1, 4),
+            'gpa': round(rng.uniform(1.0, 4.0), 2),
+            'dept_id': rng.choice(dept_ids),
+        }) for student_id in write_ids], (201,)
+    if endpoint == 'update':
+        return [('PUT', f'/students/{student_id}?{suffix}', auth, {'gpa': round(rng.uniform(1.0, 4.0), 2)})
+                for student_id in write_ids], (200,)
+    if endpoint == 'delete':
+        return [('DELETE', f'/students/{student_id}?{suffix}', auth, None) for student_id in write_ids], (200,)
+    raise ValueError(f'Unknown endpoint {endpoint!r}')
+
+
+def run_benchmark(client, *, endpoints=ENDPOINTS, formats=FORMATS, requests_per_phase: int = 200,
+                  concurrency: int = 8, warmup: int = 20, seed: int = 0, log=print) -> dict:
+    rng = random.Random(seed)
+    auth = {'Authorization': f'Bearer {fetch_token(client)}'}
+    students = sample_students(client, auth)
+    results = {}
+    write_base = WRITE_ID_BASE + rng.randrange(100_000) * 1000
+
+    for fmt in formats:
+        # create/update/delete share one ID set per format so the dataset ends where it started.
+        write_ids = [write_base + i for i in range(requests_per_phase)]
+        write_base += requests_per_phase
+        for endpoint in endpoints:
+            if endpoint == 'login' and fmt != formats[0]:
+                continue  # /login always answers JSON
+            requests, expected = build_requests(endpoint, fmt, requests_per_phase, auth=auth,
+                                                students=students, rng=rng, write_ids=write_ids)
+            if warmup and endpoint in ('login', 'list', 'search', 'single'):
+                run_phase(client, requests[:warmup], concurrency, expected)
+            key = endpoint if endpoint == 'login' else f'{endpoint}:{fmt}'
+            results[key] = run_phase(client, requests, concurrency, expected)
+            r = results[key]
+            log(f"{key:<14} {r['throughput']:>9.1f} req/s  p50 {r['p50_ms']:>8.2f}ms  "
+                f"p95 {r['p95_ms']:>8.2f}ms  p99 {r['p99_ms']:>8.2f}ms  errors {r['errors']}")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    # Regressions beyond `threshold` (fraction): throughput down or p95 latency up.
+    regressions = []
+    for key, current in results.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        if before['throughput'] and current['throughput'] < before['throughput'] * (1 - threshold):
+            regressions.append(f"{key}: throughput {before['throughput']} -> {current['throughput']} req/s")
+        if before['p95_ms'] and current['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f"{key}: p95 {before['p95_ms']} -> {current['p95_ms']} ms")
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Load benchmark for the student REST API.')
+    parser.add_argument('--url', help='benchmark a running server at this base URL instead of the in-process app')
+    parser.add_argument('--students', type=int, default=0,
+                        help='seed this many students through the seed package first (default: 0, use existing data)')
+    parser.add_argument('--enrollments', type=int, default=0, help='enrollment rows to seed alongside (default: 0)')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint/format phase (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent clients (default: 8)')
+    parser.add_argument('--warmup', type=int, default=20, help='untimed warm-up requests per read phase (default: 20)')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help=f'comma-separated subset of {",".join(ENDPOINTS)}')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='comma-separated subset of json,xml')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for data and request mix (default: 0)')
+    parser.add_argument('--output', default='benchmarks/results.json', help='where to write results (default: %(default)s)')
+    parser.add_argument('--baseline', help='results file to compare against; exits 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed throughput drop / p95 increase vs the baseline (default: 0.10)')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    endpoints = [e for e in args.endpoints.split(',') if e]
+    formats = [f for f in args.formats.split(',') if f]
+    unknown = set(endpoints) - set(ENDPOINTS) | set(formats) - set(FORMATS)
+    if unknown:
+        print(f"Error: unknown endpoint/format: {', '.join(sorted(unknown))}")
+        return 2
+
+    client = HttpClient(args.url) if args.url else InProcessClient()
+    if args.students:
+        if isinstance(client, InProcessClient) and SystemConfig.STORAGE_BACKEND == 'sqlite':
+            # In-process SQLite has no server to point the seed CLI at.
+            from seed.embedded import seed_repository
+            seed_repository(client.repository, students=args.students, enrollments=args.enrollments, seed=args.seed)
+        else:
+            from seed.cli import seed_database
+            seed_database(students=args.students, enrollments=args.enrollments, seed=args.seed, fast_names=True)
+
+    print(f"Benchmarking {args.url or 'in-process app'}: {args.requests} requests/phase, concurrency {args.concurrency}")
+    results = run_benchmark(client, endpoints=endpoints, formats=formats, requests_per_phase=args.requests,
+                            concurrency=args.concurrency, warmup=args.warmup, seed=args.seed)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'target': args.url or 'in-process',
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'requests_per_phase': args.requests,
+            'concurrency': args.concurrency,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import os
 
 class SystemConfig:
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'mysql') # mysql | sqlite
+    SQLITE_PATH = os.environ.get('SQLITE_PATH', ':memory:') # database file for STORAGE_BACKEND=sqlite
     MYSQL_HOST = os.environ.get('MYSQL_HOST', 'localhost')
     MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
     MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', 'root123')
@@ -8,9 +10,57 @@ class SystemConfig:
     MYSQL_PORT = int(os.environ.get('MYSQL_PORT', 3306))
     MYSQL_POOL_NAME = os.environ.get('MYSQL_POOL_NAME', 'flask_pool')
     MYSQL_POOL_SIZE = int(os.environ.get('MYSQL_POOL_SIZE', 5))
+    MYSQL_POOL_TIMEOUT = float(os.environ.get('MYSQL_POOL_TIMEOUT', 10)) # seconds to wait for a free connection
+    MYSQL_POOL_RECYCLE = float(os.environ.get('MYSQL_POOL_RECYCLE', 1800)) # reconnect connections older than this
+    MYSQL_POOL_PING_INTERVAL = float(os.environ.get('MYSQL_POOL_PING_INTERVAL', 30)) # ping connections idle longer than this
+    MYSQL_ASYNC_POOL_SIZE = int(os.environ.get('MYSQL_ASYNC_POOL_SIZE', 50)) # aiomysql connections for the ASGI mode (asgi.py)
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your_jwt_secret_key')
     API_USERNAME = os.environ.get('API_USERNAME', 'admin')
     API_PASSWORD = os.environ.get('API_PASSWORD', 'password')
+    LOG_FILE = os.environ.get('LOG_FILE', 'logs/api.log')
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 10))
+    LOG_SAMPLE_RATES = os.environ.get('LOG_SAMPLE_RATES', '') # e.g. "GET /students=0.1,GET /students/<int:student_id>=0.05"
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200)) # log statements slower than this; 0 disables
+    METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC', 'false').lower() == 'true' # allow /metrics from non-local addresses
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true' # allow ?profile=1 on local requests
+    TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000)) # verified JWTs kept in memory; 0 disables
+    TOKEN_REVOCATION_REFRESH = float(os.environ.get('TOKEN_REVOCATION_REFRESH', 1)) # seconds before a worker re-reads token_revocation
+    
+    SERVER_BIND = os.environ.get('SERVER_BIND', '0.0.0.0:5000') # serve.py listen address(es), comma-separated
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', os.cpu_count() or 1)) # worker processes
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4)) # request threads per worker
+    SERVER_PRELOAD = os.environ.get('SERVER_PRELOAD', 'true').lower() == 'true' # import the app once, then fork workers
+    SERVER_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS', 10000)) # recycle a worker after this many requests; 0 disables
+    SERVER_MAX_REQUESTS_JITTER = int(os.environ.get('SERVER_MAX_REQUESTS_JITTER', 1000)) # random extra so workers do not recycle together
+    SERVER_KEEPALIVE = int(os.environ.get('SERVER_KEEPALIVE', 5)) # seconds an idle keep-alive connection stays open
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 60)) # restart a worker silent for this long
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30)) # seconds in-flight requests get on reload/stop
+    SERVER_PIDFILE = os.environ.get('SERVER_PIDFILE', 'logs/serve.pid')
+
+    STUDENTS_PAGE_SIZE = int(os.environ.get('STUDENTS_PAGE_SIZE', 100))
+    STUDENTS_MAX_PAGE_SIZE = int(os.environ.get('STUDENTS_MAX_PAGE_SIZE', 1000))
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 500))
+    BATCH_GET_MAX_IDS = int(os.environ.get('BATCH_GET_MAX_IDS', 10000)) # IDs accepted by one batch lookup
+    BATCH_GET_CHUNK_SIZE = int(os.environ.get('BATCH_GET_CHUNK_SIZE', 1000)) # IDs per WHERE student_id IN (...) query
+    ID_BLOCK_SIZE = int(os.environ.get('ID_BLOCK_SIZE', 1000)) # student IDs reserved per round-trip for bulk rows without an ID
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'fulltext') # fulltext | trigram | like
+    SEARCH_NGRAM_SIZE = int(os.environ.get('SEARCH_NGRAM_SIZE', 2)) # must match MySQL ngram_token_size
+    SEARCH_INDEX_TTL = float(os.environ.get('SEARCH_INDEX_TTL', 300)) # seconds between trigram index rebuilds
+    AGGREGATE_TTL = float(os.environ.get('AGGREGATE_TTL', 300)) # seconds between rebuilds of the /stats aggregates
+    ADMIN_JOB_WORKERS = int(os.environ.get('ADMIN_JOB_WORKERS', 2)) # admin seed/test jobs run at once; more wait in the queue
+    ADMIN_JOB_HISTORY = int(os.environ.get('ADMIN_JOB_HISTORY', 50)) # finished jobs kept for /admin/jobs
+    ADMIN_JOB_DIR = os.environ.get('ADMIN_JOB_DIR', 'logs/jobs') # job status and output, shared by every worker
+    ADMIN_JOB_OUTPUT_TIMEOUT = float(os.environ.get('ADMIN_JOB_OUTPUT_TIMEOUT', 30)) # seconds one /output request follows a running job
+    COMPRESSION_ENCODINGS = os.environ.get('COMPRESSION_ENCODINGS', 'br,zstd,gzip') # preference order; unavailable codecs are skipped, empty disables
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024)) # bytes; smaller buffered responses go out as-is
+    JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto') # auto (orjson if installed) | orjson | stdlib
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory') # memory | redis
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_TTL = float(os.environ.get('CACHE_TTL', 60)) # seconds
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 10000))
+    CACHE_VERSION_POLL = float(os.environ.get('CACHE_VERSION_POLL', 1.0)) # seconds between table-version checks of each serve.py worker's in-process cache; 0 disables
     
     # Additional configurations can be added here
     
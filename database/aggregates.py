@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+# Logged by invalidate() while a rebuild loads rows (see rebuild()).
+INVALIDATED = ('invalidate', None, None)
+
+
+def _average(total: float, count: int):
+    return round(total / count, 3) if count else None
+
+
+class StudentAggregates:
+    # In-process materialized views for the dashboards: student count and
+    # average GPA per department, enrollment count and average grade per
+    # course and semester. Rebuilt from the tables every `ttl` seconds (or
+    # right after seeding), on a background thread so no reader waits for the
+    # full scan; this process's student writes adjust the department figures
+    # in between, so no GROUP BY runs per request.
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.built_at = None
+        self.refreshed_at = None
+        self.updated_at = None
+        self._dirty = False
+        # Writes seen while refresh() loads rows; None when no rebuild runs.
+        self._pending = None
+        # student_id -> (dept_id, gpa): what a write has to subtract again.
+        self._students = {}
+        # dept_id -> [students, gpa_sum, students_with_gpa]
+        self._departments = {}
+        # (course_id, semester) -> (enrollments, grade_sum, graded_enrollments)
+        self._courses = {}
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return self._dirty or self.built_at is None or time.monotonic() - self.built_at > self.ttl
+
+    def rebuild(self, student_rows, course_rows):
+        # student_rows: (student_id, dept_id, gpa); course_rows:
+        # (course_id, semester, enrollments, grade_sum, graded_enrollments).
+        students = {}
+        departments = {}
+        for student_id, dept_id, gpa in student_rows:
+            gpa = float(gpa) if gpa is not None else None
+            students[student_id] = (dept_id, gpa)
+            self._apply(departments, dept_id, gpa, 1)
+        courses = {(course_id, semester): (int(count), float(grade_sum or 0), int(graded))
+                   for course_id, semester, count, grade_sum, graded in course_rows}
+        with self._lock:
+            # Writes made while the rows were loading may or may not be in
+            # them. Every change carries absolute values, so replaying all of
+            # them onto the new figures is safe either way.
+            dirty = False
+            for change in self._pending or ():
+                if change is INVALIDATED:
+                    # The loaded rows may predate whatever invalidate() was about.
+                    dirty = True
+                    continue
+                dirty = self._change(students, departments, change) is None or dirty
+            self._pending = None
+            self._students = students
+            self._departments = departments
+            self._courses = courses
+            self._dirty = dirty
+            self.built_at = time.monotonic()
+            self.refreshed_at = self.updated_at = _now()
+
+    def refresh(self, load_students, load_courses, *, wait: bool = False):
+        # Rebuild if stale. Only one thread rebuilds; unless `wait`, the others
+        # return at once and keep serving the current figures.
+        if not self._build_lock.acquire(blocking=wait):
+            return
+        try:
+            if self.stale:
+                with self._lock:
+                    self._pending = []
+                self.rebuild(load_students(), load_courses())
+        finally:
+            with self._lock:
+                self._pending = None
+            self._build_lock.release()
+
+    def refresh_in_background(self, run) -> bool:
+        # Starts run() (which calls refresh(), e.g. inside an app context) on
+        # a daemon thread if the figures are stale and no rebuild is running.
+        # Returns whether there are figures to serve yet.
+        if self.stale and not self._build_lock.locked():
+            threading.Thread(target=run, name='aggregates-refresh', daemon=True).start()
+        return self.built_at is not None
+
+    def invalidate(self):
+        # Rebuild on the next read, e.g. after rows were written behind our back.
+        with self._lock:
+            self._dirty = True
+            if self._pending is not None:
+                self._pending.append(INVALIDATED)
+
+    @staticmethod
+    def _apply(departments, dept_id, gpa, sign: int):
+        totals = departments.setdefault(dept_id, [0, 0.0, 0])
+        totals[0] += sign
+        if gpa is not None:
+            totals[1] += sign * gpa
+            totals[2] += sign
+        if not totals[0]:
+            del departments[dept_id]
+
+    @classmethod
+    def _change(cls, students, departments, change):
+        # Applies one logged write: True if the figures changed, False if it
+        # was a no-op, None if it needs a student we do not know.
+        kind, student_id, arg = change
+        current = students.get(student_id)
+        if kind == 'update':
+            if current is None:
+                return None
+            kind, arg = 'put', (arg.get('dept_id', current[0]), arg.get('gpa', current[1]))
+        if current is not None:
+            del students[student_id]
+            cls._apply(departments, current[0], current[1], -1)
+        if kind == 'put':
+            dept_id, gpa = arg
+            gpa = float(gpa) if gpa is not None else None
+            students[student_id] = (dept_id, gpa)
+            cls._apply(departments, dept_id, gpa, 1)
+        return kind == 'put' or current is not None
+
+    def _write(self, change):
+        # Applies a student write to the current figures and, while a rebuild
+        # is loading rows, logs it for replay onto the new ones.
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(change)
+            if self.built_at is None:
+                return
+            changed = self._change(self._students, self._departments, change)
+            if changed is None:
+                # Written by another process since the last rebuild: rebuild
+                # instead of guessing.
+                self._dirty = True
+            elif changed:
+                self.updated_at = _now()
+
+    def put(self, student_id: int, dept_id: int, gpa):
+        # A created or fully rewritten student.
+        self._write(('put', student_id, (dept_id, gpa)))
+
+    def update(self, student_id: int, fields: dict):
+        # A partial update; only dept_id and gpa matter here.
+        if 'dept_id' not in fields and 'gpa' not in fields:
+            return
+        self._write(('update', student_id, {k: fields[k] for k in ('dept_id', 'gpa') if k in fields}))
+
+    def remove(self, student_id: int):
+        self._write(('remove', student_id, None))
+
+    def departments(self) -> list:
+        with self._lock:
+            return [{'dept_id': dept_id, 'student_count': count, 'avg_gpa': _average(gpa_sum, graded)}
+                    for dept_id, (count, gpa_sum, graded) in sorted(self._departments.items())]
+
+    def courses(self) -> list:
+        with self._lock:
+            items = sorted(self._courses.items(), key=lambda item: (item[0][0], item[0][1] or ''))
+            return [{'course_id': course_id, 'semester': semester, 'enrollment_count': count,
+                     'avg_grade': _average(grade_sum, graded)}
+                    for (course_id, semester), (count, grade_sum, graded) in items]
+
+    def staleness(self, view: str) -> dict:
+        # refreshed_at: last rebuild from the tables; updated_at: last change
+        # from this process's writes (course figures only change on rebuild).
+        with self._lock:
+            refreshed_at = self.refreshed_at
+            updated_at = self.updated_at if view == 'departments' else refreshed_at
+        if refreshed_at is None:
+            return {'refreshed_at': None, 'updated_at': None, 'age_seconds': None, 'max_age_seconds': self.ttl}
+        return {
+            'refreshed_at': refreshed_at.isoformat(),
+            'updated_at': updated_at.isoformat(),
+            'age_seconds': round((_now() - refreshed_at).total_seconds(), 3),
+            'max_age_seconds': self.ttl,
+        }
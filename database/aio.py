@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from database import timing as query_timing
+from database.students import NO_FULLTEXT_INDEX, SearchIndexMissing
+from database.versions import NO_SUCH_TABLE, TableVersions
+
+# Async counterparts of the StudentRepository reads the ASGI mode serves
+# itself. The SQL comes from the sync repository's statement builders, so
+# both serving modes run exactly the same queries.
+
+
+class AsyncMySQLStudentRepository:
+    # Reads on an aiomysql pool: a request waiting on MySQL yields the event
+    # loop instead of holding a worker thread, so one process can keep up to
+    # `pool_size` queries in flight.
+
+    def __init__(self, queries, *, host: str, port: int, user: str, password: str, db: str,
+                 pool_size: int = 20, recycle: float = 1800.0):
+        self.queries = queries
+        self._connect_args = {'host': host, 'port': port, 'user': user, 'password': password, 'db': db}
+        self.pool_size = pool_size
+        self.recycle = recycle
+        self.pool = None
+        self.versions = TableVersions()
+
+    async def start(self):
+        import aiomysql
+
+        # autocommit: a pooled connection must not keep a REPEATABLE READ
+        # snapshot from one request to the next.
+        self.pool = await aiomysql.create_pool(minsize=1, maxsize=self.pool_size, pool_recycle=int(self.recycle),
+                                               autocommit=True, **self._connect_args)
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def _fetch(self, query: str, params=()):
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            query_timing.record_wait(time.perf_counter() - started)
+            async with conn.cursor() as cur:
+                started = time.perf_counter()
+                await cur.execute(query, params)
+                query_timing.record(query, time.perf_counter() - started, 0)
+                started = time.perf_counter()
+                rows = await cur.fetchall()
+                query_timing.record(None, time.perf_counter() - started, len(rows))
+                return [col[0] for col in cur.description or ()], rows
+
+    async def _fetch_dicts(self, query: str, params=()) -> list:
+        columns, rows = await self._fetch(query, params)
+        return [dict(zip(columns, row)) for row in rows]
+
+    async def page(self, *, limit: int, **kwargs) -> dict:
+        query, params, keyset = self.queries.page_query(limit=limit, **kwargs)
+        try:
+            rows = await self._fetch_dicts(query, params)
+        except Exception as e:
+            if e.args and e.args[0] == NO_FULLTEXT_INDEX:
+                raise SearchIndexMissing('No FULLTEXT index on student_name') from e
+            raise
+        return self.queries.page_result(rows, limit, keyset)
+
+    async def get(self, student_id: int, columns=None):
+        students = await self._fetch_dicts(self.queries.get_query(columns), (student_id,))
+        return students[0] if students else None
+
+    async def get_many(self, ids, columns=None) -> dict:
+        if not ids:
+            return {}
+        rows = await self._fetch_dicts(self.queries.get_many_query(len(ids), columns), tuple(ids))
+        return {s['student_id']: s for s in rows}
+
+    async def version(self):
+        # Same counter as TableVersions; None when migration 0002 is missing.
+        try:
+            _, rows = await self._fetch(self.versions.query(), ('student',))
+        except Exception as e:
+            if e.args and e.args[0] == NO_SUCH_TABLE:
+                return None
+            raise
+        return self.versions.state(rows[0] if rows else None)
+
+
+class ThreadedStudentRepository:
+    # Same interface over a sync repository, one worker thread per call. Used
+    # for STORAGE_BACKEND=sqlite, which has no async driver; the app-level
+    # code path (auth, caching, validators, formatting) is still the async one.
+
+    def __init__(self, repository):
+        self.queries = repository
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def page(self, **kwargs) -> dict:
+        return await asyncio.to_thread(self.queries.page, **kwargs)
+
+    async def get(self, student_id: int, columns=None):
+        return await asyncio.to_thread(self.queries.get, student_id, columns)
+
+    async def get_many(self, ids, columns=None) -> dict:
+        return await asyncio.to_thread(self.queries.get_many, ids, columns)
+
+    async def version(self):
+        return await asyncio.to_thread(self.queries.version)
+
+
+def create_async_repository(config, repository):
+    if config['STORAGE_BACKEND'] == 'sqlite':
+        return ThreadedStudentRepository(repository)
+    return AsyncMySQLStudentRepository(
+        repository,
+        host=config['MYSQL_HOST'],
+        port=config['MYSQL_PORT'],
+        user=config['MYSQL_USER'],
+        password=config['MYSQL_PASSWORD'],
+        db=config['MYSQL_DB'],
+        pool_size=config['MYSQL_ASYNC_POOL_SIZE'],
+        recycle=config['MYSQL_POOL_RECYCLE'],
+    )
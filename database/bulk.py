@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+STUDENT_COLUMNS = ('student_id', 'student_name', 'year_level', 'gpa', 'dept_id')
+
+INSERT_SQL = (
+    "INSERT INTO student (student_id, student_name, year_level, gpa, dept_id) "
+    "VALUES (%s, %s, %s, %s, %s)"
+)
+UPSERT_SQL = INSERT_SQL + (
+    " ON DUPLICATE KEY UPDATE student_name = VALUES(student_name), year_level = VALUES(year_level),"
+    " gpa = VALUES(gpa), dept_id = VALUES(dept_id), row_version = row_version + 1"
+)
+
+
+def is_duplicate_entry(e) -> bool:
+    return 'Duplicate entry' in str(e)
+
+
+def write_batch(conn, batch, *, upsert: bool = False, insert_sql: str = INSERT_SQL, upsert_sql: str = UPSERT_SQL,
+                is_duplicate=is_duplicate_entry, before_commit=None) -> list:
+    # batch: list of (index, row_tuple). Returns one result dict per entry.
+    # Existing IDs are looked up once per batch so each row can be reported as
+    # created / updated / rejected while the write itself stays one executemany.
+    # The SQL and duplicate-key check default to MySQL; other backends pass their own.
+    # before_commit(cursor) runs once per batch that wrote rows (the table_version bump).
+    if not batch:
+        return []
+
+    ids = [row[0] for _, row in batch]
+    cur = conn.cursor()
+    try:
+        placeholders = ', '.join(['%s'] * len(ids))
+        cur.execute(f"SELECT student_id FROM student WHERE student_id IN ({placeholders})", tuple(ids))
+        existing = {int(r[0]) for r in cur.fetchall()}
+
+        results = []
+        to_write = []
+        seen = set()
+        for index, row in batch:
+            student_id = row[0]
+            known = student_id in existing or student_id in seen
+            if known and not upsert:
+                results.append(_result(index, student_id, 'rejected', 'Student ID already exists'))
+                continue
+            seen.add(student_id)
+            to_write.append(row)
+            results.append(_result(index, student_id, 'updated' if known else 'created'))
+
+        if to_write:
+            try:
+                cur.executemany(upsert_sql if upsert else insert_sql, to_write)
+            except Exception as e:
+                if upsert or not is_duplicate(e):
+                    raise
+                # Lost a race with a concurrent writer: redo this batch row by
+                # row so only the conflicting rows are rejected.
+                conn.rollback()
+                return _write_rows(conn, cur, batch, existing, insert_sql, is_duplicate, before_commit)
+            if before_commit is not None:
+                before_commit(cur)
+        conn.commit()
+        return results
+    finally:
+        cur.close()
+
+
+def _write_rows(conn, cur, batch, existing, insert_sql, is_duplicate, before_commit=None) -> list:
+    results = []
+    for index, row in batch:
+        student_id = row[0]
+        if student_id in existing:
+            results.append(_result(index, student_id, 'rejected', 'Student ID already exists'))
+            continue
+        try:
+            cur.execute(insert_sql, row)
+        except Exception as e:
+            if not is_duplicate(e):
+                raise
+            results.append(_result(index, student_id, 'rejected', 'Student ID already exists'))
+            continue
+        existing.add(student_id)
+        results.append(_result(index, student_id, 'created'))
+    if before_commit is not None and any(r['status'] == 'created' for r in results):
+        before_commit(cur)
+    conn.commit()
+    return results
+
+
+def _result(index: int, student_id, status: str, reason: str | None = None) -> dict:
+    result = {'index': index, 'student_id': student_id, 'status': status}
+    if reason:
+        result['reason'] = reason
+    return result
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+# Read-only queries for the tables around student (department, instructor,
+# course, enrollment), plus the joins that let student responses embed
+# related rows. Runs on the student repository's connections, so it works
+# on both storage backends.
+
+# Resource name -> (table, primary key, columns, filterable columns)
+RESOURCES = {
+    'departments': ('department', 'dept_id', ('dept_id', 'dept_name'), ()),
+    'instructors': ('instructor', 'instr_id', ('instr_id', 'instr_name', 'salary', 'dept_id'), ('dept_id',)),
+    'courses': ('course', 'course_id', ('course_id', 'course_code', 'title', 'credits', 'dept_id'), ('dept_id',)),
+    'enrollments': ('enrollment', 'enroll_id', ('enroll_id', 'student_id', 'course_id', 'semester', 'grade'),
+                    ('student_id', 'course_id', 'semester')),
+}
+
+# What ?expand= can add to a student.
+STUDENT_EXPANSIONS = ('department', 'enrollments')
+
+# Each enrollment with its course and the course's department, in one query.
+# Starting from student keeps "no such student" (no rows) apart from
+# "no enrollments" (one row with NULL enrollment columns).
+_ENROLLMENT_JOIN = (
+    "SELECT s.student_id, e.enroll_id, e.semester, e.grade,"
+    " c.course_id, c.course_code, c.title, c.credits, d.dept_id, d.dept_name"
+    " FROM student s"
+    " LEFT JOIN enrollment e ON e.student_id = s.student_id"
+    " LEFT JOIN course c ON c.course_id = e.course_id"
+    " LEFT JOIN department d ON d.dept_id = c.dept_id"
+)
+
+
+def _enrollment(row) -> dict:
+    _, enroll_id, semester, grade, course_id, course_code, title, credits, dept_id, dept_name = row
+    course = None
+    if course_id is not None:
+        department = {'dept_id': dept_id, 'dept_name': dept_name} if dept_id is not None else None
+        course = {'course_id': course_id, 'course_code': course_code, 'title': title, 'credits': credits,
+                  'department': department}
+    return {'enroll_id': enroll_id, 'semester': semester, 'grade': grade, 'course': course}
+
+
+class CatalogRepository:
+    def __init__(self, students, *, chunk_size: int = 1000):
+        # `students` supplies session(); IN (...) lists are split into
+        # `chunk_size` IDs per query.
+        self.students = students
+        self.chunk_size = chunk_size
+
+    def _fetch(self, query: str, params=()):
+        with self.students.session() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(query, params)
+                return [col[0] for col in cur.description or ()], cur.fetchall()
+            finally:
+                cur.close()
+
+    def _fetch_dicts(self, query: str, params=()) -> list:
+        columns, rows = self._fetch(query, params)
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _chunks(self, ids):
+        ids = list(ids)
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+            yield chunk, ', '.join(['%s'] * len(chunk))
+
+    def page(self, resource: str, *, limit: int, after=None, filters=None) -> dict:
+        # Keyset page over the primary key, like StudentRepository.page.
+        table, key, columns, _ = RESOURCES[resource]
+        conditions = []
+        params = []
+        for column, value in (filters or {}).items():
+            conditions.append(f"{column} = %s")
+            params.append(value)
+        if after is not None:
+            conditions.append(f"{key} > %s")
+            params.append(after)
+        query = f"SELECT {', '.join(columns)} FROM {table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {key} LIMIT %s"
+        params.append(limit + 1)
+
+        rows = self._fetch_dicts(query, tuple(params))
+        page = rows[:limit]
+        return {resource: page, 'next': page[-1][key] if len(rows) > limit else None}
+
+    def get(self, resource: str, item_id: int):
+        table, key, columns, _ = RESOURCES[resource]
+        rows = self._fetch_dicts(f"SELECT {', '.join(columns)} FROM {table} WHERE {key} = %s", (item_id,))
+        return rows[0] if rows else None
+
+    def get_many(self, resource: str, ids) -> dict:
+        # primary key -> row, one IN (...) query per chunk.
+        table, key, columns, _ = RESOURCES[resource]
+        found = {}
+        for chunk, placeholders in self._chunks(ids):
+            rows = self._fetch_dicts(f"SELECT {', '.join(columns)} FROM {table} WHERE {key} IN ({placeholders})",
+                                     tuple(chunk))
+            found.update((row[key], row) for row in rows)
+        return found
+
+    def student_enrollments(self, student_id: int):
+        # Enrollments with course and department joined, or None when the
+        # student does not exist.
+        _, rows = self._fetch(_ENROLLMENT_JOIN + " WHERE s.student_id = %s ORDER BY e.enroll_id", (student_id,))
+        if not rows:
+            return None
+        return [_enrollment(row) for row in rows if row[1] is not None]
+
+    def enrollments_for_students(self, student_ids) -> dict:
+        # student_id -> joined enrollments for every existing student in `student_ids`.
+        found = {}
+        for chunk, placeholders in self._chunks(student_ids):
+            _, rows = self._fetch(_ENROLLMENT_JOIN + f" WHERE s.student_id IN ({placeholders})"
+                                  " ORDER BY s.student_id, e.enroll_id", tuple(chunk))
+            for row in rows:
+                enrollments = found.setdefault(row[0], [])
+                if row[1] is not None:
+                    enrollments.append(_enrollment(row))
+        return found
+
+    def enrollment_totals(self) -> list:
+        # (course_id, semester, enrollments, grade_sum, graded_enrollments); feeds StudentAggregates.
+        _, rows = self._fetch("SELECT course_id, semester, COUNT(*), SUM(grade), COUNT(grade) FROM enrollment"
+                              " GROUP BY course_id, semester")
+        return rows
+
+    def expand_students(self, rows: list, expand) -> list:
+        # Copies of `rows` with the requested relations attached. One batched
+        # query per relation for the whole list, never one per row; the input
+        # rows (which may be cache entries) are left untouched.
+        if not rows or not expand:
+            return rows
+        departments = enrollments = None
+        if 'department' in expand:
+            departments = self.get_many('departments', {row['dept_id'] for row in rows if row.get('dept_id') is not None})
+        if 'enrollments' in expand:
+            enrollments = self.enrollments_for_students([row['student_id'] for row in rows])
+        expanded = []
+        for row in rows:
+            row = dict(row)
+            if departments is not None:
+                row['department'] = departments.get(row.get('dept_id'))
+            if enrollments is not None:
+                row['enrollments'] = enrollments.get(row['student_id'], [])
+            expanded.append(row)
+        return expanded
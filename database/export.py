@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+
+def iter_row_batches(conn, query: str, params=(), *, batch_size: int = 1000):
+    # Stream rows through an unbuffered server-side cursor so only one batch
+    # is held in memory at a time. Yields (columns, rows) tuples. Runs on the
+    # caller's connection (the request's, see MySQLStudentRepository), which
+    # is not closed here and cannot run other queries until the stream ends.
+    from MySQLdb.cursors import SSCursor
+
+    finished = False
+    cur = conn.cursor(SSCursor)
+    try:
+        cur.execute(query, params)
+        columns = [col[0] for col in cur.description]
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield columns, rows
+        finished = True
+    finally:
+        if finished:
+            cur.close()
+        else:
+            # Abandoned mid-stream (e.g. client disconnected): the unread result
+            # set would have to be drained first, so the pool drops the
+            # connection when the request releases it instead of reusing it.
+            conn.invalidate()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from flask import g
+
+from database.pool import get_pool
+
+
+class PooledMySQL:
+    # Drop-in replacement for flask_mysqldb.MySQL: `mysql.connection` is checked
+    # out of the shared pool once per app context and returned on teardown.
+
+    def __init__(self, app=None):
+        self.app = app
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.teardown_appcontext(self.teardown)
+
+    @property
+    def pool(self):
+        return get_pool()
+
+    @property
+    def connection(self):
+        conn = g.get('_pooled_mysql')
+        if conn is None or conn.closed:
+            conn = self.pool.connection()
+            g._pooled_mysql = conn
+        return conn
+
+    def teardown(self, exception):
+        conn = g.pop('_pooled_mysql', None)
+        if conn is not None:
+            conn.close()
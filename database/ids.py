@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+
+ID_COLUMNS = {
+    'department': 'dept_id',
+    'instructor': 'instr_id',
+    'course': 'course_id',
+    'student': 'student_id',
+    'enrollment': 'enroll_id',
+}
+
+# MySQL error 1146: Table doesn't exist
+NO_SUCH_TABLE = 1146
+
+CREATE_SEQUENCE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS id_sequence ("
+    " name VARCHAR(64) NOT NULL PRIMARY KEY,"
+    " next_id BIGINT UNSIGNED NOT NULL)"
+)
+
+
+class IdAllocator:
+    # Reserves contiguous ID ranges from the id_sequence table. The UPDATE
+    # locks the sequence row, so concurrent seeders/API workers always get
+    # disjoint ranges; LAST_INSERT_ID(expr) hands the new value back on the
+    # same connection without a second read. GREATEST(..., MAX(id) + 1) keeps
+    # the sequence ahead of rows inserted with explicit IDs.
+    #
+    # allocate() additionally caches a block of `block_size` IDs per table in
+    # process (hi/lo), so small bulk requests rarely need a round-trip.
+    #
+    # `session()` yields the connection to run on; for the API that is the
+    # request's own pooled connection (StudentRepository.session), so topping
+    # up a block never waits for a second checkout from the pool. Each
+    # reservation is its own short transaction, committed before returning,
+    # so it must not be called with uncommitted writes on that connection.
+
+    def __init__(self, session, *, block_size: int = 1000):
+        self.session = session
+        self.block_size = block_size
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, table: str, count: int) -> range:
+        if table not in ID_COLUMNS:
+            raise ValueError(f'No ID sequence for table {table!r}')
+        if count <= 0:
+            return range(0)
+        column = ID_COLUMNS[table]
+        with self.session() as conn:
+            cur = conn.cursor()
+            try:
+                try:
+                    self._ensure_row(cur, table, column)
+                except Exception as e:
+                    if not (e.args and e.args[0] == NO_SUCH_TABLE):
+                        raise
+                    cur.execute(CREATE_SEQUENCE_TABLE)
+                    self._ensure_row(cur, table, column)
+                cur.execute(
+                    f"UPDATE id_sequence SET next_id = LAST_INSERT_ID("
+                    f"GREATEST(next_id, (SELECT COALESCE(MAX({column}), 0) + 1 FROM {table})) + %s"
+                    f") WHERE name = %s",
+                    (count, table),
+                )
+                cur.execute("SELECT LAST_INSERT_ID()")
+                end = int(cur.fetchone()[0])
+                conn.commit()
+            except Exception:
+                # Don't leave the sequence row locked on a connection that stays checked out.
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+        return range(end - count, end)
+
+    @staticmethod
+    def _ensure_row(cur, table: str, column: str):
+        cur.execute(
+            f"INSERT IGNORE INTO id_sequence (name, next_id) "
+            f"SELECT %s, COALESCE(MAX({column}), 0) + 1 FROM {table}",
+            (table,),
+        )
+
+    def discard(self, table: str):
+        # Forget the cached block, e.g. after one of its IDs turned out to be
+        # taken by an explicit-ID insert; the next allocate() reserves anew.
+        with self._lock:
+            self._blocks.pop(table, None)
+
+    def allocate(self, table: str, count: int) -> list:
+        # IDs for `count` new rows; not necessarily one contiguous range.
+        ids = []
+        with self._lock:
+            while len(ids) < count:
+                block = self._blocks.get(table)
+                if not block:
+                    block = self.reserve(table, max(self.block_size, count - len(ids)))
+                take = min(len(block), count - len(ids))
+                ids.extend(block[:take])
+                self._blocks[table] = block[take:]
+        return ids
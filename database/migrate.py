@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.pool import get_pool
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / 'migrations'
+
+
+def _statements(sql: str):
+    lines = [line for line in sql.splitlines() if not line.strip().startswith('--')]
+    for statement in '\n'.join(lines).split(';'):
+        if statement.strip():
+            yield statement.strip()
+
+
+def migrate(conn=None) -> list:
+    # Apply migrations/*.sql in name order, recording each in schema_migrations.
+    own_conn = conn is None
+    conn = conn or get_pool().connection()
+    applied = []
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                " name VARCHAR(255) PRIMARY KEY,"
+                " applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+            cur.execute("SELECT name FROM schema_migrations")
+            done = {row[0] for row in cur.fetchall()}
+            for path in sorted(MIGRATIONS_DIR.glob('*.sql')):
+                if path.name in done:
+                    continue
+                print(f"Applying {path.name}...")
+                for statement in _statements(path.read_text()):
+                    cur.execute(statement)
+                cur.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (path.name,))
+                conn.commit()
+                applied.append(path.name)
+        finally:
+            cur.close()
+    finally:
+        if own_conn:
+            conn.close()
+    return applied
+
+
+if __name__ == '__main__':
+    names = migrate()
+    print(f"Applied {len(names)} migration(s)." if names else "Database is up to date.")
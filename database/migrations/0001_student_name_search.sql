@@ -0,0 +1,6 @@
+-- B-tree index used by prefix search (student_name LIKE 'term%').
+CREATE INDEX idx_student_name ON student (student_name);
+
+-- n-gram FULLTEXT index used by substring search and relevance ordering
+-- (SEARCH_BACKEND=fulltext). Requires MySQL 5.7.6+ / InnoDB.
+ALTER TABLE student ADD FULLTEXT INDEX ft_student_name (student_name) WITH PARSER ngram;
@@ -0,0 +1,13 @@
+-- Per-table change counter used for ETag / Last-Modified on student resources.
+-- Writers (repository write methods, bulk batches, seeders) bump it once per
+-- write statement, just before commit, rather than through per-row triggers
+-- that would queue every concurrent writer on this row's lock until commit.
+-- updated_at has sub-second precision, so a change can be told apart from one
+-- earlier in the same second (see TableVersions.state for Last-Modified).
+CREATE TABLE IF NOT EXISTS table_version (
+    table_name VARCHAR(64) NOT NULL PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at DATETIME(6) NOT NULL
+);
+
+INSERT IGNORE INTO table_version (table_name, version, updated_at) VALUES ('student', 0, UTC_TIMESTAMP(6));
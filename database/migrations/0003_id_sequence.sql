@@ -0,0 +1,12 @@
+-- Hi/lo ID sequences: seeders and the bulk API reserve contiguous ID blocks
+-- here atomically instead of scanning MAX(id) and hoping nobody else does too.
+CREATE TABLE IF NOT EXISTS id_sequence (
+    name VARCHAR(64) NOT NULL PRIMARY KEY,
+    next_id BIGINT UNSIGNED NOT NULL
+);
+
+INSERT IGNORE INTO id_sequence (name, next_id) SELECT 'department', COALESCE(MAX(dept_id), 0) + 1 FROM department;
+INSERT IGNORE INTO id_sequence (name, next_id) SELECT 'instructor', COALESCE(MAX(instr_id), 0) + 1 FROM instructor;
+INSERT IGNORE INTO id_sequence (name, next_id) SELECT 'course', COALESCE(MAX(course_id), 0) + 1 FROM course;
+INSERT IGNORE INTO id_sequence (name, next_id) SELECT 'student', COALESCE(MAX(student_id), 0) + 1 FROM student;
+INSERT IGNORE INTO id_sequence (name, next_id) SELECT 'enrollment', COALESCE(MAX(enroll_id), 0) + 1 FROM enrollment;
@@ -0,0 +1,3 @@
+-- Per-row version for optimistic concurrency: every update bumps it, and
+-- PUT/PATCH/DELETE with If-Match only apply when it still matches.
+ALTER TABLE student ADD COLUMN row_version INT UNSIGNED NOT NULL DEFAULT 1;
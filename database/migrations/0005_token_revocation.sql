@@ -0,0 +1,7 @@
+-- Revoked JWTs (SHA-256 hex digest), shared by every API worker process.
+-- Rows are deleted once the token's own exp has passed.
+CREATE TABLE IF NOT EXISTS token_revocation (
+    id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    digest CHAR(64) NOT NULL UNIQUE,
+    expires_at DOUBLE NOT NULL
+);
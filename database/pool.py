@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+from config.config import SystemConfig
+from database.timing import TimedCursor, record_wait
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection:
+    # Thin proxy around a raw DB-API connection: close() hands it back to the
+    # pool instead of tearing down the socket, everything else is delegated.
+
+    def __init__(self, pool: ConnectionPool, raw, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._broken = False
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get('_raw')
+        if raw is None:
+            raise AttributeError(name)
+        return getattr(raw, name)
+
+    @property
+    def closed(self) -> bool:
+        return self._raw is None
+
+    def cursor(self, *args, **kwargs):
+        if self._raw is None:
+            raise RuntimeError('Connection already returned to the pool')
+        return TimedCursor(self._raw.cursor(*args, **kwargs))
+
+    def invalidate(self):
+        # Mark the underlying connection as unusable so it is discarded on close.
+        self._broken = True
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool._release(raw, self._created_at, discard=self._broken)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(self, connect, *, name: str, size: int, timeout: float = 10.0,
+                 recycle: float = 1800.0, ping_interval: float = 30.0):
+        if size < 1:
+            raise ValueError('Pool size must be at least 1')
+        self.name = name
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_interval = ping_interval
+        self._connect = connect
+        self._idle = deque()
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'ping_failures': 0,
+            'discarded': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    def connection(self, timeout: float | None = None) -> PooledConnection:
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        entry = None
+        waited = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f'Pool {self.name!r} is closed')
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._in_use + len(self._idle) < self.size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'Timed out after {timeout}s waiting for a connection from pool {self.name!r}'
+                    )
+                waited = True
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        try:
+            raw, created_at = self._prepare(entry)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        wait_time = time.perf_counter() - started
+        with self._cond:
+            self._stats['checkouts'] += 1
+            self._stats['waits'] += int(waited)
+            self._stats['wait_time_total'] += wait_time
+            self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+        record_wait(wait_time)
+        return PooledConnection(self, raw, created_at)
+
+    def _prepare(self, entry):
+        now = time.monotonic()
+        if entry is None:
+            return self._create(), now
+
+        raw, created_at, last_used = entry
+        if self.recycle and now - created_at > self.recycle:
+            self._close_raw(raw)
+            self._bump('recycled')
+            return self._create(), now
+
+        if self.ping_interval is not None and now - last_used > self.ping_interval:
+            try:
+                raw.ping()
+            except Exception:
+                self._close_raw(raw)
+                self._bump('ping_failures')
+                return self._create(), now
+        return raw, created_at
+
+    def _create(self):
+        raw = self._connect()
+        self._bump('created')
+        return raw
+
+    def _release(self, raw, created_at: float, *, discard: bool = False):
+        if not discard:
+            try:
+                # Never hand out a connection with a half-finished transaction.
+                raw.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._stats['discarded'] += int(discard)
+            else:
+                self._idle.append((raw, created_at, time.monotonic()))
+                raw = None
+            self._cond.notify()
+
+        if raw is not None:
+            self._close_raw(raw)
+
+    def _bump(self, key: str):
+        with self._cond:
+            self._stats[key] += 1
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'name': self.name,
+                'size': self.size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+            })
+        checkouts = stats['checkouts']
+        stats['wait_time_avg'] = stats['wait_time_total'] / checkouts if checkouts else 0.0
+        return stats
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for raw, _, _ in idle:
+            self._close_raw(raw)
+
+
+def connect_mysql(**overrides):
+    import MySQLdb
+
+    params = {
+        'host': SystemConfig.MYSQL_HOST,
+        'user': SystemConfig.MYSQL_USER,
+        'passwd': SystemConfig.MYSQL_PASSWORD,
+        'db': SystemConfig.MYSQL_DB,
+        'port': SystemConfig.MYSQL_PORT,
+    }
+    params.update(overrides)
+    return MySQLdb.connect(**params)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_inherited = []
+
+
+def get_pool(name: str | None = None) -> ConnectionPool:
+    name = name or SystemConfig.MYSQL_POOL_NAME
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = ConnectionPool(
+                connect_mysql,
+                name=name,
+                size=SystemConfig.MYSQL_POOL_SIZE,
+                timeout=SystemConfig.MYSQL_POOL_TIMEOUT,
+                recycle=SystemConfig.MYSQL_POOL_RECYCLE,
+                ping_interval=SystemConfig.MYSQL_POOL_PING_INTERVAL,
+            )
+            _pools[name] = pool
+        return pool
+
+
+def reset_after_fork():
+    # Called in a freshly forked worker: forget the parent's pools so the
+    # worker opens its own connections. Inherited sockets are kept referenced
+    # rather than closed, since closing them would also end the parent's
+    # (and sibling workers') sessions.
+    global _pools_lock
+    _inherited.extend(_pools.values())
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
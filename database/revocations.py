@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+
+# MySQL error 1146: Table doesn't exist (migration 0005 not applied)
+NO_SUCH_TABLE = 1146
+
+CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS token_revocation ("
+    " id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY,"
+    " digest CHAR(64) NOT NULL UNIQUE,"
+    " expires_at DOUBLE NOT NULL)"
+)
+
+
+class RevocationTable:
+    # Revoked JWT digests in the token_revocation table, so every worker
+    # process (serve.py) rejects a token revoked in any of them, and
+    # revocations survive worker restarts. Each process mirrors the table and
+    # picks up new rows (id > last seen) on a background thread once the
+    # mirror is `refresh` seconds old, so the per-request check stays a dict
+    # lookup. Only the first check in a process reads the table itself (on
+    # the request's connection), so a fresh worker never accepts a revoked
+    # token. Runs on the student repository's connections, like
+    # CatalogRepository; `wrap(fn)` runs the background sync in whatever
+    # context that needs (e.g. an app context), as in JobRunner.
+
+    def __init__(self, students, *, refresh: float = 1.0, wrap=None):
+        self.students = students
+        self.refresh = refresh
+        self._wrap = wrap or (lambda fn: fn())
+        self._revoked = {}
+        self._last_id = 0
+        self._synced_at = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def _execute(self, cur, query, params=()):
+        try:
+            cur.execute(query, params)
+        except Exception as e:
+            if not (e.args and e.args[0] == NO_SUCH_TABLE):
+                raise
+            cur.execute(CREATE_TABLE)
+            cur.execute(query, params)
+
+    def _sync(self):
+        now = time.time()
+        with self.students.session() as conn:
+            cur = conn.cursor()
+            try:
+                self._execute(cur, "SELECT id, digest, expires_at FROM token_revocation "
+                                   "WHERE id > %s AND expires_at > %s ORDER BY id", (self._last_id, now))
+                rows = cur.fetchall()
+            finally:
+                cur.close()
+        with self._lock:
+            for row_id, digest, expires_at in rows:
+                self._revoked[digest] = float(expires_at)
+                self._last_id = max(self._last_id, int(row_id))
+            for digest in [d for d, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[digest]
+            self._synced_at = now
+
+    def _sync_in_background(self):
+        try:
+            self._wrap(self._sync)
+        finally:
+            self._sync_lock.release()
+
+    def _refresh(self):
+        if self._synced_at is None:
+            with self._sync_lock:
+                if self._synced_at is None:
+                    self._sync()
+            return
+        if time.time() - self._synced_at >= self.refresh and self._sync_lock.acquire(blocking=False):
+            threading.Thread(target=self._sync_in_background, name='revocations-refresh', daemon=True).start()
+
+    def add(self, digest: bytes, expires_at: float):
+        now = time.time()
+        with self.students.session() as conn:
+            cur = conn.cursor()
+            try:
+                # Rows past their token's exp are useless; drop them on the way.
+                self._execute(cur, "DELETE FROM token_revocation WHERE expires_at <= %s", (now,))
+                try:
+                    cur.execute("INSERT INTO token_revocation (digest, expires_at) VALUES (%s, %s)",
+                                (digest.hex(), expires_at))
+                except Exception as e:
+                    if not self.students.is_duplicate(e):
+                        raise
+                conn.commit()
+            finally:
+                cur.close()
+        with self._lock:
+            self._revoked[digest.hex()] = expires_at
+
+    def contains(self, digest: bytes) -> bool:
+        self._refresh()
+        with self._lock:
+            exp = self._revoked.get(digest.hex())
+        return exp is not None and exp > time.time()
+
+    def count(self) -> int:
+        # Admin only (GET /admin/tokens): read the table now.
+        with self._sync_lock:
+            self._sync()
+        with self._lock:
+            return len(self._revoked)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+
+
+def escape_like(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def fulltext_phrase(term: str) -> str:
+    # Quote the term so the ngram parser matches it as a contiguous phrase
+    # (i.e. a substring) rather than as boolean-mode operators.
+    return '"' + term.replace('"', ' ').strip() + '"'
+
+
+def trigrams(text: str) -> set:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    # In-process substring index over student names, used when the database
+    # has no FULLTEXT index. Rebuilt from the table on a background thread
+    # and kept current by the write routes between rebuilds.
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.built_at = None
+        self._names = {}
+        self._grams = defaultdict(set)
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return self.built_at is None or time.monotonic() - self.built_at > self.ttl
+
+    def rebuild(self, rows):
+        names = {}
+        grams = defaultdict(set)
+        for student_id, name in rows:
+            name = name or ''
+            names[student_id] = name.lower()
+            for gram in trigrams(name):
+                grams[gram].add(student_id)
+        with self._lock:
+            self._names = names
+            self._grams = grams
+            self.built_at = time.monotonic()
+
+    def refresh(self, load_rows, *, wait: bool = False):
+        # Rebuild if stale. Only one thread rebuilds; unless `wait`, the others
+        # return at once and keep using the current index.
+        if not self._build_lock.acquire(blocking=wait):
+            return
+        try:
+            if self.stale:
+                self.rebuild(load_rows())
+        finally:
+            self._build_lock.release()
+
+    def refresh_in_background(self, run) -> bool:
+        # Starts run() (which calls refresh()) on a daemon thread if the index
+        # is stale and no rebuild is running. Returns whether there is an
+        # index to search yet.
+        if self.stale and not self._build_lock.locked():
+            threading.Thread(target=run, name='search-index-refresh', daemon=True).start()
+        return self.built_at is not None
+
+    def add(self, student_id: int, name: str):
+        with self._lock:
+            if self.built_at is None:
+                return
+            self._discard(student_id)
+            name = name or ''
+            self._names[student_id] = name.lower()
+            for gram in trigrams(name):
+                self._grams[gram].add(student_id)
+
+    def remove(self, student_id: int):
+        with self._lock:
+            self._discard(student_id)
+
+    def _discard(self, student_id: int):
+        name = self._names.pop(student_id, None)
+        if name is None:
+            return
+        for gram in trigrams(name):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                ids.discard(student_id)
+                if not ids:
+                    del self._grams[gram]
+
+    def search(self, term: str) -> list:
+        # Student IDs whose name contains term (case-insensitive), ascending.
+        term = term.lower()
+        with self._lock:
+            grams = trigrams(term)
+            if grams:
+                candidate_sets = sorted((self._grams.get(g, set()) for g in grams), key=len)
+                candidates = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+            else:
+                candidates = self._names.keys()
+            return sorted(i for i in candidates if term in self._names.get(i, ''))
+
+    def rank(self, term: str, student_ids) -> list:
+        # Relevance: earlier and closer-length matches first, then by ID.
+        term = term.lower()
+        with self._lock:
+            def score(student_id):
+                name = self._names.get(student_id, '')
+                return name.find(term), len(name) - len(term), student_id
+            return sorted(student_ids, key=score)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import datetime
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from database.ids import ID_COLUMNS
+from database.students import StudentRepository, select_list
+from database.timing import TimedCursor
+from database.versions import TableVersions, as_utc
+
+# Mirrors the MySQL tables the API and seeders use, plus the table_version
+# counter from migration 0002 (bumped by the repository's write methods).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS department (
+    dept_id INTEGER PRIMARY KEY,
+    dept_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS instructor (
+    instr_id INTEGER PRIMARY KEY,
+    instr_name TEXT NOT NULL,
+    salary REAL,
+    dept_id INTEGER REFERENCES department (dept_id)
+);
+CREATE TABLE IF NOT EXISTS course (
+    course_id INTEGER PRIMARY KEY,
+    course_code TEXT NOT NULL,
+    title TEXT NOT NULL,
+    credits INTEGER,
+    dept_id INTEGER REFERENCES department (dept_id)
+);
+CREATE TABLE IF NOT EXISTS student (
+    student_id INTEGER PRIMARY KEY,
+    student_name TEXT NOT NULL,
+    year_level INTEGER,
+    gpa REAL,
+    dept_id INTEGER REFERENCES department (dept_id),
+    row_version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_student_name ON student (student_name);
+CREATE TABLE IF NOT EXISTS enrollment (
+    enroll_id INTEGER PRIMARY KEY,
+    student_id INTEGER REFERENCES student (student_id),
+    course_id INTEGER REFERENCES course (course_id),
+    semester TEXT,
+    grade REAL
+);
+
+CREATE TABLE IF NOT EXISTS token_revocation (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    digest TEXT NOT NULL UNIQUE,
+    expires_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS table_version (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+INSERT OR IGNORE INTO table_version (table_name, version, updated_at) VALUES ('student', 0, datetime('now'));
+-- Bumped by the repository once per write (see TableVersions.bump); databases
+-- created before that still carry the old per-row triggers.
+DROP TRIGGER IF EXISTS student_version_insert;
+DROP TRIGGER IF EXISTS student_version_update;
+DROP TRIGGER IF EXISTS student_version_delete;
+"""
+
+
+class _Cursor:
+    # sqlite3 cursor that accepts the pyformat (%s) placeholders the shared
+    # queries are written with.
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, query, args=None):
+        return self._cursor.execute(query.replace('%s', '?'), args or ())
+
+    def executemany(self, query, args):
+        return self._cursor.executemany(query.replace('%s', '?'), args)
+
+
+class SQLiteTableVersions(TableVersions):
+    # SQLite has no DATETIME type: timestamps are ISO strings with milliseconds.
+    now_sql = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+    def _parse(self, value):
+        return as_utc(datetime.datetime.fromisoformat(value)) if value else None
+
+
+class SQLiteConnection:
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self):
+        return TimedCursor(_Cursor(self._raw.cursor()))
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        self._raw.close()
+
+
+def is_duplicate_key(e) -> bool:
+    return isinstance(e, sqlite3.IntegrityError) and 'UNIQUE constraint failed' in str(e)
+
+
+class SQLiteStudentRepository(StudentRepository):
+    # Embedded backend for tests, benchmarks and profiling the app without a
+    # MySQL server. One connection shared under a lock: SQLite serializes
+    # writers anyway, and ':memory:' databases are private to a connection.
+
+    like_clause = "student_name LIKE %s ESCAPE '\\'"
+    upsert_sql = StudentRepository.insert_sql + (
+        " ON CONFLICT (student_id) DO UPDATE SET student_name = excluded.student_name,"
+        " year_level = excluded.year_level, gpa = excluded.gpa, dept_id = excluded.dept_id,"
+        " row_version = student.row_version + 1"
+    )
+
+    def __init__(self, path: str = ':memory:', *, departments=()):
+        self.path = path
+        self.departments = departments
+        self._conn = self._open()
+        self._lock = threading.RLock()
+        # table -> next ID reserve_ids() may hand out
+        self._next_ids = {}
+        self._inherited = []
+        self.versions = SQLiteTableVersions()
+
+    def _open(self) -> SQLiteConnection:
+        raw = sqlite3.connect(self.path, check_same_thread=False)
+        raw.execute("PRAGMA foreign_keys = ON")
+        raw.executescript(SCHEMA)
+        raw.executemany("INSERT OR IGNORE INTO department (dept_id, dept_name) VALUES (?, ?)", self.departments)
+        raw.commit()
+        return SQLiteConnection(raw)
+
+    def after_fork(self):
+        # SQLite connections must not be used across fork(); the parent's is
+        # kept (unused) and the worker opens its own. A ':memory:' database
+        # is therefore private to each worker.
+        self._inherited.append(self._conn)
+        self._conn = self._open()
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def session(self):
+        with self._lock:
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    @staticmethod
+    def is_duplicate(e) -> bool:
+        return is_duplicate_key(e)
+
+    def _search_clause(self, term, match, backend):
+        clause, param, _, _ = super()._search_clause(term, match, backend)
+        if match == 'prefix':
+            return clause, param, None, None
+        # No FULLTEXT here: rank earlier matches first.
+        return clause, param, "INSTR(LOWER(student_name), LOWER(%s))", term
+
+    def _execute_update(self, cur, assignments: str, where: str, params: tuple):
+        cur.execute(f"UPDATE student SET {assignments}, row_version = row_version + 1 WHERE {where} "
+                    "RETURNING row_version", params)
+        rows = cur.fetchall()
+        return rows[0][0] if rows else None
+
+    def allocate_ids(self, count: int) -> list:
+        return list(self.reserve_ids('student', count))
+
+    def reserve_ids(self, table: str, count: int) -> range:
+        # Past both MAX(id) and everything this process has handed out, so
+        # reserved IDs stay unique until they are inserted.
+        column = ID_COLUMNS[table]
+        with self.session() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+                start = max(self._next_ids.get(table, 0), cur.fetchone()[0])
+            finally:
+                cur.close()
+            self._next_ids[table] = start + count
+        return range(start, start + count)
+
+    def discard_ids(self):
+        with self.session():
+            self._next_ids.pop('student', None)
+
+    def version(self):
+        with self.session() as conn:
+            return self.versions.get(conn, 'student')
+
+    def _keyset_batches(self, columns: str, batch_size: int):
+        # One short locked query per batch, so a slow consumer never blocks other
+        # requests. student_id has to be the first selected column.
+        last = None
+        while True:
+            query = f"SELECT {columns} FROM student"
+            params = (batch_size,)
+            if last is not None:
+                query += " WHERE student_id > %s"
+                params = (last, batch_size)
+            with self.session() as conn:
+                cur = conn.cursor()
+                try:
+                    cur.execute(query + " ORDER BY student_id LIMIT %s", params)
+                    names = [col[0] for col in cur.description]
+                    rows = cur.fetchall()
+                finally:
+                    cur.close()
+            if not rows:
+                return
+            yield names, rows
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][0]
+
+    def export_batches(self, batch_size: int, columns=None):
+        return self._keyset_batches(select_list(columns), batch_size)
+
+    def name_rows(self, batch_size: int):
+        for _, rows in self._keyset_batches('student_id, student_name', batch_size):
+            yield from rows
+
+    def close(self):
+        # Under the lock, so a background thread is never mid-query.
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from database.bulk import INSERT_SQL, STUDENT_COLUMNS, UPSERT_SQL, is_duplicate_entry, write_batch
+from database.export import iter_row_batches
+from database.ids import IdAllocator
+from database.search import escape_like, fulltext_phrase
+from database.versions import TableVersions
+
+# MySQL error 1191: Can't find FULLTEXT index matching the column list
+NO_FULLTEXT_INDEX = 1191
+
+# Readable columns: the insertable ones plus the optimistic-concurrency version.
+STUDENT_FIELDS = STUDENT_COLUMNS + ('row_version',)
+
+
+class DuplicateStudent(Exception):
+    pass
+
+
+class SearchIndexMissing(Exception):
+    pass
+
+
+class VersionConflict(Exception):
+    # The row exists but its row_version no longer matches If-Match.
+    def __init__(self, current_version):
+        super().__init__(f'Current row_version is {current_version}')
+        self.current_version = current_version
+
+
+def select_list(columns=None) -> str:
+    # Explicit column list for a projection; None selects every column.
+    if not columns:
+        return '*'
+    unknown = set(columns) - set(STUDENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown student column(s): {', '.join(sorted(unknown))}")
+    return ', '.join(columns)
+
+
+def _to_dicts(cur, rows) -> list:
+    if not rows:
+        return []
+    columns = [col[0] for col in cur.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+class StudentRepository(ABC):
+    # Every student query the routes need, written once against pyformat
+    # (%s) placeholders. Subclasses provide connections through session()
+    # and implement the few statements that differ between databases; one
+    # missing an abstract method fails when constructed, not mid-request.
+
+    insert_sql = INSERT_SQL
+    upsert_sql = UPSERT_SQL
+    like_clause = "student_name LIKE %s"
+
+    @abstractmethod
+    def session(self):
+        # Context manager yielding a DB-API connection.
+        raise NotImplementedError
+
+    @staticmethod
+    def is_duplicate(e) -> bool:
+        return is_duplicate_entry(e)
+
+    def _search_clause(self, term: str, match: str, backend: str):
+        # (WHERE clause, param, relevance expression or None, relevance param)
+        if match == 'prefix':
+            # No leading wildcard, so this can use idx_student_name.
+            return self.like_clause, escape_like(term) + '%', None, None
+        return self.like_clause, '%' + escape_like(term) + '%', None, None
+
+    def _fetch_dicts(self, query: str, params=()) -> list:
+        with self.session() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(query, params)
+                return _to_dicts(cur, cur.fetchall())
+            finally:
+                cur.close()
+
+    def page_query(self, *, search=None, match: str = 'contains', by_relevance: bool = False, limit: int,
+                   after=None, backend: str = 'like', columns=None) -> tuple:
+        # (query, params, keyset) for page(); shared with the async repository.
+        conditions = []
+        params = []
+        order_by = "student_id"
+        order_params = []
+        keyset = True
+        if search:
+            sql, param, relevance, relevance_param = self._search_clause(search, match, backend)
+            conditions.append(sql)
+            params.append(param)
+            if by_relevance and relevance:
+                # Relevance-ordered results are a single top-N page (no cursor).
+                order_by = relevance + ", student_id"
+                order_params.append(relevance_param)
+                keyset = False
+        if after is not None and keyset:
+            conditions.append("student_id > %s")
+            params.append(after)
+
+        query = f"SELECT {select_list(columns)} FROM student"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        # Fetch one extra row to know whether another page exists.
+        query += f" ORDER BY {order_by} LIMIT %s"
+        params.extend(order_params)
+        params.append(limit + 1)
+        return query, tuple(params), keyset
+
+    @staticmethod
+    def page_result(rows: list, limit: int, keyset: bool) -> dict:
+        students = rows[:limit]
+        next_cursor = students[-1]['student_id'] if keyset and len(rows) > limit else None
+        return {'students': students, 'next': next_cursor}
+
+    def page(self, *, limit: int, **kwargs) -> dict:
+        # `columns` must include student_id, which the next-page cursor is read from.
+        query, params, keyset = self.page_query(limit=limit, **kwargs)
+        return self.page_result(self._fetch_dicts(query, params), limit, keyset)
+
+    @staticmethod
+    def get_query(columns=None) -> str:
+        return f"SELECT {select_list(columns)} FROM student WHERE student_id = %s"
+
+    @staticmethod
+    def get_many_query(count: int, columns=None) -> str:
+        placeholders = ', '.join(['%s'] * count)
+        return f"SELECT {select_list(columns)} FROM student WHERE student_id IN ({placeholders})"
+
+    def get(self, student_id: int, columns=None):
+        students = self._fetch_dicts(self.get_query(columns), (student_id,))
+        return students[0] if students else None
+
+    def get_many(self, ids, columns=None) -> dict:
+        # student_id -> row for the IDs that exist.
+        if not ids:
+            return {}
+        rows = self._fetch_dicts(self.get_many_query(len(ids), columns), tuple(ids))
+        return {s['student_id']: s for s in rows}
+
+    def _bump_version(self, cur):
+        # Once per write statement, just before commit (see TableVersions.bump).
+        self.versions.bump(cur, 'student')
+
+    def create(self, row: tuple):
+        with self.session() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(self.insert_sql, row)
+                self._bump_version(cur)
+                conn.commit()
+            except Exception as e:
+                if self.is_duplicate(e):
+                    raise DuplicateStudent(row[0]) from e
+                raise
+            finally:
+                cur.close()
+
+    def _version_condition(self, student_id: int, expected_versions) -> tuple:
+        where = "student_id = %s"
+        params = (student_id,)
+        if expected_versions:
+            where += " AND row_version IN ({})".format(', '.join(['%s'] * len(expected_versions)))
+            params += tuple(expected_versions)
+        return where, params
+
+    def _conflict_or_missing(self, cur, student_id: int, expected_versions):
+        # Only reached when the write matched nothing: tell a stale If-Match
+        # apart from a missing student.
+        if expected_versions:
+            cur.execute("SELECT row_version FROM student WHERE student_id = %s", (student_id,))
+            row = cur.fetchone()
+            if row is not None:
+                raise VersionConflict(int(row[0]))
+
+    @abstractmethod
+    def _execute_update(self, cur, assignments: str, where: str, params: tuple):
+        # Runs the UPDATE and returns the new row_version, or None if no row matched.
+        raise NotImplementedError
+
+    def update(self, student_id: int, fields: dict, expected_versions=None):
+        # fields: column -> new value. One UPDATE both checks existence (and
+        # the If-Match versions) and applies the change. Returns the new
+        # row_version, or None when the student does not exist.
+        assignments = ', '.join(f"{column} = %s" for column in fields)
+        where, params = self._version_condition(student_id, expected_versions)
+        with self.session() as conn:
+            cur = conn.cursor()
+            try:
+                version = self._execute_update(cur, assignments, where, tuple(fields.values()) + params)
+                if version is None:
+                    self._conflict_or_missing(cur, student_id, expected_versions)
+                    return None
+                self._bump_version(cur)
+                conn.commit()
+                return version
+            finally:
+                cur.close()
+
+    def delete(self, student_id: int, expected_versions=None) -> bool:
+        where, params = self._version_condition(student_id, expected_versions)
+        with self.session() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(f"DELETE FROM student WHERE {where}", params)
+                deleted = cur.rowcount > 0
+                if deleted:
+                    self._bump_version(cur)
+                conn.commit()
+                if deleted:
+                    return True
+                self._conflict_or_missing(cur, student_id, expected_versions)
+                return False
+            finally:
+                cur.close()
+
+    def write_batch(self, batch, *, upsert: bool = False) -> list:
+        with self.session() as conn:
+            return write_batch(conn, batch, upsert=upsert, insert_sql=self.insert_sql,
+                               upsert_sql=self.upsert_sql, is_duplicate=self.is_duplicate,
+                               before_commit=self._bump_version)
+
+    @abstractmethod
+    def allocate_ids(self, count: int) -> list:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reserve_ids(self, table: str, count: int) -> range:
+        # A contiguous range of `count` new IDs for any seeded table, disjoint
+        # from every other reservation and from allocate_ids().
+        raise NotImplementedError
+
+    def discard_ids(self):
+        # Drop IDs allocate_ids() holds in reserve (see IdAllocator.discard).
+        pass
+
+    def after_fork(self):
+        # Drop per-process state inherited from the parent (see serve.py).
+        pass
+
+    @abstractmethod
+    def version(self):
+        # (version, updated_at) from the table_version counter, or None.
+        # updated_at is None while the latest change is under a second old.
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_batches(self, batch_size: int, columns=None):
+        # Whole table in student_id order as (columns, rows) batches.
+        raise NotImplementedError
+
+    @abstractmethod
+    def name_rows(self, batch_size: int):
+        # (student_id, student_name) for every student; feeds the trigram index.
+        raise NotImplementedError
+
+
+class MySQLStudentRepository(StudentRepository):
+    def __init__(self, db, *, ngram_size: int = 2, id_block_size: int = 1000):
+        self.db = db
+        self.ngram_size = ngram_size
+        self.ids = IdAllocator(self.session, block_size=id_block_size)
+        self.versions = TableVersions()
+
+    @contextmanager
+    def session(self):
+        # The request's pooled connection; it goes back to the pool on teardown.
+        yield self.db.connection
+
+    def _search_clause(self, term, match, backend):
+        if match != 'prefix' and backend == 'fulltext' and len(term) >= self.ngram_size:
+            clause = "MATCH(student_name) AGAINST (%s IN BOOLEAN MODE)"
+            phrase = fulltext_phrase(term)
+            return clause, phrase, clause + " DESC", phrase
+        return super()._search_clause(term, match, backend)
+
+    def page(self, **kwargs) -> dict:
+        try:
+            return super().page(**kwargs)
+        except Exception as e:
+            if e.args and e.args[0] == NO_FULLTEXT_INDEX:
+                raise SearchIndexMissing('No FULLTEXT index on student_name') from e
+            raise
+
+    def _execute_update(self, cur, assignments, where, params):
+        # LAST_INSERT_ID(expr) hands the new version back in the OK packet
+        # (cursor.lastrowid), so no follow-up SELECT is needed. Bumping the
+        # version also means rowcount counts matched rows, changed or not.
+        cur.execute(f"UPDATE student SET {assignments}, row_version = LAST_INSERT_ID(row_version + 1) "
+                    f"WHERE {where}", params)
+        return int(cur.lastrowid) if cur.rowcount > 0 else None
+
+    def allocate_ids(self, count: int) -> list:
+        return self.ids.allocate('student', count)
+
+    def reserve_ids(self, table: str, count: int) -> range:
+        return self.ids.reserve(table, count)
+
+    def discard_ids(self):
+        self.ids.discard('student')
+
+    def after_fork(self):
+        # A block of IDs reserved before fork would be handed out by every worker.
+        self.ids = IdAllocator(self.session, block_size=self.ids.block_size)
+
+    def version(self):
+        return self.versions.get(self.db.connection, 'student')
+
+    def export_batches(self, batch_size: int, columns=None):
+        # Streams on the request's connection rather than a second checkout,
+        # so an export never holds two pooled connections at once.
+        query = f"SELECT {select_list(columns)} FROM student ORDER BY student_id"
+        return iter_row_batches(self.db.connection, query, batch_size=batch_size)
+
+    def name_rows(self, batch_size: int):
+        query = "SELECT student_id, student_name FROM student"
+        for _, rows in iter_row_batches(self.db.connection, query, batch_size=batch_size):
+            yield from rows
+
+
+def create_repository(config, db=None) -> StudentRepository:
+    if config['STORAGE_BACKEND'] == 'sqlite':
+        from database.sqlite import SQLiteStudentRepository
+        from seed import templates
+        return SQLiteStudentRepository(config['SQLITE_PATH'], departments=templates.departments())
+    return MySQLStudentRepository(db, ngram_size=config['SEARCH_NGRAM_SIZE'], id_block_size=config['ID_BLOCK_SIZE'])
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import contextvars
+import time
+
+
+class QueryStats:
+    __slots__ = ('queries', 'seconds', 'rows', 'pool_wait')
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.pool_wait = 0.0
+
+
+_current = contextvars.ContextVar('query_stats', default=None)
+_listeners = []
+
+
+def begin() -> QueryStats:
+    # Start collecting DB time for the current request (or job).
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+def add_listener(listener):
+    # listener(query, seconds, rows) is called after every timed statement/fetch.
+    _listeners.append(listener)
+
+
+def record_wait(seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait += seconds
+
+
+def record(query, seconds: float, rows: int):
+    # Attribute one statement (query) or fetch (query=None) to the current request.
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += int(query is not None)
+        stats.seconds += seconds
+        stats.rows += rows
+    for listener in _listeners:
+        listener(query, seconds, rows)
+
+
+class TimedCursor:
+    # Wraps a DB-API cursor and attributes execute/fetch time to the current
+    # request's QueryStats.
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            record(query, time.perf_counter() - started, 0)
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            record(query, time.perf_counter() - started, 0)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        record(None, time.perf_counter() - started, len(result) if result else 0)
+        return result
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        record(None, time.perf_counter() - started, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        return self._fetch(self._cursor.fetchmany, *(() if size is None else (size,)))
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def close(self):
+        return self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import datetime
+
+# MySQL error 1146: Table doesn't exist (migration 0002 not applied)
+NO_SUCH_TABLE = 1146
+
+
+def as_utc(value):
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+class TableVersions:
+    # Per-table change counter (migration 0002). One primary-key lookup
+    # replaces running (and serializing) the real query just to find out
+    # nothing changed. Writers call bump() once per write statement, as the
+    # last step before commit, so the shared row is locked only briefly
+    # instead of once per inserted or updated row.
+
+    now_sql = "UTC_TIMESTAMP(6)"
+
+    def __init__(self):
+        self.enabled = True
+
+    def _parse(self, value):
+        return as_utc(value)
+
+    def query(self) -> str:
+        return f"SELECT version, updated_at, {self.now_sql} FROM table_version WHERE table_name = %s"
+
+    def state(self, row):
+        # (version, updated_at) from a query() row. Last-Modified only has
+        # one-second resolution, so updated_at is left out (None) until its
+        # second is over by the database clock: a later write in that same
+        # second would otherwise carry the same Last-Modified and get a
+        # wrong 304 for If-Modified-Since.
+        if row is None:
+            return None
+        version, updated_at, now = int(row[0]), self._parse(row[1]), self._parse(row[2])
+        if updated_at is not None and now is not None:
+            if now.replace(microsecond=0) <= updated_at.replace(microsecond=0):
+                updated_at = None
+        return version, updated_at
+
+    def get(self, conn, table: str):
+        if not self.enabled:
+            return None
+        cur = conn.cursor()
+        try:
+            cur.execute(self.query(), (table,))
+            row = cur.fetchone()
+        except Exception as e:
+            if e.args and e.args[0] == NO_SUCH_TABLE:
+                self.enabled = False
+                return None
+            raise
+        finally:
+            cur.close()
+        return self.state(row)
+
+    def bump(self, cur, table: str):
+        # Runs in the writer's transaction, so the new version becomes
+        # visible together with the write.
+        if not self.enabled:
+            return
+        try:
+            cur.execute(f"UPDATE table_version SET version = version + 1, updated_at = {self.now_sql} "
+                        "WHERE table_name = %s", (table,))
+        except Exception as e:
+            if e.args and e.args[0] == NO_SUCH_TABLE:
+                self.enabled = False
+                return
+            raise
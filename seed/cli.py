@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from seed import templates
+from seed.db import bump_table_version, connect_loader, reserve_ids, sample_student_ids
+from seed.generate import chunked, generate_courses
+from seed.loader import METHODS, load_table, local_infile_enabled
+from seed.parallel import SHARD_SIZE, shard_chunks
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m seed', description='Generate and load enrollment test data.')
+    parser.add_argument('--instructors', type=int, default=15, help='instructor rows to generate (default: 15)')
+    parser.add_argument('--students', type=int, default=50, help='student rows to generate (default: 50)')
+    parser.add_argument('--enrollments', type=int, default=100, help='enrollment rows to generate (default: 100)')
+    parser.add_argument('--batch-size', type=int, default=5000, help='rows per generated chunk / load statement (default: 5000)')
+    parser.add_argument('--commit-every', type=int, default=1, help='commit after this many chunks (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for reproducible data (default: 0)')
+    parser.add_argument('--method', choices=METHODS, default='auto',
+                        help='load-data uses LOAD DATA LOCAL INFILE from temp CSVs; executemany uses multi-row '
+                             'INSERT ... VALUES; auto picks load-data when the server allows it (default: auto)')
+    parser.add_argument('--disable-checks', action='store_true',
+                        help='turn off unique/foreign key checks for the session while loading')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes generating rows in parallel; output does not depend on this (default: 1)')
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE,
+                        help=f'rows per generation shard; changing it changes the generated data (default: {SHARD_SIZE})')
+    parser.add_argument('--fast-names', action='store_true',
+                        help='draw names from a precomputed pool with batched random draws instead of calling '
+                             'Faker per row (much faster, names repeat)')
+    return parser
+
+
+def seed_database(*, instructors: int = 15, students: int = 50, enrollments: int = 100, batch_size: int = 5000,
+                  commit_every: int = 1, seed: int = 0, method: str = 'auto', disable_checks: bool = False,
+                  workers: int = 1, shard_size: int = SHARD_SIZE, fast_names: bool = False, log=print) -> list:
+    rng = random.Random(seed)
+    report = []
+
+    def timed(table: str, load):
+        # `rows` is what the server reports as inserted, not what was sent.
+        started = time.perf_counter()
+        rows = load()
+        seconds = time.perf_counter() - started
+        rate = rows / seconds if seconds > 0 else 0.0
+        report.append({'table': table, 'rows': rows, 'seconds': round(seconds, 3), 'rows_per_sec': round(rate, 1)})
+        log(f"{table:<11} {rows:>10} rows  {seconds:8.2f}s  {rate:12.0f} rows/s")
+
+    conn = connect_loader()
+    try:
+        cursor = conn.cursor()
+        try:
+            if method == 'auto':
+                method = 'load-data' if local_infile_enabled(cursor) else 'executemany'
+            log(f"Loading with method={method}, batch_size={batch_size}, seed={seed}")
+            if disable_checks:
+                cursor.execute("SET SESSION unique_checks = 0, SESSION foreign_key_checks = 0")
+
+            # Existing students are the enrollment targets when none are generated.
+            existing_students = []
+            if not students and enrollments:
+                existing_students = sample_student_ids(cursor, enrollments, seed)
+        finally:
+            cursor.close()
+
+        # Reserve every ID range up front; concurrent seeders get disjoint ranges.
+        departments = templates.departments()
+        courses = generate_courses(departments=departments, course_titles=templates.course_titles(), rng=rng)
+        instructor_ids = reserve_ids('instructor', instructors)
+        student_ids = reserve_ids('student', students) if students else existing_students
+        enrollment_ids = reserve_ids('enrollment', enrollments)
+
+        def load(table, rows, **kwargs):
+            return load_table(conn, table, chunked(rows, batch_size), method=method,
+                              commit_every=commit_every, **kwargs)
+
+        def generated(table, start_id, count, context):
+            # Shards arrive in ID order and are re-chunked to the load batch size.
+            shards = shard_chunks(table, seed=seed, start_id=start_id, count=count, context=context,
+                                  workers=workers, fast=fast_names, shard_size=shard_size)
+            return itertools.chain.from_iterable(shards)
+
+        timed('department', lambda: load('department', departments, ignore=True))
+        timed('instructor', lambda: load('instructor', generated('instructor', instructor_ids.start, instructors, departments)))
+        timed('course', lambda: load('course', courses, ignore=True))
+        if students:
+            timed('student', lambda: load('student', generated('student', student_ids.start, students, departments)))
+            bump_table_version(conn)
+        if enrollments and student_ids:
+            context = (student_ids, [c[0] for c in courses])
+            timed('enrollment', lambda: load('enrollment', generated('enrollment', enrollment_ids.start, enrollments, context)))
+    finally:
+        conn.close()
+    return report
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        report = seed_database(
+            instructors=args.instructors,
+            students=args.students,
+            enrollments=args.enrollments,
+            batch_size=args.batch_size,
+            commit_every=args.commit_every,
+            seed=args.seed,
+            method=args.method,
+            disable_checks=args.disable_checks,
+            workers=args.workers,
+            shard_size=args.shard_size,
+            fast_names=args.fast_names,
+        )
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    total_rows = sum(r['rows'] for r in report)
+    total_seconds = sum(r['seconds'] for r in report)
+    print(f"Done: {total_rows} rows in {total_seconds:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,46 @@
 from __future__ import annotations
 
-import MySQLdb
+from database.ids import IdAllocator
+from database.pool import connect_mysql, get_pool
+from database.versions import TableVersions
 
-from config.config import SystemConfig
+_allocator = None
 
 
 def connect_db():
-    return MySQLdb.connect(
-        host=SystemConfig.MYSQL_HOST,
-        user=SystemConfig.MYSQL_USER,
-        passwd=SystemConfig.MYSQL_PASSWORD,
-        db=SystemConfig.MYSQL_DB,
-        port=SystemConfig.MYSQL_PORT,
-    )
-
-
-def next_id(cursor, table: str, id_column: str) -> int:
-    cursor.execute(f"SELECT COALESCE(MAX({id_column}), 0) FROM {table}")
-    return int(cursor.fetchone()[0]) + 1
+    # Pooled connection; close() returns it to the pool.
+    return get_pool().connection()
+
+
+def connect_loader():
+    # Dedicated connection for bulk loads: LOAD DATA LOCAL INFILE has to be
+    # enabled on the client side when connecting.
+    return connect_mysql(local_infile=1)
+
+
+def reserve_ids(table: str, count: int) -> range:
+    # Atomically reserve `count` contiguous IDs; safe with concurrent seeders.
+    global _allocator
+    if _allocator is None:
+        # Outside a request: each reservation checks out (and returns) a pooled connection.
+        _allocator = IdAllocator(get_pool().connection)
+    return _allocator.reserve(table, count)
+
+
+def sample_student_ids(cursor, count: int, seed: int = 0) -> list:
+    # Up to `count` real student IDs for enrollments when no students are
+    # generated; gaps left by deletes are never picked. RAND(seed) keeps the
+    # sample the same for the same --seed and table contents.
+    cursor.execute("SELECT student_id FROM student ORDER BY RAND(%s) LIMIT %s", (seed, count))
+    return sorted(int(row[0]) for row in cursor.fetchall())
+
+
+def bump_table_version(conn, table: str = 'student'):
+    # Seeders write around the repository, so they move the ETag counter
+    # themselves: once per load rather than once per row.
+    cursor = conn.cursor()
+    try:
+        TableVersions().bump(cursor, table)
+        conn.commit()
+    finally:
+        cursor.close()
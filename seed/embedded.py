@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import random
+import time
+
+from faker import Faker
+
+from seed import templates
+from seed.generate import chunked, iter_enrollments, iter_instructors, iter_students
+
+# Same generators and row shapes as `python -m seed`, written through the
+# student repository instead of a MySQL loader connection. Used for
+# STORAGE_BACKEND=sqlite (POST /admin/seed, benchmarks/load.py), where there
+# is no server to LOAD DATA into. IDs come from repository.reserve_ids(), so
+# they never collide with the API's own allocations, and every chunk is its
+# own short session, so requests keep being served while a seed runs.
+
+INSERTS = {
+    'department': "INSERT OR IGNORE INTO department (dept_id, dept_name) VALUES (%s, %s)",
+    'instructor': "INSERT INTO instructor (instr_id, instr_name, salary, dept_id) VALUES (%s, %s, %s, %s)",
+    'course': "INSERT INTO course (course_id, course_code, title, credits, dept_id) VALUES (%s, %s, %s, %s, %s)",
+    'enrollment': "INSERT INTO enrollment (enroll_id, student_id, course_id, semester, grade) VALUES (%s, %s, %s, %s, %s)",
+}
+
+
+def _insert(repository, table: str, rows: list) -> int:
+    with repository.session() as conn:
+        cur = conn.cursor()
+        try:
+            cur.executemany(INSERTS[table], rows)
+            conn.commit()
+            return cur.rowcount if cur.rowcount >= 0 else len(rows)
+        finally:
+            cur.close()
+
+
+def _write_students(repository, rows: list) -> int:
+    # Through write_batch, like POST /students/bulk: it also bumps the ETag counter.
+    return sum(1 for result in repository.write_batch(list(enumerate(rows))) if result['status'] == 'created')
+
+
+def existing_student_ids(repository, count: int, rng: random.Random, batch_size: int = 5000) -> list:
+    # Reservoir sample of up to `count` real student IDs, read in keyset
+    # batches; gaps left by deletes are never picked.
+    sample = []
+    seen = 0
+    for _, rows in repository.export_batches(batch_size, ('student_id',)):
+        for (student_id,) in rows:
+            seen += 1
+            if len(sample) < count:
+                sample.append(student_id)
+            else:
+                slot = rng.randrange(seen)
+                if slot < count:
+                    sample[slot] = student_id
+    return sorted(sample)
+
+
+def seed_repository(repository, *, instructors: int = 15, students: int = 50, enrollments: int = 100,
+                    batch_size: int = 5000, seed: int = 0, log=print) -> list:
+    rng = random.Random(seed)
+    faker = Faker()
+    faker.seed_instance(seed)
+    departments = templates.departments()
+    report = []
+
+    def load(table, rows, write=None):
+        # `rows` in the report is what was inserted (departments that already exist are skipped).
+        started = time.perf_counter()
+        count = 0
+        for chunk in chunked(rows, batch_size):
+            count += write(chunk) if write else _insert(repository, table, chunk)
+        seconds = time.perf_counter() - started
+        rate = count / seconds if seconds > 0 else 0.0
+        report.append({'table': table, 'rows': count, 'seconds': round(seconds, 3),
+                       'rows_per_sec': round(rate, 1)})
+        log(f"{table:<11} {count:>10} rows  {seconds:8.2f}s  {rate:12.0f} rows/s")
+
+    titles = templates.course_titles()
+    course_ids = repository.reserve_ids('course', len(titles))
+    courses = [(course_id, code, title, rng.choice([3, 4]), rng.choice(departments)[0])
+               for course_id, (code, title) in zip(course_ids, titles)]
+    if students:
+        student_ids = repository.reserve_ids('student', students)
+    else:
+        # Existing students are the enrollment targets when none are generated.
+        student_ids = existing_student_ids(repository, enrollments, rng, batch_size) if enrollments else []
+
+    load('department', departments)
+    load('instructor', iter_instructors(start_id=repository.reserve_ids('instructor', instructors).start,
+                                        count=instructors, departments=departments, faker=faker, rng=rng))
+    load('course', courses)
+    if students:
+        load('student', iter_students(start_id=student_ids.start, count=students, departments=departments,
+                                      faker=faker, rng=rng),
+             lambda chunk: _write_students(repository, chunk))
+    if enrollments and student_ids:
+        load('enrollment', iter_enrollments(start_id=repository.reserve_ids('enrollment', enrollments).start,
+                                            count=enrollments, student_ids=student_ids, course_ids=list(course_ids),
+                                            rng=rng))
+    return report
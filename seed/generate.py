@@ -3,53 +3,81 @@ from __future__ import annotations
 import random
 from faker import Faker
 
-from seed.db import next_id
+from seed.db import reserve_ids
 
+SEMESTERS = ['2023-1', '2023-2', '2024-1']
 
-def generate_instructors(*, cursor, departments, count: int, faker: Faker, rng: random.Random):
-    instructors = []
-    start_id = next_id(cursor, 'instructor', 'instr_id')
+
+def chunked(rows, size: int):
+    # Group a row iterator into lists of at most `size` rows.
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_instructors(*, start_id: int, count: int, departments, faker: Faker, rng: random.Random):
     for offset in range(count):
         instr_id = start_id + offset
         instr_name = faker.name()
         salary = round(rng.uniform(50000, 120000), 2)
         dept_id = rng.choice(departments)[0]
-        instructors.append((instr_id, instr_name, salary, dept_id))
-    return instructors
-
-
-def generate_courses(*, cursor, departments, course_titles, rng: random.Random):
-    courses = []
-    start_id = next_id(cursor, 'course', 'course_id')
-    for offset, (code, title) in enumerate(course_titles):
-        course_id = start_id + offset
-        credits = rng.choice([3, 4])
-        dept_id = rng.choice(departments)[0]
-        courses.append((course_id, code, title, credits, dept_id))
-    return courses
+        yield (instr_id, instr_name, salary, dept_id)
 
 
-def generate_students(*, cursor, departments, count: int, faker: Faker, rng: random.Random):
-    students = []
-    start_id = next_id(cursor, 'student', 'student_id')
+def iter_students(*, start_id: int, count: int, departments, faker: Faker, rng: random.Random):
     for offset in range(count):
         student_id = start_id + offset
         student_name = faker.name()
         year_level = rng.randint(1, 4)
         gpa = round(rng.uniform(1.0, 4.0), 2)
         dept_id = rng.choice(departments)[0]
-        students.append((student_id, student_name, year_level, gpa, dept_id))
-    return students
+        yield (student_id, student_name, year_level, gpa, dept_id)
 
 
-def generate_enrollments(*, cursor, students, courses, count: int, rng: random.Random):
-    enrollments = []
-    start_id = next_id(cursor, 'enrollment', 'enroll_id')
+def iter_enrollments(*, start_id: int, count: int, student_ids, course_ids, rng: random.Random):
+    # student_ids / course_ids can be any sequence (a range works for contiguous
+    # IDs, so millions of students never have to be materialized).
     for offset in range(count):
         enroll_id = start_id + offset
-        student_id = rng.choice(students)[0]
-        course_id = rng.choice(courses)[0]
-        semester = rng.choice(['2023-1', '2023-2', '2024-1'])
+        student_id = rng.choice(student_ids)
+        course_id = rng.choice(course_ids)
+        semester = rng.choice(SEMESTERS)
         grade = round(rng.uniform(1.0, 4.0), 2)
-        enrollments.append((enroll_id, student_id, course_id, semester, grade))
-    return enrollments
+        yield (enroll_id, student_id, course_id, semester, grade)
+
+
+def generate_instructors(*, departments, count: int, faker: Faker, rng: random.Random):
+    start_id = reserve_ids('instructor', count).start
+    return list(iter_instructors(start_id=start_id, count=count, departments=departments, faker=faker, rng=rng))
+
+
+def generate_courses(*, departments, course_titles, rng: random.Random):
+    courses = []
+    start_id = reserve_ids('course', len(course_titles)).start
+    for offset, (code, title) in enumerate(course_titles):
+        course_id = start_id + offset
+        credits = rng.choice([3, 4])
+        dept_id = rng.choice(departments)[0]
+        courses.append((course_id, code, title, credits, dept_id))
+    return courses
+
+
+def generate_students(*, departments, count: int, faker: Faker, rng: random.Random):
+    start_id = reserve_ids('student', count).start
+    return list(iter_students(start_id=start_id, count=count, departments=departments, faker=faker, rng=rng))
+
+
+def generate_enrollments(*, students, courses, count: int, rng: random.Random):
+    start_id = reserve_ids('enrollment', count).start
+    return list(iter_enrollments(
+        start_id=start_id,
+        count=count,
+        student_ids=[s[0] for s in students],
+        course_ids=[c[0] for c in courses],
+        rng=rng,
+    ))
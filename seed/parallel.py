@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from faker import Faker
+
+from seed.generate import SEMESTERS, iter_enrollments, iter_instructors, iter_students
+
+# Rows per shard. Part of the data's identity: the same seed and shard size
+# give the same rows no matter how many workers generate them.
+SHARD_SIZE = 10000
+NAME_POOL_SIZE = 1000
+
+
+def sub_seed(seed: int, table: str, shard: int) -> int:
+    digest = hashlib.sha256(f'{seed}:{table}:{shard}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+_faker = None
+_name_pools = {}
+
+
+def _worker_faker() -> Faker:
+    # Building a Faker is expensive; keep one per process and reseed per shard.
+    global _faker
+    if _faker is None:
+        _faker = Faker()
+    return _faker
+
+
+def name_pool(seed: int):
+    # Precomputed first/last names for the fast path: drawing from these lists
+    # is far cheaper than calling faker.name() per row, at the cost of names
+    # repeating across a large table.
+    pool = _name_pools.get(seed)
+    if pool is None:
+        faker = Faker()
+        faker.seed_instance(sub_seed(seed, 'names', 0))
+        pool = (
+            [faker.first_name() for _ in range(NAME_POOL_SIZE)],
+            [faker.last_name() for _ in range(NAME_POOL_SIZE)],
+        )
+        _name_pools[seed] = pool
+    return pool
+
+
+def _fast_names(seed: int, rng: random.Random, count: int) -> list:
+    first, last = name_pool(seed)
+    return [f'{f} {l}' for f, l in zip(rng.choices(first, k=count), rng.choices(last, k=count))]
+
+
+def _fast_students(seed, rng, start_id, count, departments):
+    dept_ids = [d[0] for d in departments]
+    names = _fast_names(seed, rng, count)
+    years = rng.choices((1, 2, 3, 4), k=count)
+    gpas = [round(1.0 + 3.0 * rng.random(), 2) for _ in range(count)]
+    depts = rng.choices(dept_ids, k=count)
+    return list(zip(range(start_id, start_id + count), names, years, gpas, depts))
+
+
+def _fast_instructors(seed, rng, start_id, count, departments):
+    dept_ids = [d[0] for d in departments]
+    names = _fast_names(seed, rng, count)
+    salaries = [round(50000 + 70000 * rng.random(), 2) for _ in range(count)]
+    depts = rng.choices(dept_ids, k=count)
+    return list(zip(range(start_id, start_id + count), names, salaries, depts))
+
+
+def _fast_enrollments(rng, start_id, count, student_ids, course_ids):
+    students = rng.choices(student_ids, k=count)
+    courses = rng.choices(course_ids, k=count)
+    semesters = rng.choices(SEMESTERS, k=count)
+    grades = [round(1.0 + 3.0 * rng.random(), 2) for _ in range(count)]
+    return list(zip(range(start_id, start_id + count), students, courses, semesters, grades))
+
+
+def generate_shard(task) -> list:
+    # Runs in a worker process; task is a plain tuple so it pickles cheaply.
+    table, seed, shard, start_id, count, fast, context = task
+    rng = random.Random(sub_seed(seed, table, shard))
+    if table == 'enrollment':
+        student_ids, course_ids = context
+        if fast:
+            return _fast_enrollments(rng, start_id, count, student_ids, course_ids)
+        return list(iter_enrollments(start_id=start_id, count=count, student_ids=student_ids,
+                                     course_ids=course_ids, rng=rng))
+
+    departments = context
+    if fast:
+        build = _fast_students if table == 'student' else _fast_instructors
+        return build(seed, rng, start_id, count, departments)
+    faker = _worker_faker()
+    faker.seed_instance(sub_seed(seed, table + ':faker', shard))
+    rows = iter_students if table == 'student' else iter_instructors
+    return list(rows(start_id=start_id, count=count, departments=departments, faker=faker, rng=rng))
+
+
+def shard_chunks(table: str, *, seed: int, start_id: int, count: int, context, workers: int = 1,
+                 fast: bool = False, shard_size: int = SHARD_SIZE):
+    # Yields one list of rows per shard, in ID order. With several workers the
+    # shards are generated in a process pool with at most 2 * workers shards in
+    # flight, so the loader consumes them as a stream.
+    tasks = (
+        (table, seed, shard, start_id + offset, min(shard_size, count - offset), fast, context)
+        for shard, offset in enumerate(range(0, count, shard_size))
+    )
+    if workers <= 1:
+        for task in tasks:
+            yield generate_shard(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(generate_shard, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
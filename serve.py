@@ -0,0 +1,107 @@
+import argparse
+import os
+import signal
+import sys
+import time
+
+from gunicorn.app.base import BaseApplication
+
+from config.config import SystemConfig
+
+# Production entry point: `python serve.py` runs SERVER_WORKERS gunicorn
+# worker processes (threaded, with HTTP keep-alive) over one preloaded copy
+# of app.py. `python app.py` remains the single-process debug server.
+
+
+def post_fork(server, worker):
+    import app
+    app.after_fork()
+
+
+def gunicorn_options(config=SystemConfig) -> dict:
+    return {
+        'bind': [b.strip() for b in config.SERVER_BIND.split(',') if b.strip()],
+        'workers': config.SERVER_WORKERS,
+        'worker_class': 'gthread',
+        'threads': config.SERVER_THREADS,
+        'preload_app': config.SERVER_PRELOAD,
+        'max_requests': config.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': config.SERVER_MAX_REQUESTS_JITTER,
+        'keepalive': config.SERVER_KEEPALIVE,
+        'timeout': config.SERVER_TIMEOUT,
+        'graceful_timeout': config.SERVER_GRACEFUL_TIMEOUT,
+        'pidfile': config.SERVER_PIDFILE,
+        'post_fork': post_fork,
+    }
+
+
+class Launcher(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        return app
+
+
+def read_pid(path: str):
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def reload(pidfile: str, timeout: float = 60.0) -> int:
+    # Zero-downtime code reload. USR2 makes the running master start a new
+    # master (re-importing the app) whose workers share the listening socket;
+    # once the new master is up (it writes "<pidfile>.2" until promoted),
+    # TERM lets the old workers finish their in-flight requests
+    # (SERVER_GRACEFUL_TIMEOUT) and exit.
+    old_pid = read_pid(pidfile)
+    if old_pid is None:
+        print(f"Error: no running server ({pidfile} not found)")
+        return 1
+    os.kill(old_pid, signal.SIGUSR2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        new_pid = read_pid(pidfile + '.2')
+        if new_pid is not None and new_pid != old_pid:
+            os.kill(old_pid, signal.SIGTERM)
+            print(f"Reloaded: master {old_pid} -> {new_pid}")
+            return 0
+        time.sleep(0.2)
+    print(f"Error: new master did not start within {timeout}s; {old_pid} keeps serving")
+    return 1
+
+
+def stop(pidfile: str) -> int:
+    # Graceful stop: workers finish in-flight requests first.
+    pid = read_pid(pidfile)
+    if pid is None:
+        print(f"Error: no running server ({pidfile} not found)")
+        return 1
+    os.kill(pid, signal.SIGTERM)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the API with multiple worker processes.')
+    parser.add_argument('command', nargs='?', default='run', choices=('run', 'reload', 'stop'),
+                        help='run the server (default), reload it without downtime, or stop it')
+    args = parser.parse_args(argv)
+    if args.command == 'reload':
+        return reload(SystemConfig.SERVER_PIDFILE)
+    if args.command == 'stop':
+        return stop(SystemConfig.SERVER_PIDFILE)
+    Launcher(gunicorn_options()).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,7 @@ from faker import Faker
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from database.versions import TableVersions
 from seed.db import connect_db
 from seed import templates
 from seed.generate import (
@@ -32,34 +33,35 @@ def insert_test_data():
                 departments,
             )
 
-            instructors = generate_instructors(cursor=cursor, departments=departments, count=15, faker=fake, rng=rng)
+            instructors = generate_instructors(departments=departments, count=15, faker=fake, rng=rng)
             print(f"Inserting {len(instructors)} Instructors...")
             cursor.executemany(
-                "INSERT IGNORE INTO instructor (instr_id, instr_name, salary, dept_id) VALUES (%s, %s, %s, %s)",
+                "INSERT INTO instructor (instr_id, instr_name, salary, dept_id) VALUES (%s, %s, %s, %s)",
                 instructors,
             )
 
-            courses = generate_courses(cursor=cursor, departments=departments, course_titles=course_titles, rng=rng)
+            courses = generate_courses(departments=departments, course_titles=course_titles, rng=rng)
             print(f"Inserting {len(courses)} Courses...")
             cursor.executemany(
                 "INSERT IGNORE INTO course (course_id, course_code, title, credits, dept_id) VALUES (%s, %s, %s, %s, %s)",
                 courses,
             )
 
-            students = generate_students(cursor=cursor, departments=departments, count=50, faker=fake, rng=rng)
+            students = generate_students(departments=departments, count=50, faker=fake, rng=rng)
             print(f"Inserting {len(students)} Students...")
             cursor.executemany(
-                "INSERT IGNORE INTO student (student_id, student_name, year_level, gpa, dept_id) VALUES (%s, %s, %s, %s, %s)",
+                "INSERT INTO student (student_id, student_name, year_level, gpa, dept_id) VALUES (%s, %s, %s, %s, %s)",
                 students,
             )
 
-            enrollments = generate_enrollments(cursor=cursor, students=students, courses=courses, count=100, rng=rng)
+            enrollments = generate_enrollments(students=students, courses=courses, count=100, rng=rng)
             print(f"Inserting {len(enrollments)} Enrollments...")
             cursor.executemany(
-                "INSERT IGNORE INTO enrollment (enroll_id, student_id, course_id, semester, grade) VALUES (%s, %s, %s, %s, %s)",
+                "INSERT INTO enrollment (enroll_id, student_id, course_id, semester, grade) VALUES (%s, %s, %s, %s, %s)",
                 enrollments,
             )
 
+            TableVersions().bump(cursor, 'student')
             db.commit()
             print("Data generation and insertion completed successfully!")
         finally:
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config.config import SystemConfig
+
+
+def use_test_config():
+    # Call before `import app`. Hermetic by default: in-memory SQLite unless
+    # STORAGE_BACKEND=mysql is set, and the request log goes to a temp file
+    # and admin job files go to temp dirs instead of the tracked logs/ directory.
+    SystemConfig.STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'sqlite')
+    if 'LOG_FILE' not in os.environ:
+        SystemConfig.LOG_FILE = os.path.join(tempfile.mkdtemp(prefix='api-test-logs-'), 'api.log')
+    if 'ADMIN_JOB_DIR' not in os.environ:
+        SystemConfig.ADMIN_JOB_DIR = tempfile.mkdtemp(prefix='api-test-jobs-')
+
+
+class FakeCursor:
+    # Records every statement on its connection. Result rows come from the
+    # connection's respond(cursor, query, params), so each test module only
+    # scripts the queries it cares about.
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+        self.rowcount = -1
+
+    def execute(self, query, params=()):
+        self.conn.statements.append(query)
+        if self.conn.error is not None:
+            raise self.conn.error
+        self.rows = list(self.conn.respond(self, query, params) or [])
+
+    def executemany(self, query, rows):
+        rows = list(rows)
+        self.conn.statements.append(query)
+        self.conn.written.extend(rows)
+        self.rowcount = len(rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    # DB-API connection double: statements and executemany rows are kept in
+    # `statements` / `written`; `error` makes every execute() raise.
+
+    def __init__(self, respond=None, error=None):
+        self.respond = respond or (lambda cursor, query, params: None)
+        self.error = error
+        self.statements = []
+        self.written = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.pings = 0
+        self.fail_ping = False
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def ping(self):
+        self.pings += 1
+        if self.fail_ping:
+            raise Exception('MySQL server has gone away')
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.aggregates import StudentAggregates
+
+
+class TestStudentAggregates(unittest.TestCase):
+    def setUp(self):
+        self.aggregates = StudentAggregates(ttl=60)
+        self.aggregates.rebuild(
+            [(1, 1, 3.0), (2, 1, 4.0), (3, 2, 2.0)],
+            [(10, '1st', 2, 3.5, 2), (20, '1st', 1, None, 0)],
+        )
+
+    def departments(self):
+        return {d['dept_id']: (d['student_count'], d['avg_gpa']) for d in self.aggregates.departments()}
+
+    def test_01_rebuild(self):
+        print("\n[TEST] Rebuilding the department and course figures...")
+        self.assertEqual(self.departments(), {1: (2, 3.5), 2: (1, 2.0)})
+        self.assertEqual(self.aggregates.courses(), [
+            {'course_id': 10, 'semester': '1st', 'enrollment_count': 2, 'avg_grade': 1.75},
+            {'course_id': 20, 'semester': '1st', 'enrollment_count': 1, 'avg_grade': None},
+        ])
+        self.assertFalse(self.aggregates.stale)
+        staleness = self.aggregates.staleness('departments')
+        self.assertEqual(staleness['max_age_seconds'], 60)
+        self.assertLess(staleness['age_seconds'], 60)
+
+    def test_02_incremental_writes(self):
+        print("\n[TEST] Applying writes between rebuilds...")
+        self.aggregates.put(4, 2, 3.0)
+        self.assertEqual(self.departments(), {1: (2, 3.5), 2: (2, 2.5)})
+        # Moving a student subtracts it from the old department.
+        self.aggregates.update(1, {'dept_id': 2})
+        self.assertEqual(self.departments(), {1: (1, 4.0), 2: (3, 2.667)})
+        self.aggregates.update(2, {'gpa': 2.0})
+        self.aggregates.remove(2)
+        self.assertEqual(self.departments(), {2: (3, 2.667)})
+        # Name-only updates and unknown deletes change nothing.
+        self.aggregates.update(3, {'student_name': 'X'})
+        self.aggregates.remove(99)
+        self.assertEqual(self.departments(), {2: (3, 2.667)})
+        self.assertFalse(self.aggregates.stale)
+
+    def test_03_unknown_student_update_forces_rebuild(self):
+        print("\n[TEST] Rebuilding after an update to an unknown student...")
+        self.aggregates.update(99, {'gpa': 1.0})
+        self.assertTrue(self.aggregates.stale)
+        loads = []
+        self.aggregates.refresh(lambda: loads.append('students') or [(99, 1, 1.0)],
+                                lambda: loads.append('courses') or [])
+        self.assertEqual(loads, ['students', 'courses'])
+        self.assertEqual(self.departments(), {1: (1, 1.0)})
+        # Fresh again: no reload.
+        self.aggregates.refresh(lambda: loads.append('students') or [], lambda: [])
+        self.assertEqual(len(loads), 2)
+
+    def test_04_writes_before_first_build_are_ignored(self):
+        print("\n[TEST] Ignoring writes before the first build...")
+        aggregates = StudentAggregates()
+        aggregates.put(1, 1, 3.0)
+        self.assertEqual(aggregates.departments(), [])
+        self.assertIsNone(aggregates.staleness('courses')['age_seconds'])
+
+    def test_05_writes_during_rebuild_are_replayed(self):
+        print("\n[TEST] Replaying writes made while a rebuild loads rows...")
+        self.aggregates.invalidate()
+
+        def load_students():
+            # These land after the snapshot below was taken.
+            self.aggregates.put(4, 2, 3.0)
+            self.aggregates.update(1, {'gpa': 2.0})
+            self.aggregates.remove(3)
+            return [(1, 1, 3.0), (2, 1, 4.0), (3, 2, 2.0)]
+
+        self.aggregates.refresh(load_students, lambda: [])
+        self.assertEqual(self.departments(), {1: (2, 3.0), 2: (1, 3.0)})
+        self.assertFalse(self.aggregates.stale)
+
+        # A write the snapshot already contains is not counted twice.
+        def load_with_write():
+            self.aggregates.put(5, 3, 1.0)
+            return [(1, 1, 2.0), (2, 1, 4.0), (4, 2, 3.0), (5, 3, 1.0)]
+
+        self.aggregates.invalidate()
+        self.aggregates.refresh(load_with_write, lambda: [])
+        self.assertEqual(self.departments(), {1: (2, 3.0), 2: (1, 3.0), 3: (1, 1.0)})
+
+    def test_06_background_refresh(self):
+        print("\n[TEST] Rebuilding on a background thread...")
+        aggregates = StudentAggregates(ttl=60)
+        loading, release = threading.Event(), threading.Event()
+
+        def load_students():
+            loading.set()
+            release.wait(5)
+            return [(1, 1, 3.0)]
+
+        done = threading.Event()
+        run = lambda: aggregates.refresh(load_students, lambda: []) or done.set()
+        # No figures yet: the caller gets False at once instead of waiting for the scan.
+        self.assertFalse(aggregates.refresh_in_background(run))
+        self.assertTrue(loading.wait(5))
+        self.assertFalse(aggregates.refresh_in_background(run))
+        # Invalidated while the rows load: the new figures are already stale.
+        aggregates.invalidate()
+        release.set()
+        self.assertTrue(done.wait(5))
+        self.assertEqual(aggregates.departments(), [{'dept_id': 1, 'student_count': 1, 'avg_gpa': 3.0}])
+        self.assertTrue(aggregates.stale)
+
+if __name__ == '__main__':
+    unittest.main()
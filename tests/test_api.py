@@ -4,9 +4,14 @@ import sys
 import os
 import random
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from app import app
 from config.config import SystemConfig
+from support import use_test_config
+# Hermetic by default; STORAGE_BACKEND=mysql runs the same tests against a live server.
+use_test_config()
+from app import app
 import base64
+import gzip
+import time
 
 
 class TestEnrollmentAPI(unittest.TestCase):
@@ -28,7 +33,7 @@ class TestEnrollmentAPI(unittest.TestCase):
         self.token = data['token']
         self.headers = {'Authorization': f'Bearer {self.token}'}
 
-    def test_1_create_student(self):
+    def test_01_create_student(self):
         print(f"\n[TEST] Creating Student (ID: {self.test_student_id})...")
         student_data = {
             'student_id': self.test_student_id,
@@ -42,7 +47,7 @@ class TestEnrollmentAPI(unittest.TestCase):
         print(f"   Response: {response.status_code} - {response.data.decode()}")
         self.assertEqual(response.status_code, 201)
 
-    def test_2_get_students(self):
+    def test_02_get_students(self):
         print("\n[TEST] Getting All Students...")
         response = self.app.get('/students', headers=self.headers)
         print(f"   Response Status: {response.status_code}")
@@ -50,7 +55,7 @@ class TestEnrollmentAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIn('students', data)
 
-    def test_3_get_student(self):
+    def test_03_get_student(self):
         print(f"\n[TEST] Getting Single Student (ID: {self.test_student_id})...")
         
         # Ensure exists
@@ -64,7 +69,7 @@ class TestEnrollmentAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertEqual(data['student']['student_name'], 'Test Student')
 
-    def test_4_update_student(self):
+    def test_04_update_student(self):
         print(f"\n[TEST] Updating Student (ID: {self.test_student_id})...")
         
         # Ensure exists
@@ -83,7 +88,7 @@ class TestEnrollmentAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertEqual(float(data['student']['gpa']), 3.9)
 
-    def test_5_search_student(self):
+    def test_05_search_student(self):
         print("\n[TEST] Searching Student (Query: 'Test')...")
         response = self.app.get('/students?search=Test', headers=self.headers)
         print(f"   Response: {response.data.decode()}")
@@ -91,7 +96,7 @@ class TestEnrollmentAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertTrue(len(data['students']) > 0)
 
-    def test_6_xml_format(self):
+    def test_06_xml_format(self):
         print("\n[TEST] Testing XML Format...")
         
         # Ensure exists
@@ -106,7 +111,7 @@ class TestEnrollmentAPI(unittest.TestCase):
         self.assertEqual(response.headers['Content-Type'], 'application/xml')
         self.assertIn(b'<student>', response.data)
 
-    def test_7_delete_student(self):
+    def test_07_delete_student(self):
         print(f"\n[TEST] Deleting Student (ID: {self.test_student_id})...")
         
         # Ensure exists
@@ -122,12 +127,368 @@ class TestEnrollmentAPI(unittest.TestCase):
         response = self.app.get(f'/students/{self.test_student_id}', headers=self.headers)
         self.assertEqual(response.status_code, 404)
 
-    def test_8_edge_cases(self):
+    def test_08_edge_cases(self):
         print("\n[TEST] Testing Edge Cases...")
         
         # 1. Unauthorized Access
         response = self.app.get('/students', headers={})
         self.assertEqual(response.status_code, 401)
 
+    def test_09_pagination(self):
+        print("\n[TEST] Testing Keyset Pagination...")
+
+        # Ensure at least one row exists
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+
+        response = self.app.get('/students?limit=1', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len(data['students']), 1)
+        self.assertIn('next', data)
+
+        if data['next'] is not None:
+            response = self.app.get(f"/students?limit=1&after={data['next']}", headers=self.headers)
+            page = json.loads(response.data)
+            self.assertGreater(page['students'][0]['student_id'], data['students'][0]['student_id'])
+
+        response = self.app.get('/students?limit=abc', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+    def test_10_export(self):
+        print("\n[TEST] Testing Streaming Export...")
+        response = self.app.get('/students/export?format=ndjson', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Type'], 'application/x-ndjson')
+        for line in response.data.decode().splitlines():
+            self.assertIn('student_id', json.loads(line))
+
+        response = self.app.get('/students/export', headers=self.headers)
+        self.assertIn('students', json.loads(response.data))
+
+    def test_11_bulk_create(self):
+        print("\n[TEST] Testing Bulk Create/Upsert...")
+        students = [
+            {'student_id': self.test_student_id, 'student_name': 'Bulk Student', 'year_level': 1, 'gpa': 3.0, 'dept_id': 1},
+            {'student_id': self.test_student_id, 'student_name': 'Bulk Student', 'year_level': 1, 'gpa': 3.0, 'dept_id': 1},
+            {'student_name': 'Missing ID', 'year_level': 1, 'gpa': 3.0, 'dept_id': 1},
+        ]
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+        response = self.app.post('/students/bulk', headers=self.headers, json=students)
+        print(f"   Response: {response.status_code} - {response.data.decode()}")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        # Rows without a student_id are given one from the ID sequence.
+        self.assertEqual([r['status'] for r in data['results']], ['created', 'rejected', 'created'])
+        self.app.delete(f"/students/{data['results'][2]['student_id']}", headers=self.headers)
+
+        body = json.dumps(dict(students[0], gpa=3.5))
+        response = self.app.post('/students/bulk?upsert=1', headers=self.headers, data=body,
+                                 content_type='application/x-ndjson')
+        data = json.loads(response.data)
+        self.assertEqual(data['updated'], 1)
+
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+    def test_12_prefix_search(self):
+        print("\n[TEST] Testing Prefix and Relevance Search...")
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+
+        response = self.app.get('/students?search=Test%20Stu&match=prefix', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        ids = [s['student_id'] for s in json.loads(response.data)['students']]
+        self.assertIn(self.test_student_id, ids)
+
+        response = self.app.get('/students?search=Student&order=relevance', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(json.loads(response.data)['next'])
+
+        response = self.app.get('/students?search=Test&match=fuzzy', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+    def test_13_conditional_get(self):
+        print("\n[TEST] Testing ETag / Conditional GET...")
+        response = self.app.get('/students', headers=self.headers)
+        etag = response.headers.get('ETag')
+        if etag is None:
+            self.skipTest('table_version migration not applied')
+
+        response = self.app.get('/students', headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 304)
+
+        response = self.app.get('/students?format=xml', headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+        response = self.app.get('/students', headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+    def test_14_compression(self):
+        print("\n[TEST] Testing Response Compression...")
+        headers = dict(self.headers, **{'Accept-Encoding': 'gzip'})
+        response = self.app.get('/students/export?format=ndjson', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        for line in gzip.decompress(response.data).decode().splitlines():
+            self.assertIn('student_id', json.loads(line))
+
+        response = self.app.get('/students?limit=1', headers=headers)
+        if 'Content-Encoding' not in response.headers:
+            self.assertLess(len(response.data), SystemConfig.COMPRESSION_MIN_SIZE)
+
+    def test_15_fields(self):
+        print("\n[TEST] Testing Field Projection...")
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+
+        response = self.app.get('/students?fields=student_name&limit=5', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        for student in json.loads(response.data)['students']:
+            self.assertEqual(set(student), {'student_id', 'student_name'})
+
+        response = self.app.get(f'/students/{self.test_student_id}?fields=gpa', headers=self.headers)
+        self.assertEqual(json.loads(response.data)['student'], {'student_id': self.test_student_id, 'gpa': 4.0})
+
+        response = self.app.get(f'/students/{self.test_student_id}?fields=gpa&format=xml', headers=self.headers)
+        self.assertNotIn(b'<student_name>', response.data)
+
+        response = self.app.get('/students?fields=student_name,password', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+    def test_16_if_match_and_patch(self):
+        print("\n[TEST] Testing If-Match / PATCH...")
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+        url = f'/students/{self.test_student_id}'
+        response = self.app.get(url, headers=self.headers)
+        version = json.loads(response.data)['student']['row_version']
+        etag = response.headers['ETag']
+
+        # The ETag of GET /students/<id> round-trips as If-Match.
+        response = self.app.patch(url, headers=dict(self.headers, **{'If-Match': etag}), json={'gpa': 3.5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['row_version'], version + 1)
+        response = self.app.get(url, headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+        # A second editor still holding the old version loses instead of overwriting.
+        response = self.app.put(url, headers=dict(self.headers, **{'If-Match': f'"{version}"'}), json={'gpa': 1.0})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(json.loads(response.data)['row_version'], version + 1)
+        self.assertEqual(json.loads(self.app.get(url, headers=self.headers).data)['student']['gpa'], 3.5)
+
+        response = self.app.delete(url, headers=dict(self.headers, **{'If-Match': f'"{version}"'}))
+        self.assertEqual(response.status_code, 412)
+        other_etag = f'"student-{self.test_student_id + 1}-v{version + 1}-json"'
+        response = self.app.delete(url, headers=dict(self.headers, **{'If-Match': other_etag}))
+        self.assertEqual(response.status_code, 412)
+        response = self.app.delete(url, headers=dict(self.headers, **{'If-Match': f'"{version + 1}"'}))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.app.patch(url, headers=dict(self.headers, **{'If-Match': '*'}), json={'gpa': 3.0})
+        self.assertEqual(response.status_code, 404)
+
+    def test_17_batch_get(self):
+        print("\n[TEST] Testing Batch Lookup by IDs...")
+        other_id = self.test_student_id + 100000
+        for student_id in (self.test_student_id, other_id):
+            self.app.post('/students', headers=self.headers, json={
+                'student_id': student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+            })
+        # Warm the single-student cache for one of them.
+        self.app.get(f'/students/{other_id}', headers=self.headers)
+        missing_id = self.test_student_id + 200000
+
+        response = self.app.get(f'/students?ids={other_id},{missing_id},{self.test_student_id},{other_id}',
+                                headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([s['student_id'] for s in data['students']], [other_id, self.test_student_id])
+        self.assertEqual(data['missing'], [missing_id])
+
+        response = self.app.post('/students/batch-get?fields=student_name', headers=self.headers,
+                                 json={'ids': [self.test_student_id, missing_id, other_id]})
+        data = json.loads(response.data)
+        self.assertEqual(data['students'], [
+            {'student_id': self.test_student_id, 'student_name': 'Test Student'},
+            {'student_id': other_id, 'student_name': 'Test Student'},
+        ])
+
+        response = self.app.get('/students?ids=1,abc', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        response = self.app.post('/students/batch-get', headers=self.headers, json={'ids': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+        for student_id in (self.test_student_id, other_id):
+            self.app.delete(f'/students/{student_id}', headers=self.headers)
+
+    def test_18_related_resources(self):
+        print("\n[TEST] Testing Departments, Enrollments and expand=...")
+        response = self.app.get('/departments?limit=2', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len(data['departments']), 2)
+        self.assertIsNotNone(data['next'])
+        response = self.app.get('/departments/1', headers=self.headers)
+        self.assertEqual(json.loads(response.data)['department']['dept_id'], 1)
+        self.assertEqual(self.app.get('/courses/99999999', headers=self.headers).status_code, 404)
+        self.assertEqual(self.app.get('/courses?dept_id=abc', headers=self.headers).status_code, 400)
+
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+        response = self.app.get(f'/students/{self.test_student_id}/enrollments', headers=self.headers)
+        self.assertEqual(json.loads(response.data), {'student_id': self.test_student_id, 'enrollments': []})
+        self.assertEqual(self.app.get('/students/99999999/enrollments', headers=self.headers).status_code, 404)
+
+        response = self.app.get(f'/students/{self.test_student_id}?expand=department,enrollments', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
+        student = json.loads(response.data)['student']
+        self.assertEqual(student['department']['dept_id'], 1)
+        self.assertEqual(student['enrollments'], [])
+        # The cached row is not changed by expansion.
+        student = json.loads(self.app.get(f'/students/{self.test_student_id}', headers=self.headers).data)['student']
+        self.assertNotIn('department', student)
+
+        response = self.app.get(f'/students?ids={self.test_student_id}&expand=department', headers=self.headers)
+        self.assertEqual(json.loads(response.data)['students'][0]['department']['dept_id'], 1)
+        response = self.app.get('/students?limit=5&expand=department', headers=self.headers)
+        self.assertTrue(all('department' in s for s in json.loads(response.data)['students']))
+        self.assertEqual(self.app.get('/students?expand=friends', headers=self.headers).status_code, 400)
+        response = self.app.get('/students?fields=student_name&expand=department', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+    def test_19_stats(self):
+        print("\n[TEST] Testing Aggregate Stats...")
+        def stats(path):
+            # The first read starts the rebuild in the background and gets 503 until it is done.
+            for _ in range(100):
+                response = self.app.get(path, headers=self.headers)
+                if response.status_code != 503:
+                    return response
+                self.assertEqual(response.headers['Retry-After'], '1')
+                time.sleep(0.05)
+            return response
+
+        def dept_one():
+            data = json.loads(stats('/stats/departments').data)
+            self.assertIn('age_seconds', data['staleness'])
+            return next((d for d in data['departments'] if d['dept_id'] == 1), {'student_count': 0})
+
+        before = dept_one()['student_count']
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+        self.assertEqual(dept_one()['student_count'], before + 1)
+        self.app.patch(f'/students/{self.test_student_id}', headers=self.headers, json={'dept_id': 2})
+        self.assertEqual(dept_one()['student_count'], before)
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+        response = stats('/stats/courses?semester=1st')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertTrue(all(c['semester'] == '1st' for c in data['courses']))
+        self.assertIn('refreshed_at', data['staleness'])
+
+    def test_20_bulk_new_id_collision(self):
+        print("\n[TEST] Retrying bulk rows whose reserved ID was taken...")
+        import app as api
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+        # A reserved block that still contains the explicitly created ID.
+        allocate = api.students.allocate_ids
+        handed_out = []
+        def stale_block(count):
+            ids = [self.test_student_id] * count if not handed_out else allocate(count)
+            handed_out.extend(ids)
+            return ids
+        api.students.allocate_ids = stale_block
+        try:
+            response = self.app.post('/students/bulk?upsert=1', headers=self.headers, json=[
+                {'student_name': 'New ID', 'year_level': 1, 'gpa': 3.0, 'dept_id': 1},
+            ])
+        finally:
+            del api.students.allocate_ids
+        data = json.loads(response.data)
+        print(f"   Response: {response.status_code} - {response.data.decode()}")
+        self.assertEqual(data['created'], 1)
+        new_id = data['results'][0]['student_id']
+        self.assertNotEqual(new_id, self.test_student_id)
+        # The explicit row was not upserted over.
+        student = json.loads(self.app.get(f'/students/{self.test_student_id}', headers=self.headers).data)['student']
+        self.assertEqual(student['student_name'], 'Test Student')
+        self.app.delete(f'/students/{new_id}', headers=self.headers)
+        self.app.delete(f'/students/{self.test_student_id}', headers=self.headers)
+
+    def test_21_run_tests_isolated(self):
+        print("\n[TEST] Restricting admin test runs to shipped modules and a clean environment...")
+        import app as api
+        admin = {'Authorization': 'Basic ' + base64.b64encode(
+            f'{SystemConfig.API_USERNAME}:{SystemConfig.API_PASSWORD}'.encode()).decode()}
+        for pattern in ('../app.py', 'test_nothing*.py', 'support.py', 7):
+            response = self.app.post('/admin/run-tests', headers=admin, json={'pattern': pattern})
+            self.assertEqual(response.status_code, 400, pattern)
+        os.environ['MYSQL_HOST'] = 'production-db'
+        try:
+            env = api._test_env()
+        finally:
+            del os.environ['MYSQL_HOST']
+        self.assertNotIn('MYSQL_HOST', env)
+        self.assertEqual(env['STORAGE_BACKEND'], 'sqlite')
+
+    def test_22_cached_student_reads(self):
+        print("\n[TEST] Serving cached students without student queries...")
+        from database import timing as query_timing
+        import app as api
+        self.app.post('/students', headers=self.headers, json={
+            'student_id': self.test_student_id, 'student_name': 'Test Student', 'year_level': 1, 'gpa': 4.0, 'dept_id': 1
+        })
+        url = f'/students/{self.test_student_id}'
+        etag = self.app.get(url, headers=self.headers).headers['ETag']
+        queries = []
+
+        def record(query, seconds, rows):
+            # Token revocation syncs run on their own schedule; count student reads only.
+            if query is not None and ('student' in query or 'table_version' in query):
+                queries.append(query)
+
+        query_timing.add_listener(record)
+        try:
+            self.assertEqual(self.app.get(url, headers=self.headers).status_code, 200)
+            response = self.app.get(url, headers=dict(self.headers, **{'If-None-Match': etag}))
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(queries, [])
+
+            # On a miss, only row_version is read before the 304.
+            api.student_cache.invalidate(self.test_student_id)
+            response = self.app.get(url, headers=dict(self.headers, **{'If-None-Match': etag}))
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(len(queries), 1)
+            self.assertIn('SELECT student_id, row_version FROM student', queries[0])
+        finally:
+            query_timing._listeners.remove(record)
+        self.app.delete(url, headers=self.headers)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
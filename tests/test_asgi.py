@@ -0,0 +1,127 @@
+import unittest
+import asyncio
+import json
+import sys
+import threading
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config.config import SystemConfig
+from support import use_test_config
+use_test_config()
+
+try:
+    import asgi
+except ImportError:
+    asgi = None
+
+
+async def call(method, path, query=b'', headers=(), body=b''):
+    # Runs one HTTP request through the ASGI application; returns (status, headers, body).
+    messages = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.sleep(3600)
+        received = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': method, 'scheme': 'http', 'path': path,
+        'root_path': '', 'query_string': query, 'client': ('127.0.0.1', 50000), 'server': ('127.0.0.1', 5000),
+        'headers': [(k.lower().encode(), v.encode()) for k, v in headers]
+                   + ([(b'content-length', str(len(body)).encode())] if body else []),
+    }
+    await asgi.application(scope, receive, send)
+    start = messages[0]
+    return (start['status'], {k.decode(): v.decode() for k, v in start['headers']},
+            b''.join(m.get('body', b'') for m in messages[1:]))
+
+
+@unittest.skipIf(asgi is None, 'asgiref not installed')
+class TestAsgiMode(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        asgi.api.students.write_batch(list(enumerate([
+            (7100001, 'Async Alpha', 1, 3.5, 1),
+            (7100002, 'Async Beta', 2, 2.5, 2),
+        ])))
+        client = asgi.app.test_client()
+        auth = 'Basic ' + __import__('base64').b64encode(
+            f'{SystemConfig.API_USERNAME}:{SystemConfig.API_PASSWORD}'.encode()).decode()
+        cls.token = json.loads(client.post('/login', headers={'Authorization': auth}).data)['token']
+        cls.auth = ('Authorization', f'Bearer {cls.token}')
+
+    @classmethod
+    def tearDownClass(cls):
+        for student_id in (7100001, 7100002):
+            asgi.api.students.delete(student_id)
+
+    def run_request(self, *args, **kwargs):
+        return asyncio.run(call(*args, **kwargs))
+
+    def test_01_native_reads_match_flask(self):
+        print("\n[TEST] Serving native ASGI reads identical to Flask...")
+        client = asgi.app.test_client()
+        for path, query in (('/students/7100001', b''), ('/students', b'limit=5&after=7100000'),
+                            ('/students', b'ids=7100002,7100001,1&fields=student_name'),
+                            ('/students/7100002', b'format=xml')):
+            status, headers, body = self.run_request('GET', path, query, headers=[self.auth])
+            expected = client.get(path + '?' + query.decode(), headers=dict([self.auth]))
+            self.assertEqual(status, expected.status_code, path)
+            self.assertEqual(body, expected.get_data(), path)
+            self.assertEqual(headers.get('etag'), expected.headers.get('ETag'))
+
+    def test_02_auth_not_modified_and_not_found(self):
+        print("\n[TEST] Checking auth, 304 and 404 on the ASGI path...")
+        status, _, body = self.run_request('GET', '/students/7100001')
+        self.assertEqual(status, 401)
+        self.assertEqual(json.loads(body)['message'], 'Token is missing!')
+        status, headers, _ = self.run_request('GET', '/students/7100001', headers=[self.auth])
+        status, _, body = self.run_request('GET', '/students/7100001',
+                                           headers=[self.auth, ('If-None-Match', headers['etag'])])
+        self.assertEqual((status, body), (304, b''))
+        status, _, _ = self.run_request('GET', '/students/99999999', headers=[self.auth])
+        self.assertEqual(status, 404)
+
+    def test_03_other_routes_go_through_wsgi(self):
+        print("\n[TEST] Routing everything else through the WSGI app...")
+        self.assertIsNone(asgi._async_view({'method': 'PATCH', 'path': '/students/1', 'query_string': b''})[0])
+        self.assertIsNone(asgi._async_view({'method': 'GET', 'path': '/students/1',
+                                            'query_string': b'expand=department'})[0])
+        status, _, body = self.run_request('PATCH', '/students/7100002', headers=[
+            self.auth, ('Content-Type', 'application/json')], body=b'{"gpa": 3.0}')
+        self.assertEqual(status, 200, body)
+        status, _, body = self.run_request('GET', '/students/7100002', headers=[self.auth])
+        self.assertEqual(json.loads(body)['student']['gpa'], 3.0)
+
+    def test_04_cache_and_formatting_stay_off_the_loop(self):
+        print("\n[TEST] Running cache and serialization off the event loop...")
+        threads = []
+        cache = asgi.api.student_cache
+        original_get, original_format = cache.get_student, asgi.api.format_response
+
+        def get_student(student_id):
+            threads.append(('cache', threading.current_thread()))
+            return original_get(student_id)
+
+        def format_response(*args, **kwargs):
+            threads.append(('format', threading.current_thread()))
+            return original_format(*args, **kwargs)
+
+        cache.get_student, asgi.api.format_response = get_student, format_response
+        try:
+            status, _, _ = self.run_request('GET', '/students/7100001', headers=[self.auth])
+        finally:
+            cache.get_student, asgi.api.format_response = original_get, original_format
+        self.assertEqual(status, 200)
+        self.assertEqual({kind for kind, _ in threads}, {'cache', 'format'})
+        self.assertNotIn(threading.main_thread(), [thread for _, thread in threads])
+
+
+if __name__ == '__main__':
+    unittest.main()
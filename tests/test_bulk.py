@@ -0,0 +1,71 @@
+import unittest
+import io
+import json
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api.bodies import BodyError, iter_json_array, iter_ndjson
+from database.bulk import write_batch
+from support import FakeConnection
+
+
+def existing_ids(existing):
+    # Answers write_batch's existing-ID lookup.
+    def respond(cursor, query, params):
+        if query.startswith('SELECT'):
+            return [(i,) for i in params if i in existing]
+    return respond
+
+
+def row(student_id):
+    return (student_id, f'Student {student_id}', 1, 3.0, 1)
+
+
+class TestBulkBodies(unittest.TestCase):
+
+    def test_01_json_array_small_chunks(self):
+        print("\n[TEST] Parsing a JSON array in small chunks...")
+        items = [{'student_id': i, 'student_name': 'Ünïcode'} for i in range(20)]
+        raw = json.dumps(items, ensure_ascii=False).encode()
+        self.assertEqual(list(iter_json_array(io.BytesIO(raw), chunk_size=3)), items)
+        # Numbers and whitespace split across chunk boundaries.
+        numbers = [12345, -1.5e3, 2.25e-7, 0]
+        for raw in (json.dumps(numbers), json.dumps(numbers, indent=4)):
+            for chunk_size in (1, 2, 5):
+                self.assertEqual(list(iter_json_array(io.BytesIO(raw.encode()), chunk_size=chunk_size)), numbers)
+
+    def test_02_ndjson(self):
+        print("\n[TEST] Parsing NDJSON...")
+        raw = b'{"student_id": 1}\n\n{"student_id": 2}'
+        self.assertEqual(list(iter_ndjson(io.BytesIO(raw), chunk_size=4)), [{'student_id': 1}, {'student_id': 2}])
+
+    def test_03_malformed(self):
+        print("\n[TEST] Rejecting malformed bodies...")
+        with self.assertRaises(BodyError):
+            list(iter_json_array(io.BytesIO(b'{"student_id": 1}')))
+        for raw in (b'[1,]', b'[1 2]', b'[1', b'[1.]'):
+            with self.assertRaises(BodyError):
+                list(iter_json_array(io.BytesIO(raw), chunk_size=2))
+        with self.assertRaises(BodyError):
+            list(iter_ndjson(io.BytesIO(b'{"student_id": 1}\nnot json')))
+
+
+class TestWriteBatch(unittest.TestCase):
+
+    def test_01_insert_rejects_existing(self):
+        print("\n[TEST] Bulk insert rejects existing and repeated IDs...")
+        conn = FakeConnection(existing_ids({2}))
+        results = write_batch(conn, [(0, row(1)), (1, row(2)), (2, row(1))])
+        self.assertEqual([r['status'] for r in results], ['created', 'rejected', 'rejected'])
+        self.assertEqual(conn.written, [row(1)])
+        self.assertEqual(conn.commits, 1)
+
+    def test_02_upsert_reports_updates(self):
+        print("\n[TEST] Bulk upsert reports created and updated rows...")
+        conn = FakeConnection(existing_ids({2}))
+        results = write_batch(conn, [(0, row(1)), (1, row(2))], upsert=True)
+        self.assertEqual([r['status'] for r in results], ['created', 'updated'])
+        self.assertIn('ON DUPLICATE KEY UPDATE', conn.statements[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import time
+import datetime
+import decimal
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api.cache import MISSING, LRUCache, StudentCache, dumps, loads
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_01_lru_eviction(self):
+        print("\n[TEST] LRU eviction by size...")
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.info()['evictions'], 1)
+
+    def test_02_ttl_expiry(self):
+        print("\n[TEST] TTL expiry...")
+        cache = LRUCache(max_entries=10, ttl=0.01)
+        cache.set('a', 1)
+        time.sleep(0.02)
+        self.assertIs(cache.get('a'), MISSING)
+        self.assertEqual(cache.info()['expirations'], 1)
+
+    def test_03_set_if(self):
+        print("\n[TEST] Compare-and-set against a guard key...")
+        cache = LRUCache(max_entries=10, ttl=60)
+        cache.set('guard', 'g1', ttl=0)
+        self.assertTrue(cache.set_if('guard', 'g1', {'a': 1, 'b': 2}))
+        self.assertFalse(cache.set_if('guard', 'g0', {'a': 3}))
+        self.assertFalse(cache.set_if('missing', 'g1', {'c': 3}))
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, 2, MISSING))
+
+    def test_04_json_values(self):
+        print("\n[TEST] Encoding Redis values as JSON...")
+        payload = (3, {'student': {'student_id': 1, 'gpa': decimal.Decimal('3.50'),
+                                   'updated_at': datetime.datetime(2025, 1, 2, 3, 4, 5)}})
+        raw = dumps(payload)
+        self.assertTrue(raw.startswith(b'[3,'))
+        self.assertEqual(loads(raw), list(payload))
+        self.assertIsInstance(loads(raw)[1]['student']['gpa'], decimal.Decimal)
+
+
+class TestStudentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = StudentCache(LRUCache(max_entries=100, ttl=60))
+
+    def test_01_invalidate_student_and_lists(self):
+        print("\n[TEST] Invalidating a student drops it and all cached lists...")
+        token = self.cache.token()
+        self.cache.set_student(1, {'student': {'student_id': 1}}, token)
+        self.cache.set_student(2, {'student': {'student_id': 2}}, token)
+        self.cache.set_list(('a',), {'students': []}, token)
+
+        self.cache.invalidate(1)
+        token = self.cache.token()
+        self.assertIs(self.cache.get_student(1), MISSING)
+        self.assertEqual(self.cache.get_student(2), {'student': {'student_id': 2}})
+        self.assertIs(self.cache.get_list(('a',), token), MISSING)
+
+    def test_02_stale_set_skipped(self):
+        print("\n[TEST] Reads that raced a write are not cached...")
+        token = self.cache.token()
+        self.cache.invalidate(1)
+        self.cache.set_student(1, {'student': {'student_id': 1}}, token)
+        self.assertIs(self.cache.get_student(1), MISSING)
+
+    def test_03_counters(self):
+        print("\n[TEST] Hit/miss counters...")
+        token = self.cache.token()
+        self.cache.get_student(1)
+        self.cache.set_student(1, {'student': {}}, token)
+        self.cache.get_student(1)
+        stats = self.cache.info()['lookups']
+        self.assertEqual((stats['student_hits'], stats['student_misses']), (1, 1))
+
+    def test_04_batch_get_and_set(self):
+        print("\n[TEST] Batch get/set of students...")
+        token = self.cache.token()
+        self.cache.set_students({1: 'one', 3: 'three'}, token)
+        self.assertEqual(self.cache.get_students([3, 2, 1]), {3: 'three', 1: 'one'})
+        self.cache.invalidate(1)
+        self.cache.set_students({2: 'two'}, token)
+        self.assertEqual(self.cache.get_students([1, 2, 3]), {3: 'three'})
+
+    def test_05_version_poll(self):
+        print("\n[TEST] Dropping a per-process cache when another worker wrote...")
+        self.assertFalse(self.cache.poll_due())
+        self.cache.watch_versions(60)
+        token = self.cache.token()
+        self.cache.set_student(1, {'student': {'student_id': 1}}, token)
+        self.assertTrue(self.cache.poll_due())
+        self.cache.saw_version((5, None))
+        # Throttled: the next check is a poll interval away.
+        self.assertFalse(self.cache.poll_due())
+        self.cache.saw_version((5, None))
+        self.assertEqual(self.cache.get_student(1), {'student': {'student_id': 1}})
+        self.cache.saw_version((6, None))
+        self.assertIs(self.cache.get_student(1), MISSING)
+
+if __name__ == '__main__':
+    unittest.main()
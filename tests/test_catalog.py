@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.catalog import CatalogRepository
+from database.sqlite import SQLiteStudentRepository
+
+DEPARTMENTS = [(1, 'Computer Science'), (2, 'Mathematics')]
+
+
+class TestCatalogRepository(unittest.TestCase):
+    def setUp(self):
+        self.repo = SQLiteStudentRepository(departments=DEPARTMENTS)
+        self.repo.write_batch(list(enumerate([
+            (1, 'Alice Smith', 1, 3.5, 1),
+            (2, 'Bob Smithers', 2, 2.9, 2),
+            (3, 'Carol Jones', 3, 3.1, 1),
+        ])))
+        with self.repo.session() as conn:
+            cur = conn.cursor()
+            cur.executemany("INSERT INTO instructor (instr_id, instr_name, salary, dept_id) VALUES (%s, %s, %s, %s)",
+                            [(1, 'Dr. Reyes', 50000, 1), (2, 'Dr. Cruz', 52000, 2)])
+            cur.executemany("INSERT INTO course (course_id, course_code, title, credits, dept_id) VALUES (%s, %s, %s, %s, %s)",
+                            [(10, 'CS101', 'Programming', 3, 1), (20, 'MA101', 'Calculus', 4, 2)])
+            cur.executemany("INSERT INTO enrollment (enroll_id, student_id, course_id, semester, grade) VALUES (%s, %s, %s, %s, %s)",
+                            [(100, 1, 10, '1st', 1.5), (101, 1, 20, '1st', 2.0), (102, 2, 20, '2nd', 1.25)])
+            conn.commit()
+        # Chunk size 2 so the three-student lookups span several IN (...) queries.
+        self.catalog = CatalogRepository(self.repo, chunk_size=2)
+
+    def tearDown(self):
+        self.repo.close()
+
+    def test_01_pages_filters_and_get(self):
+        print("\n[TEST] Paging, filtering and fetching catalog rows...")
+        page = self.catalog.page('courses', limit=1)
+        self.assertEqual([c['course_id'] for c in page['courses']], [10])
+        self.assertEqual(page['next'], 10)
+        page = self.catalog.page('courses', limit=1, after=page['next'])
+        self.assertEqual([c['course_id'] for c in page['courses']], [20])
+        self.assertIsNone(page['next'])
+        page = self.catalog.page('enrollments', limit=10, filters={'student_id': 1, 'course_id': 20})
+        self.assertEqual([e['enroll_id'] for e in page['enrollments']], [101])
+        self.assertEqual(self.catalog.get('departments', 2), {'dept_id': 2, 'dept_name': 'Mathematics'})
+        self.assertIsNone(self.catalog.get('instructors', 99))
+        self.assertEqual(set(self.catalog.get_many('departments', [1, 2, 3])), {1, 2})
+
+    def test_02_student_enrollments_joined(self):
+        print("\n[TEST] Joining a student's enrollments with their courses...")
+        enrollments = self.catalog.student_enrollments(1)
+        self.assertEqual([e['enroll_id'] for e in enrollments], [100, 101])
+        self.assertEqual(enrollments[1]['course'], {
+            'course_id': 20, 'course_code': 'MA101', 'title': 'Calculus', 'credits': 4,
+            'department': {'dept_id': 2, 'dept_name': 'Mathematics'},
+        })
+        self.assertEqual(self.catalog.student_enrollments(3), [])
+        self.assertIsNone(self.catalog.student_enrollments(99))
+
+    def test_03_expand_students_batches_queries(self):
+        print("\n[TEST] Expanding a page of students with batched queries...")
+        rows = [self.repo.get(i) for i in (1, 2, 3)]
+        queries = []
+        fetch = self.catalog._fetch
+
+        def counting_fetch(query, params=()):
+            queries.append(query)
+            return fetch(query, params)
+
+        self.catalog._fetch = counting_fetch
+        expanded = self.catalog.expand_students(rows, ('department', 'enrollments'))
+        # One query per chunk and relation: 1 department chunk (2 IDs) + 2 student chunks.
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(expanded[1]['department'], {'dept_id': 2, 'dept_name': 'Mathematics'})
+        self.assertEqual([e['enroll_id'] for e in expanded[0]['enrollments']], [100, 101])
+        self.assertEqual(expanded[2]['enrollments'], [])
+        # The input rows (possibly cache entries) are not modified.
+        self.assertNotIn('department', rows[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
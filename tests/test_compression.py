@@ -0,0 +1,100 @@
+import unittest
+import datetime
+import gzip
+import json
+import zlib
+import sys
+import os
+from decimal import Decimal
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from flask import Flask
+from werkzeug.http import parse_accept_header
+from werkzeug.wrappers import Response
+from api.compression import available_encoders, compress_response
+from api.jsonenc import create_dumps
+
+ENCODERS = available_encoders(['gzip'])
+BODY = json.dumps({'students': [{'student_id': i, 'student_name': f'Student {i}'} for i in range(200)]})
+
+
+def accept(header):
+    return parse_accept_header(header)
+
+
+class TestCompression(unittest.TestCase):
+    def test_01_large_body_is_gzipped(self):
+        print("\n[TEST] Gzipping a large JSON body...")
+        response = Response(BODY, mimetype='application/json')
+        response.set_etag('student-3-json')
+        response = compress_response(response, accept('gzip, deflate'), ENCODERS)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.vary)
+        self.assertEqual(gzip.decompress(response.get_data()).decode(), BODY)
+        self.assertLess(response.content_length, len(BODY))
+        self.assertEqual(response.get_etag(), ('student-3-json', True))
+
+    def test_02_small_or_unaccepted_bodies_are_left_alone(self):
+        print("\n[TEST] Leaving small or unaccepted bodies uncompressed...")
+        response = compress_response(Response('{"message": "ok"}', mimetype='application/json'),
+                                     accept('gzip'), ENCODERS)
+        self.assertNotIn('Content-Encoding', response.headers)
+        response = compress_response(Response(BODY, mimetype='application/json'), accept('identity'), ENCODERS)
+        self.assertNotIn('Content-Encoding', response.headers)
+        response = compress_response(Response(BODY, mimetype='image/png'), accept('gzip'), ENCODERS)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_03_unavailable_codecs_are_not_negotiated(self):
+        print("\n[TEST] Negotiating only codecs that are installed...")
+        encoders = available_encoders(['br', 'zstd', 'gzip'])
+        self.assertIn('gzip', encoders)
+        response = compress_response(Response(BODY, mimetype='application/json'), accept('br;q=1.0, gzip;q=0.5'),
+                                     encoders)
+        self.assertIn(response.headers['Content-Encoding'], encoders)
+
+    def test_04_streamed_body_is_compressed_incrementally(self):
+        print("\n[TEST] Compressing a streamed body chunk by chunk...")
+        closed = []
+
+        def chunks():
+            try:
+                for i in range(5):
+                    yield f'{{"row": {i}}}\n'
+            finally:
+                closed.append(True)
+
+        response = compress_response(Response(chunks(), mimetype='application/x-ndjson'), accept('gzip'), ENCODERS)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        decoder = zlib.decompressobj(31)
+        first = next(iter(response.response))
+        # The first chunk decodes on its own; the client does not wait for the whole body.
+        self.assertEqual(decoder.decompress(first), b'{"row": 0}\n')
+        rest = b''.join(response.response)
+        self.assertEqual(decoder.decompress(rest).decode().splitlines()[-1], '{"row": 4}')
+        response.close()
+        self.assertEqual(closed, [True])
+
+
+class TestFastJson(unittest.TestCase):
+    def test_01_orjson_matches_flask_provider(self):
+        print("\n[TEST] Matching Flask's JSON output with orjson...")
+        app = Flask(__name__)
+        try:
+            dumps = create_dumps('orjson', app.json.default)
+        except ImportError:
+            self.skipTest('orjson not installed')
+        data = {'students': [{'student_id': 1, 'gpa': Decimal('3.50'), 'student_name': 'Zoë'},
+                             {'student_id': 2, 'gpa': 3.0, 'student_name': 'Al'}],
+                'next': None, 'updated_at': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)}
+        with app.app_context():
+            expected = app.json.response(data).get_data()
+        self.assertEqual(json.loads(dumps(data)), json.loads(expected))
+        self.assertIn(b'"gpa":"3.50"', dumps(data))
+        self.assertIn(b'"gpa":3.0', dumps(data))
+
+    def test_02_stdlib_keeps_jsonify(self):
+        print("\n[TEST] Keeping jsonify with the stdlib encoder...")
+        self.assertIsNone(create_dumps('stdlib', None))
+
+
+if __name__ == '__main__':
+    unittest.main()
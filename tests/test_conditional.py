@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import datetime
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from flask import Flask, make_response, request
+from api.conditional import Validators
+from database.versions import TableVersions
+from support import FakeConnection
+
+
+UPDATED_AT = datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+
+
+def version_row(cursor, query, params):
+    # version, updated_at and the database clock a second later.
+    return [(7, UPDATED_AT.replace(tzinfo=None), (UPDATED_AT + datetime.timedelta(seconds=1)).replace(tzinfo=None))]
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.validators = Validators('student-7-json', UPDATED_AT, 7)
+
+    def test_01_if_none_match(self):
+        print("\n[TEST] If-None-Match...")
+        with self.app.test_request_context(headers={'If-None-Match': '"student-7-json"'}):
+            self.assertTrue(self.validators.not_modified(request))
+        with self.app.test_request_context(headers={'If-None-Match': '"student-6-json"'}):
+            self.assertFalse(self.validators.not_modified(request))
+
+    def test_02_if_modified_since(self):
+        print("\n[TEST] If-Modified-Since...")
+        with self.app.test_request_context(headers={'If-Modified-Since': 'Thu, 02 Jan 2025 03:04:05 GMT'}):
+            self.assertTrue(self.validators.not_modified(request))
+        with self.app.test_request_context(headers={'If-Modified-Since': 'Thu, 02 Jan 2025 03:04:04 GMT'}):
+            self.assertFalse(self.validators.not_modified(request))
+
+    def test_03_apply_headers(self):
+        print("\n[TEST] ETag and Last-Modified headers...")
+        with self.app.test_request_context():
+            response = self.validators.apply(make_response('', 304))
+            self.assertEqual(response.headers['ETag'], '"student-7-json"')
+            self.assertEqual(response.headers['Last-Modified'], 'Thu, 02 Jan 2025 03:04:05 GMT')
+
+    def test_04_table_versions(self):
+        print("\n[TEST] Reading and disabling table versions...")
+        versions = TableVersions()
+        self.assertEqual(versions.get(FakeConnection(version_row), 'student'), (7, UPDATED_AT))
+        self.assertIsNone(versions.get(FakeConnection(error=Exception(1146, "Table doesn't exist")), 'student'))
+        self.assertFalse(versions.enabled)
+
+    def test_05_last_modified_waits_for_the_second(self):
+        print("\n[TEST] Withholding Last-Modified until its second is over...")
+        versions = TableVersions()
+        changed = UPDATED_AT.replace(microsecond=250000, tzinfo=None)
+        self.assertEqual(versions.state((7, changed, changed.replace(microsecond=900000))), (7, None))
+        self.assertEqual(versions.state((7, changed, changed + datetime.timedelta(seconds=1)))[1],
+                         changed.replace(tzinfo=datetime.timezone.utc))
+
+    def test_06_bump_once(self):
+        print("\n[TEST] Bumping the counter with one statement...")
+        conn = FakeConnection()
+        TableVersions().bump(conn.cursor(), 'student')
+        self.assertEqual(len(conn.statements), 1)
+        self.assertTrue(conn.statements[0].startswith('UPDATE table_version SET version = version + 1'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import json
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import dicttoxml
+from api.export import ndjson_chunks, json_array_chunks, xml_chunks
+
+
+COLUMNS = ['student_id', 'student_name', 'gpa']
+BATCHES = [
+    (COLUMNS, [(1, 'Ann <A&B>', 3.5), (2, 'Ben', None)]),
+    (COLUMNS, [(3, 'Cy', 2.0)]),
+]
+ROWS = [dict(zip(cols, row)) for cols, rows in BATCHES for row in rows]
+
+
+class TestExportChunks(unittest.TestCase):
+
+    def test_01_ndjson(self):
+        print("\n[TEST] Streaming NDJSON...")
+        lines = ''.join(ndjson_chunks(iter(BATCHES), json.dumps)).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], ROWS)
+
+    def test_02_json_array(self):
+        print("\n[TEST] Streaming JSON array...")
+        body = ''.join(json_array_chunks(iter(BATCHES), json.dumps))
+        self.assertEqual(json.loads(body), {'students': ROWS})
+
+    def test_03_json_array_empty(self):
+        print("\n[TEST] Streaming empty JSON array...")
+        body = ''.join(json_array_chunks(iter([]), json.dumps))
+        self.assertEqual(json.loads(body), {'students': []})
+
+    def test_04_xml_matches_dicttoxml(self):
+        print("\n[TEST] Streaming XML compatible with dicttoxml...")
+        body = ''.join(xml_chunks(iter(BATCHES)))
+        expected = dicttoxml.dicttoxml({'students': ROWS}, custom_root='response', attr_type=False)
+        self.assertEqual(body.encode(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import threading
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.ids import IdAllocator
+from database.pool import ConnectionPool
+from database.students import MySQLStudentRepository
+from support import FakeConnection
+
+
+class FakeSequence:
+    # Stands in for the id_sequence table: one lock per database, like the row lock.
+    def __init__(self, max_ids=None, has_table=True):
+        self.max_ids = dict(max_ids or {})
+        self.next_ids = {}
+        self.has_table = has_table
+        self.lock = threading.Lock()
+        self.round_trips = 0
+
+    def respond(self, cursor, query, params):
+        conn = cursor.conn
+        if query.startswith('CREATE TABLE'):
+            self.has_table = True
+        elif query.startswith('INSERT IGNORE'):
+            if not self.has_table:
+                raise Exception(1146, "Table 'id_sequence' doesn't exist")
+            name = params[0]
+            self.next_ids.setdefault(name, self.max_ids.get(name, 0) + 1)
+        elif query.startswith('UPDATE'):
+            count, name = params
+            self.lock.acquire()
+            conn.held = True
+            self.round_trips += 1
+            start = max(self.next_ids[name], self.max_ids.get(name, 0) + 1)
+            self.next_ids[name] = conn.last_insert_id = start + count
+        elif query == 'SELECT LAST_INSERT_ID()':
+            return [(conn.last_insert_id,)]
+
+    def connection(self):
+        return SequenceConnection(self)
+
+
+class SequenceConnection(FakeConnection):
+    # Holds the sequence lock from the UPDATE until commit, like InnoDB.
+    def __init__(self, seq):
+        super().__init__(seq.respond)
+        self.seq = seq
+        self.held = False
+        self.last_insert_id = 0
+
+    def commit(self):
+        super().commit()
+        if self.held:
+            self.held = False
+            self.seq.lock.release()
+
+    def close(self):
+        self.commit()
+        super().close()
+
+
+class RequestDB:
+    # PooledMySQL without Flask: the first use checks out the request's
+    # connection, which is then held until the request ends.
+    def __init__(self, pool):
+        self.pool = pool
+        self._conn = None
+
+    @property
+    def connection(self):
+        if self._conn is None:
+            self._conn = self.pool.connection()
+        return self._conn
+
+
+class TestIdAllocator(unittest.TestCase):
+
+    def test_01_reserve_starts_after_existing_rows(self):
+        print("\n[TEST] Reserving IDs past the existing rows...")
+        allocator = IdAllocator(FakeSequence({'student': 41}).connection)
+        self.assertEqual(allocator.reserve('student', 3), range(42, 45))
+        self.assertEqual(allocator.reserve('student', 2), range(45, 47))
+
+    def test_02_reserve_creates_missing_sequence_table(self):
+        print("\n[TEST] Creating a missing id_sequence table...")
+        seq = FakeSequence(has_table=False)
+        allocator = IdAllocator(seq.connection)
+        self.assertEqual(allocator.reserve('course', 2), range(1, 3))
+        self.assertTrue(seq.has_table)
+
+    def test_03_reserve_skips_explicitly_inserted_ids(self):
+        print("\n[TEST] Skipping explicitly inserted IDs...")
+        seq = FakeSequence({'student': 10})
+        allocator = IdAllocator(seq.connection)
+        allocator.reserve('student', 5)
+        seq.max_ids['student'] = 100
+        self.assertEqual(allocator.reserve('student', 1), range(101, 102))
+
+    def test_04_unknown_table_rejected(self):
+        print("\n[TEST] Rejecting unknown tables...")
+        allocator = IdAllocator(FakeSequence().connection)
+        with self.assertRaises(ValueError):
+            allocator.reserve('users', 1)
+
+    def test_05_allocate_uses_cached_block(self):
+        print("\n[TEST] Handing out IDs from the cached block...")
+        seq = FakeSequence()
+        allocator = IdAllocator(seq.connection, block_size=10)
+        first = allocator.allocate('student', 4)
+        second = allocator.allocate('student', 4)
+        self.assertEqual(first + second, list(range(1, 9)))
+        self.assertEqual(seq.round_trips, 1)
+        allocator.allocate('student', 15)
+        self.assertEqual(seq.round_trips, 2)
+
+    def test_06_discard_drops_cached_block(self):
+        print("\n[TEST] Discarding the cached block...")
+        seq = FakeSequence()
+        allocator = IdAllocator(seq.connection, block_size=10)
+        self.assertEqual(allocator.allocate('student', 2), [1, 2])
+        allocator.discard('student')
+        self.assertEqual(allocator.allocate('student', 1), [11])
+        self.assertEqual(seq.round_trips, 2)
+
+    def test_07_concurrent_reservations_are_disjoint(self):
+        print("\n[TEST] Concurrent reservations stay disjoint...")
+        seq = FakeSequence({'student': 5})
+        allocators = [IdAllocator(seq.connection, block_size=7) for _ in range(4)]
+        results = [[] for _ in allocators]
+
+        def worker(i):
+            for _ in range(25):
+                results[i].extend(allocators[i].allocate('student', 3))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(allocators))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = [i for result in results for i in result]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertTrue(all(i > 5 for i in ids))
+
+    def test_08_blocks_reserved_on_the_request_connection(self):
+        print("\n[TEST] Topping up ID blocks with a pool of one connection...")
+        seq = FakeSequence({'student': 5})
+        pool = ConnectionPool(seq.connection, name='ids_test', size=1, timeout=0.1)
+        db = RequestDB(pool)
+        repo = MySQLStudentRepository(db, id_block_size=1000)
+        db.connection.cursor()  # the request already holds it (auth, version lookup)
+        # The second call outgrows the first block and reserves another.
+        ids = repo.allocate_ids(800) + repo.allocate_ids(400)
+        self.assertEqual(ids, list(range(6, 1206)))
+        self.assertEqual(seq.round_trips, 2)
+        self.assertEqual(pool.stats()['checkouts'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
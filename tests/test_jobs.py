@@ -0,0 +1,166 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api.jobs import Job, JobRunner, run_unittests, matching_test_modules
+
+
+class TestJobRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='api-test-jobs-')
+        self.runner = JobRunner(self.directory, workers=1, history=2)
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+
+    def wait(self, job):
+        list(job.lines(poll=0.01))
+        return self.runner.get(job.id)
+
+    def test_01_job_output_and_result(self):
+        print("\n[TEST] Following job output while it runs...")
+        release = threading.Event()
+
+        def work(job):
+            job.log('first')
+            release.wait(5)
+            job.write('sec')
+            job.write('ond\nthird')
+            return {'ok': True, 'rows': 3}
+
+        job = self.runner.submit('demo', work, {'rows': 3})
+        self.assertEqual(self.runner.get(job.id).info()['params'], {'rows': 3})
+        stream = job.lines(poll=0.01)
+        # Lines are readable while the job is still running.
+        self.assertEqual(next(stream), 'first')
+        release.set()
+        self.assertEqual(list(stream), ['second', 'third'])
+        info = job.info()
+        self.assertEqual(info['status'], 'succeeded')
+        self.assertEqual(info['result'], {'ok': True, 'rows': 3})
+        self.assertEqual(info['output_lines'], 3)
+        self.assertEqual(list(job.lines(2)), ['third'])
+
+    def test_02_failed_jobs(self):
+        print("\n[TEST] Marking raising and unsuccessful jobs failed...")
+        def boom(job):
+            raise RuntimeError('no database')
+
+        raised = self.wait(self.runner.submit('demo', boom))
+        self.assertEqual((raised.status, raised.error), ('failed', 'no database'))
+        self.assertEqual(list(raised.lines()), ['Error: no database'])
+        unsuccessful = self.wait(self.runner.submit('demo', lambda job: {'ok': False}))
+        self.assertEqual(unsuccessful.status, 'failed')
+
+    def test_03_history_limit(self):
+        print("\n[TEST] Dropping finished jobs past the history limit...")
+        done = [self.wait(self.runner.submit('demo', lambda job: None)) for _ in range(3)]
+        self.runner.submit('demo', lambda job: None)
+        self.assertIsNone(self.runner.get(done[0].id))
+        self.assertIsNotNone(self.runner.get(done[2].id))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, done[0].id + '.log')))
+        self.assertIsNone(self.runner.get('../' + done[2].id))
+
+    def test_04_wrap(self):
+        print("\n[TEST] Running jobs inside the wrap callable...")
+        runner = JobRunner(self.directory, wrap=lambda fn: ('wrapped', fn()))
+        job = self.wait(runner.submit('demo', lambda job: 1))
+        runner.shutdown(wait=True)
+        self.assertEqual(job.result, ['wrapped', 1])
+
+    def test_05_shared_between_processes(self):
+        print("\n[TEST] Reading a job from another runner on the same directory...")
+        release = threading.Event()
+
+        def work(job):
+            job.log('from the first worker')
+            release.wait(5)
+            return {'ok': True}
+
+        job = self.runner.submit('demo', work)
+        # A second runner stands in for another serve.py worker process.
+        other = JobRunner(self.directory)
+        try:
+            seen = other.get(job.id)
+            stream = seen.lines(poll=0.01)
+            self.assertEqual(next(stream), 'from the first worker')
+            self.assertEqual([j.id for j in other.jobs()], [job.id])
+            release.set()
+            self.assertEqual(list(stream), [])
+            self.assertEqual(other.get(job.id).info()['status'], 'succeeded')
+        finally:
+            release.set()
+            other.shutdown(wait=True)
+
+    def test_06_dead_worker(self):
+        print("\n[TEST] Failing a job whose worker process has exited...")
+        job = Job.create(self.directory, 'demo', {})
+        job.state['pid'] = 2 ** 22 + 1
+        job._start()
+        job.state['pid'] = 2 ** 22 + 1
+        job._save()
+        info = self.runner.get(job.id).info()
+        self.assertEqual(info['status'], 'failed')
+        self.assertEqual(list(self.runner.get(job.id).lines()), [])
+
+    def test_07_following_output_times_out(self):
+        print("\n[TEST] Following a running job's output stops after the timeout...")
+        release = threading.Event()
+
+        def work(job):
+            job.log('first')
+            release.wait(5)
+            job.log('second')
+
+        job = self.runner.submit('demo', work)
+        try:
+            self.assertEqual(list(job.lines(poll=0.01, timeout=0.2)), ['first'])
+            self.assertEqual(self.runner.get(job.id).status, 'running')
+        finally:
+            release.set()
+        # A follower resumes from the lines it has read.
+        self.assertEqual(list(job.lines(1, poll=0.01, timeout=5)), ['second'])
+
+
+class TestRunUnittests(unittest.TestCase):
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='api-test-jobs-')
+
+    def test_01_shards(self):
+        print("\n[TEST] Running test shards in child processes...")
+        for shards in (1, 2):
+            job = Job.create(self.directory, 'tests', {})
+            summary = run_unittests(job, start_dir=self.tests_dir, modules=['test_cache'], shards=shards,
+                                    env=dict(os.environ, STORAGE_BACKEND='sqlite'))
+            job._finish('succeeded')
+            output = list(job.lines())
+            self.assertTrue(summary['ok'], output)
+            self.assertGreater(summary['tests'], 0)
+            self.assertEqual(summary['failures'] + summary['errors'], 0)
+            self.assertTrue(any('[TEST]' in line for line in output))
+            if shards > 1:
+                self.assertTrue(any(line.startswith('[shard 1] ') for line in output))
+
+    def test_02_module_allowlist(self):
+        print("\n[TEST] Selecting only shipped test modules...")
+        self.assertEqual(matching_test_modules(self.tests_dir, 'test_jobs.py'), ['test_jobs'])
+        modules = matching_test_modules(self.tests_dir, '*')
+        self.assertIn('test_api', modules)
+        self.assertNotIn('support', modules)
+        self.assertNotIn('insert_data', modules)
+        self.assertEqual(matching_test_modules(self.tests_dir, 'nothing_*.py'), [])
+
+    def test_03_failures_are_reported(self):
+        print("\n[TEST] Reporting a shard that cannot load its module...")
+        job = Job.create(self.directory, 'tests', {})
+        summary = run_unittests(job, start_dir=self.tests_dir, modules=['test_does_not_exist'], shards=1)
+        job._finish('failed')
+        self.assertFalse(summary['ok'])
+        self.assertEqual(summary['errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.load import compare, percentile, run_phase, summarize
+
+
+class FakeClient:
+    def __init__(self, statuses):
+        self.statuses = statuses
+
+    def request(self, method, path, headers, body=None):
+        return self.statuses.get(path, 200), b'{}'
+
+
+class TestLoadBenchmark(unittest.TestCase):
+
+    def test_01_percentile_nearest_rank(self):
+        print("\n[TEST] Nearest-rank percentiles...")
+        values = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 0.05)
+        self.assertEqual(percentile(values, 95), 0.095)
+        self.assertEqual(percentile(values, 99), 0.099)
+        self.assertEqual(percentile([0.2], 99), 0.2)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_02_summarize(self):
+        print("\n[TEST] Summarizing a phase...")
+        summary = summarize([0.002, 0.001, 0.003, 0.004], errors=1, seconds=0.5)
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['throughput'], 8.0)
+        self.assertEqual(summary['p50_ms'], 2.0)
+        self.assertEqual(summary['max_ms'], 4.0)
+        self.assertEqual(summary['errors'], 1)
+
+    def test_03_run_phase_counts_unexpected_statuses(self):
+        print("\n[TEST] Counting unexpected statuses as errors...")
+        client = FakeClient({'/missing': 404})
+        requests = [('GET', '/ok', {}, None)] * 5 + [('GET', '/missing', {}, None)] * 2
+        result = run_phase(client, requests, concurrency=3, expected=(200,))
+        self.assertEqual(result['requests'], 7)
+        self.assertEqual(result['errors'], 2)
+
+    def test_04_compare_flags_regressions_beyond_threshold(self):
+        print("\n[TEST] Flagging regressions beyond the threshold...")
+        baseline = {
+            'list:json': {'throughput': 1000.0, 'p95_ms': 10.0},
+            'single:xml': {'throughput': 500.0, 'p95_ms': 4.0},
+        }
+        results = {
+            'list:json': {'throughput': 950.0, 'p95_ms': 10.5},
+            'single:xml': {'throughput': 400.0, 'p95_ms': 5.0},
+            'create:json': {'throughput': 10.0, 'p95_ms': 100.0},
+        }
+        regressions = compare(results, baseline, threshold=0.10)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(r.startswith('single:xml') for r in regressions))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api.metrics import Registry, statement_kind
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_01_histogram_exposition(self):
+        print("\n[TEST] Histogram exposition...")
+        histogram = self.registry.histogram('latency_seconds', 'Latency.', labels=('route',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, '/students')
+        histogram.observe(0.5, '/students')
+        histogram.observe(5, '/students')
+        text = self.registry.render()
+        self.assertIn('# TYPE latency_seconds histogram', text)
+        self.assertIn('latency_seconds_bucket{route="/students",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/students",le="1.0"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/students",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{route="/students"} 3', text)
+
+    def test_02_counter_and_gauge(self):
+        print("\n[TEST] Counter and gauge exposition...")
+        counter = self.registry.counter('slow_total', 'Slow.', labels=('statement',))
+        counter.inc('SELECT')
+        counter.inc('SELECT')
+        self.registry.gauge('pool', 'Pool.', lambda: {('idle',): 3}, labels=('state',))
+        text = self.registry.render()
+        self.assertIn('slow_total{statement="SELECT"} 2', text)
+        self.assertIn('pool{state="idle"} 3', text)
+
+    def test_03_label_escaping(self):
+        print("\n[TEST] Label escaping...")
+        counter = self.registry.counter('c', 'C.', labels=('route',))
+        counter.inc('a"b\\c')
+        self.assertIn('c{route="a\\"b\\\\c"} 1', self.registry.render())
+
+    def test_04_statement_kind(self):
+        print("\n[TEST] Statement kind labels...")
+        self.assertEqual(statement_kind('  select * from student'), 'SELECT')
+        self.assertEqual(statement_kind(b'INSERT INTO student'), 'INSERT')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.pool import ConnectionPool, PoolTimeout
+from support import FakeConnection
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.created = []
+
+        def connect():
+            conn = FakeConnection()
+            self.created.append(conn)
+            return conn
+
+        self.pool = ConnectionPool(connect, name='test_pool', size=2, timeout=0.1)
+
+    def test_01_reuses_connections(self):
+        print("\n[TEST] Reusing pooled connections...")
+        conn = self.pool.connection()
+        conn.close()
+        conn = self.pool.connection()
+        conn.close()
+        self.assertEqual(len(self.created), 1)
+        stats = self.pool.stats()
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['idle'], 1)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_02_checkout_timeout(self):
+        print("\n[TEST] Timing out when the pool is exhausted...")
+        first = self.pool.connection()
+        second = self.pool.connection()
+        with self.assertRaises(PoolTimeout):
+            self.pool.connection()
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+        first.close()
+        second.close()
+
+    def test_03_waiter_gets_released_connection(self):
+        print("\n[TEST] Handing a released connection to a waiting thread...")
+        self.pool.timeout = 2
+        first = self.pool.connection()
+        second = self.pool.connection()
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(self.pool.connection()))
+        waiter.start()
+        first.close()
+        waiter.join(2)
+        self.assertEqual(len(got), 1)
+        self.assertEqual(self.pool.stats()['waits'], 1)
+        got[0].close()
+        second.close()
+
+    def test_04_stale_connection_replaced(self):
+        print("\n[TEST] Replacing connections that fail the idle ping...")
+        self.pool.ping_interval = 0
+        conn = self.pool.connection()
+        self.created[0].fail_ping = True
+        conn.close()
+        conn = self.pool.connection()
+        conn.close()
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual(self.pool.stats()['ping_failures'], 1)
+
+    def test_05_old_connection_recycled(self):
+        print("\n[TEST] Recycling connections past their max age...")
+        self.pool.recycle = 1e-9
+        conn = self.pool.connection()
+        conn.close()
+        conn = self.pool.connection()
+        conn.close()
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(self.pool.stats()['recycled'], 1)
+
+    def test_06_invalidated_connection_discarded(self):
+        print("\n[TEST] Discarding invalidated connections...")
+        conn = self.pool.connection()
+        conn.invalidate()
+        conn.close()
+        self.assertTrue(self.created[0].closed)
+        self.assertEqual(self.pool.stats()['idle'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
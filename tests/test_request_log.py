@@ -0,0 +1,83 @@
+import unittest
+import json
+import logging
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api.request_log import JsonFormatter, parse_sample_rates, restart_listener, setup_logging, stop_listener
+from database import timing
+from support import FakeConnection
+
+
+class TestRequestLogging(unittest.TestCase):
+
+    def test_01_json_formatter(self):
+        print("\n[TEST] Structured JSON log records...")
+        record = logging.LogRecord('api', logging.INFO, __file__, 1, 'request', None, None)
+        record.fields = {'status': 200, 'latency_ms': 1.5}
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry['message'], 'request')
+        self.assertEqual(entry['status'], 200)
+
+    def test_02_sample_rates(self):
+        print("\n[TEST] Parsing log sample rates...")
+        rates = parse_sample_rates('GET /students=0.1, GET /students/<int:student_id>=2')
+        self.assertEqual(rates, {'GET /students': 0.1, 'GET /students/<int:student_id>': 1.0})
+        self.assertEqual(parse_sample_rates(''), {})
+
+    def test_03_queue_listener_flushes(self):
+        print("\n[TEST] Queued records are written on stop...")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'api.log')
+            logger = logging.getLogger('test_request_log')
+            listener = setup_logging(logger, path=path, max_bytes=1024, backup_count=1)
+            logger.info('request', extra={'fields': {'status': 201}})
+            stop_listener(listener)
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+            for handler in listener.handlers:
+                handler.close()
+            with open(path) as f:
+                self.assertEqual(json.loads(f.readline())['status'], 201)
+
+    def test_04_query_timing(self):
+        print("\n[TEST] Timing DB calls for the current request...")
+        stats = timing.begin()
+        cur = timing.TimedCursor(FakeConnection(lambda cursor, query, params: [(1,), (2,)]).cursor())
+        cur.execute("SELECT 1")
+        cur.fetchall()
+        self.assertEqual(stats.queries, 1)
+        self.assertEqual(stats.rows, 2)
+        self.assertGreaterEqual(stats.seconds, 0)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs fork()')
+    def test_05_listener_restarted_after_fork(self):
+        print("\n[TEST] A forked worker logs through a new listener...")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'api.log')
+            logger = logging.getLogger('test_request_log_fork')
+            listener = setup_logging(logger, path=path, max_bytes=1 << 20, backup_count=1)
+            pid = os.fork()
+            if pid == 0:
+                child = restart_listener(listener)
+                logger.info('child', extra={'fields': {'pid': os.getpid()}})
+                stop_listener(child)
+                stop_listener(listener)
+                os._exit(0 if child is not listener and not listener.running else 1)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(status, 0)
+            logger.info('parent')
+            stop_listener(listener)
+            stop_listener(listener)
+            self.assertFalse(listener.running)
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+            for handler in listener.handlers:
+                handler.close()
+            with open(path) as f:
+                messages = sorted(json.loads(line)['message'] for line in f)
+            self.assertEqual(messages, ['child', 'parent'])
+
+if __name__ == '__main__':
+    unittest.main()
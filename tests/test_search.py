@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.search import TrigramIndex, escape_like, fulltext_phrase
+
+
+class TestTrigramIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TrigramIndex()
+        self.index.rebuild([(1, 'Ann Smith'), (2, 'Bob Smithers'), (3, 'Carl Jones'), (4, 'Al')])
+
+    def test_01_substring_search(self):
+        print("\n[TEST] Trigram substring search...")
+        self.assertEqual(self.index.search('smith'), [1, 2])
+        self.assertEqual(self.index.search('ONES'), [3])
+        self.assertEqual(self.index.search('zzz'), [])
+
+    def test_02_short_terms(self):
+        print("\n[TEST] Trigram search with terms shorter than a trigram...")
+        self.assertEqual(self.index.search('mi'), [1, 2])
+        self.assertEqual(self.index.search('al'), [4])
+
+    def test_03_incremental_updates(self):
+        print("\n[TEST] Trigram index add/remove...")
+        self.index.add(5, 'Dana Smith')
+        self.index.add(1, 'Ann Lee')
+        self.index.remove(2)
+        self.assertEqual(self.index.search('smith'), [5])
+
+    def test_04_relevance(self):
+        print("\n[TEST] Trigram relevance ordering...")
+        self.index.add(6, 'Smith')
+        self.assertEqual(self.index.rank('smith', self.index.search('smith')), [6, 1, 2])
+
+    def test_05_refresh_only_when_stale(self):
+        print("\n[TEST] Trigram index refresh...")
+        loads = []
+        self.index.refresh(lambda: loads.append(1) or [])
+        self.assertEqual(loads, [])
+        self.index.ttl = -1
+        self.index.refresh(lambda: loads.append(1) or [(9, 'New Name')])
+        self.assertEqual(loads, [1])
+        self.assertEqual(self.index.search('new'), [9])
+
+    def test_06_background_refresh(self):
+        print("\n[TEST] Trigram index rebuilt on a background thread...")
+        index = TrigramIndex()
+        release, done = threading.Event(), threading.Event()
+
+        def run():
+            index.refresh(lambda: release.wait(5) and [(1, 'Alice')])
+            done.set()
+
+        # Nothing to search until the first build; the caller does not wait for it.
+        self.assertFalse(index.refresh_in_background(run))
+        release.set()
+        self.assertTrue(done.wait(5))
+        self.assertTrue(index.refresh_in_background(run))
+        self.assertEqual(index.search('lic'), [1])
+
+    def test_07_query_escaping(self):
+        print("\n[TEST] Escaping LIKE and FULLTEXT terms...")
+        self.assertEqual(escape_like('50%_a\\b'), '50\\%\\_a\\\\b')
+        self.assertEqual(fulltext_phrase('O"Neil'), '"O Neil"')
+
+if __name__ == '__main__':
+    unittest.main()
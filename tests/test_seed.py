@@ -0,0 +1,125 @@
+import unittest
+import csv
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from faker import Faker
+from seed import templates
+from seed.generate import chunked, iter_enrollments, iter_students
+from database.sqlite import SQLiteStudentRepository
+from seed.db import sample_student_ids
+from seed.embedded import seed_repository
+from seed.loader import insert_sql, load_table
+from seed.parallel import shard_chunks
+from support import FakeConnection
+
+
+def load_data(cursor, query, params):
+    # LOAD DATA LOCAL INFILE: read the temp CSV back as the loaded rows.
+    if query.startswith('LOAD DATA'):
+        with open(params[0], newline='', encoding='utf-8') as f:
+            rows = [tuple(r) for r in csv.reader(f)]
+        cursor.conn.written.extend(rows)
+        cursor.rowcount = len(rows)
+
+
+def students(seed, count=20):
+    Faker.seed(seed)
+    return list(iter_students(start_id=1, count=count, departments=templates.departments(),
+                              faker=Faker(), rng=random.Random(seed)))
+
+
+class TestSeedPipeline(unittest.TestCase):
+
+    def test_01_chunked(self):
+        print("\n[TEST] Chunking a row stream...")
+        self.assertEqual(list(chunked(iter(range(5)), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_02_reproducible(self):
+        print("\n[TEST] Same seed gives the same rows...")
+        self.assertEqual(students(7), students(7))
+        self.assertNotEqual(students(7), students(8))
+
+    def test_03_enrollments_use_id_ranges(self):
+        print("\n[TEST] Enrollments draw from an ID range...")
+        rows = list(iter_enrollments(start_id=10, count=50, student_ids=range(100, 110),
+                                     course_ids=[1, 2], rng=random.Random(0)))
+        self.assertEqual([r[0] for r in rows], list(range(10, 60)))
+        self.assertTrue(all(100 <= r[1] < 110 for r in rows))
+
+    def test_04_load_executemany(self):
+        print("\n[TEST] Loading chunks with executemany...")
+        conn = FakeConnection()
+        rows = students(0, count=5)
+        total = load_table(conn, 'student', chunked(iter(rows), 2), method='executemany')
+        self.assertEqual(total, 5)
+        self.assertEqual(conn.written, rows)
+        self.assertEqual(conn.commits, 4)
+        self.assertEqual(conn.statements[0], insert_sql('student'))
+
+    def test_05_load_data_csv(self):
+        print("\n[TEST] Loading chunks through LOAD DATA temp CSVs...")
+        conn = FakeConnection(load_data)
+        rows = [(1, 'O\'Brien, "Jr"', 1, 3.5, 1)]
+        load_table(conn, 'student', [rows], method='load-data')
+        self.assertTrue(conn.statements[0].startswith('LOAD DATA LOCAL INFILE'))
+        self.assertEqual(conn.written, [tuple(str(v) for v in rows[0])])
+
+    def test_06_shards_independent_of_workers(self):
+        print("\n[TEST] Sharded generation is identical for any worker count...")
+        departments = templates.departments()
+        for fast in (False, True):
+            kwargs = dict(seed=3, start_id=1, count=25, context=departments, fast=fast, shard_size=10)
+            serial = [row for shard in shard_chunks('student', workers=1, **kwargs) for row in shard]
+            parallel = [row for shard in shard_chunks('student', workers=2, **kwargs) for row in shard]
+            self.assertEqual(serial, parallel)
+            self.assertEqual([r[0] for r in serial], list(range(1, 26)))
+
+    def test_07_fast_enrollments(self):
+        print("\n[TEST] Fast-path enrollment shards...")
+        context = (range(100, 110), [1, 2])
+        shards = list(shard_chunks('enrollment', seed=0, start_id=1, count=15, context=context, fast=True, shard_size=10))
+        self.assertEqual([len(s) for s in shards], [10, 5])
+        self.assertTrue(all(100 <= r[1] < 110 for s in shards for r in s))
+
+    def test_08_counts_inserted_rows(self):
+        print("\n[TEST] Reporting the rows the server inserted...")
+        def skip_duplicates(cursor, query, params):
+            load_data(cursor, query, params)
+            cursor.rowcount = 1
+        conn = FakeConnection(skip_duplicates)
+        rows = [(1, 'Engineering'), (2, 'Science')]
+        self.assertEqual(load_table(conn, 'department', [rows], method='load-data', ignore=True), 1)
+
+    def test_09_existing_student_ids(self):
+        print("\n[TEST] Sampling real student IDs for enrollments...")
+        conn = FakeConnection(lambda cursor, query, params: [(9,), (2,), (5,)])
+        self.assertEqual(sample_student_ids(conn.cursor(), 3, seed=4), [2, 5, 9])
+        self.assertIn('ORDER BY RAND(%s) LIMIT %s', conn.statements[0])
+
+    def test_10_embedded_seeder(self):
+        print("\n[TEST] Seeding through the repository with reserved IDs...")
+        repo = SQLiteStudentRepository(departments=templates.departments())
+        repo.write_batch([(0, (5, 'Existing', 1, 3.0, 1)), (1, (9, 'Other', 2, 2.0, 1))])
+        reserved = repo.allocate_ids(3)
+        report = seed_repository(repo, instructors=2, students=4, enrollments=6, log=lambda line: None)
+        self.assertEqual({r['table']: r['rows'] for r in report},
+                         {'department': 0, 'instructor': 2, 'course': len(templates.course_titles()),
+                          'student': 4, 'enrollment': 6})
+        # Past the IDs the API already reserved, not MAX(student_id) + 1.
+        ids = [row[0] for _, rows in repo.export_batches(100, ('student_id',)) for row in rows]
+        self.assertEqual(ids, [5, 9] + [reserved[-1] + i for i in range(1, 5)])
+
+        # No students generated: enrollments go to real IDs only.
+        repo.delete(ids[-1])
+        seed_repository(repo, instructors=0, students=0, enrollments=50, log=lambda line: None)
+        with repo.session() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT DISTINCT student_id FROM enrollment WHERE enroll_id > 6")
+            enrolled = {row[0] for row in cur.fetchall()}
+            cur.close()
+        self.assertTrue(enrolled and enrolled <= set(ids[:-1]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from config.config import SystemConfig
+from database import pool as db_pool
+from database.sqlite import SQLiteStudentRepository
+
+try:
+    import serve
+except ImportError:
+    serve = None
+
+
+@unittest.skipIf(serve is None, 'gunicorn not installed')
+class TestLauncher(unittest.TestCase):
+    def test_01_options_follow_config(self):
+        print("\n[TEST] Building server options from the config...")
+        class Config(SystemConfig):
+            SERVER_BIND = '127.0.0.1:8000, unix:/tmp/api.sock'
+            SERVER_WORKERS = 3
+            SERVER_MAX_REQUESTS = 500
+            SERVER_KEEPALIVE = 10
+
+        options = serve.gunicorn_options(Config)
+        self.assertEqual(options['bind'], ['127.0.0.1:8000', 'unix:/tmp/api.sock'])
+        self.assertEqual((options['workers'], options['max_requests'], options['keepalive']), (3, 500, 10))
+        self.assertEqual(options['worker_class'], 'gthread')
+        self.assertIs(options['post_fork'], serve.post_fork)
+        # Every option is one gunicorn accepts.
+        launcher = serve.Launcher(options)
+        self.assertEqual(launcher.cfg.workers, 3)
+        self.assertTrue(launcher.cfg.preload_app)
+
+    def test_02_reload_without_server(self):
+        print("\n[TEST] Reloading when no server is running...")
+        self.assertEqual(serve.reload(os.path.join(tempfile.mkdtemp(), 'missing.pid'), timeout=0), 1)
+
+
+class TestAfterFork(unittest.TestCase):
+    def test_01_pools_are_recreated(self):
+        print("\n[TEST] Recreating connection pools after fork...")
+        parent = db_pool.get_pool('fork_test')
+        db_pool.reset_after_fork()
+        self.assertIsNot(db_pool.get_pool('fork_test'), parent)
+        db_pool.close_pools()
+
+    def test_02_sqlite_reopens_connection(self):
+        print("\n[TEST] Reopening the SQLite connection after fork...")
+        path = os.path.join(tempfile.mkdtemp(), 'fork.db')
+        repo = SQLiteStudentRepository(path, departments=[(1, 'Computer Science')])
+        repo.create((1, 'Alice Smith', 1, 3.5, 1))
+        parent_conn = repo._conn
+        repo.after_fork()
+        self.assertIsNot(repo._conn, parent_conn)
+        self.assertEqual(repo.get(1)['student_name'], 'Alice Smith')
+        repo.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.sqlite import SQLiteStudentRepository
+from database.students import DuplicateStudent, StudentRepository, VersionConflict
+
+DEPARTMENTS = [(1, 'Computer Science'), (2, 'Mathematics')]
+
+
+class TestSQLiteStudentRepository(unittest.TestCase):
+    def setUp(self):
+        self.repo = SQLiteStudentRepository(departments=DEPARTMENTS)
+        rows = [
+            (1, 'Alice Smith', 1, 3.5, 1),
+            (2, 'Bob Smithers', 2, 2.9, 2),
+            (3, 'Carol 100% Real', 3, 3.1, 1),
+            (4, 'Dan Blacksmith', 4, 3.8, 2),
+        ]
+        self.repo.write_batch(list(enumerate(rows)))
+
+    def tearDown(self):
+        self.repo.close()
+
+    def ids(self, page):
+        return [s['student_id'] for s in page['students']]
+
+    def test_01_keyset_pages(self):
+        print("\n[TEST] Paging students by keyset...")
+        first = self.repo.page(limit=3)
+        self.assertEqual(self.ids(first), [1, 2, 3])
+        self.assertEqual(first['next'], 3)
+        second = self.repo.page(limit=3, after=first['next'])
+        self.assertEqual(self.ids(second), [4])
+        self.assertIsNone(second['next'])
+
+    def test_02_search_contains_prefix_and_relevance(self):
+        print("\n[TEST] Searching by substring, prefix and relevance...")
+        self.assertEqual(self.ids(self.repo.page(search='smith', limit=10)), [1, 2, 4])
+        self.assertEqual(self.ids(self.repo.page(search='smith', match='prefix', limit=10)), [])
+        self.assertEqual(self.ids(self.repo.page(search='Bob', match='prefix', limit=10)), [2])
+        # LIKE wildcards in the term are matched literally.
+        self.assertEqual(self.ids(self.repo.page(search='100%', limit=10)), [3])
+        page = self.repo.page(search='smith', by_relevance=True, limit=2)
+        self.assertEqual(self.ids(page), [2, 1])
+        self.assertIsNone(page['next'])
+
+    def test_03_projection(self):
+        print("\n[TEST] Returning only the requested columns...")
+        page = self.repo.page(limit=2, columns=('student_id', 'student_name'))
+        self.assertEqual(page['students'][0], {'student_id': 1, 'student_name': 'Alice Smith'})
+        self.assertEqual(page['next'], 2)
+        self.assertEqual(self.repo.get(4, ('student_id', 'gpa')), {'student_id': 4, 'gpa': 3.8})
+        self.assertEqual(list(self.repo.get_many([3], ('student_id',)).values()), [{'student_id': 3}])
+        columns, rows = next(self.repo.export_batches(10, ('student_id', 'dept_id')))
+        self.assertEqual((columns, rows[0]), (['student_id', 'dept_id'], (1, 1)))
+        with self.assertRaises(ValueError):
+            self.repo.get(1, ('student_id', 'password'))
+
+    def test_04_create_get_update_delete(self):
+        print("\n[TEST] Creating, reading, updating and deleting a student...")
+        self.repo.create((10, 'Eve Adams', 1, 4.0, 1))
+        with self.assertRaises(DuplicateStudent):
+            self.repo.create((10, 'Eve Again', 1, 4.0, 1))
+        self.assertEqual(self.repo.get(10)['student_name'], 'Eve Adams')
+        self.assertEqual(self.repo.update(10, {'gpa': 3.25, 'student_name': 'Eve B. Adams'}), 2)
+        self.assertEqual(self.repo.get(10)['gpa'], 3.25)
+        self.assertIsNone(self.repo.update(99, {'gpa': 1.0}))
+        self.assertTrue(self.repo.delete(10))
+        self.assertFalse(self.repo.delete(10))
+        self.assertIsNone(self.repo.get(10))
+        self.assertEqual(sorted(self.repo.get_many([1, 4, 99])), [1, 4])
+
+    def test_05_versioned_update_and_delete(self):
+        print("\n[TEST] Rejecting stale row versions on update and delete...")
+        self.assertEqual(self.repo.update(1, {'gpa': 3.6}), 2)
+        self.assertEqual(self.repo.update(1, {'gpa': 3.7}, [2]), 3)
+        with self.assertRaises(VersionConflict) as ctx:
+            self.repo.update(1, {'gpa': 1.0}, [2])
+        self.assertEqual(ctx.exception.current_version, 3)
+        self.assertEqual(self.repo.get(1)['gpa'], 3.7)
+        self.assertIsNone(self.repo.update(99, {'gpa': 1.0}, [1]))
+        with self.assertRaises(VersionConflict):
+            self.repo.delete(1, [1, 2])
+        self.assertTrue(self.repo.delete(1, [3]))
+        self.assertFalse(self.repo.delete(1, [3]))
+
+    def test_06_write_batch_upsert(self):
+        print("\n[TEST] Upserting a batch of students...")
+        batch = [(0, (2, 'Bob Updated', 2, 3.0, 2)), (1, (5, 'New Student', 1, 2.0, 1))]
+        results = self.repo.write_batch(batch)
+        self.assertEqual([r['status'] for r in results], ['rejected', 'created'])
+        results = self.repo.write_batch([(0, (2, 'Bob Updated', 2, 3.0, 2))], upsert=True)
+        self.assertEqual(results[0]['status'], 'updated')
+        self.assertEqual(self.repo.get(2)['student_name'], 'Bob Updated')
+        self.assertEqual(self.repo.get(2)['row_version'], 2)
+
+    def test_07_allocate_ids_never_reuses(self):
+        print("\n[TEST] Allocating IDs that are never reused...")
+        first = self.repo.allocate_ids(3)
+        self.assertEqual(first, [5, 6, 7])
+        self.assertEqual(self.repo.allocate_ids(2), [8, 9])
+
+    def test_08_version_counts_writes(self):
+        print("\n[TEST] Bumping the table version on every write...")
+        version, _ = self.repo.version()
+        self.repo.update(1, {'gpa': 2.0})
+        self.repo.delete(2)
+        self.repo.write_batch([(0, (10, 'A', 1, 3.0, 1)), (1, (11, 'B', 1, 3.0, 1))])
+        # One bump per write statement, not per row.
+        self.assertEqual(self.repo.version()[0], version + 3)
+
+    def test_09_export_and_name_rows_stream_in_batches(self):
+        print("\n[TEST] Streaming export and name rows in batches...")
+        batches = list(self.repo.export_batches(3))
+        self.assertEqual([len(rows) for _, rows in batches], [3, 1])
+        self.assertEqual(batches[0][0], ['student_id', 'student_name', 'year_level', 'gpa', 'dept_id', 'row_version'])
+        self.assertEqual([r[0] for r in self.repo.name_rows(2)], [1, 2, 3, 4])
+
+    def test_10_incomplete_backend_fails_at_construction(self):
+        print("\n[TEST] A backend missing a repository method cannot be created...")
+
+        class NoExport(SQLiteStudentRepository):
+            export_batches = StudentRepository.export_batches
+
+        with self.assertRaises(TypeError) as cm:
+            NoExport()
+        self.assertIn('export_batches', str(cm.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from api.tokens import MemoryRevocations, TokenCache, token_digest
+from database.revocations import RevocationTable
+from database.sqlite import SQLiteStudentRepository
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TokenCache(max_entries=2)
+        self.payload = {'user': 'admin', 'exp': time.time() + 60}
+        self.a, self.b, self.c = (token_digest(t) for t in ('a', 'b', 'c'))
+
+    @staticmethod
+    def _eventually(check, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not check() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return check()
+
+    @staticmethod
+    def _close(repo):
+        # Let background revocation refreshes finish before the connection goes.
+        for thread in threading.enumerate():
+            if thread.name == 'revocations-refresh':
+                thread.join()
+        repo.close()
+
+    def test_01_hit_after_put(self):
+        print("\n[TEST] Cached token lookup...")
+        self.assertIsNone(self.cache.get(self.a))
+        self.cache.put(self.a, self.payload)
+        self.assertEqual(self.cache.get(self.a), self.payload)
+        self.assertEqual(self.cache.info()['hits'], 1)
+
+    def test_02_expires_at_exp(self):
+        print("\n[TEST] Cached token expires with the JWT...")
+        self.cache.put(self.a, {'user': 'admin', 'exp': time.time() - 1})
+        self.assertIsNone(self.cache.get(self.a))
+
+    def test_03_bounded(self):
+        print("\n[TEST] Token cache is bounded...")
+        for digest in (self.a, self.b, self.c):
+            self.cache.put(digest, self.payload)
+        self.assertIsNone(self.cache.get(self.a))
+        self.assertEqual(self.cache.info()['evictions'], 1)
+
+    def test_04_revocation(self):
+        print("\n[TEST] Revoked tokens are dropped and rejected...")
+        self.cache.put(self.a, self.payload)
+        self.cache.revoke(self.a, self.payload)
+        self.assertTrue(self.cache.is_revoked(self.a))
+        self.assertIsNone(self.cache.get(self.a))
+
+    def test_05_revocations_shared_between_workers(self):
+        print("\n[TEST] A revocation in one worker reaches the others...")
+        repo = SQLiteStudentRepository()
+        workers = [TokenCache(revocations=RevocationTable(repo, refresh=0)) for _ in range(2)]
+        for cache in workers:
+            cache.put(self.b, self.payload)
+            self.assertFalse(cache.is_revoked(self.b))
+        workers[0].revoke(self.b, self.payload)
+        # The other worker picks it up on its background refresh.
+        self.assertTrue(self._eventually(lambda: workers[1].is_revoked(self.b)))
+        self.assertIsNone(workers[1].get(self.b))
+        # A restarted worker starts from the table.
+        self.assertTrue(TokenCache(revocations=RevocationTable(repo)).is_revoked(self.b))
+        self.assertEqual(workers[1].info()['revoked'], 1)
+        self._close(repo)
+
+    def test_06_revocations_swept_after_exp(self):
+        print("\n[TEST] Expired revocations are swept...")
+        revocations = MemoryRevocations(sweep_interval=0)
+        revocations.add(token_digest('a'), time.time() - 1)
+        revocations.add(token_digest('b'), time.time() + 60)
+        self.assertEqual(revocations.count(), 1)
+        self.assertFalse(revocations.contains(token_digest('a')))
+
+    def test_07_revocation_table_refreshed_off_the_request_thread(self):
+        print("\n[TEST] Revocation checks never wait for the table refresh...")
+        repo = SQLiteStudentRepository()
+        release, threads = threading.Event(), []
+
+        def wrap(fn):
+            threads.append(threading.current_thread().name)
+            release.wait(2)
+            return fn()
+
+        revocations = RevocationTable(repo, refresh=0, wrap=wrap)
+        # The first check loads the table on the caller's thread, once.
+        self.assertFalse(revocations.contains(self.b))
+        self.assertEqual(threads, [])
+        RevocationTable(repo).add(self.b, time.time() + 60)
+        # Later checks answer from the mirror while the refresh is blocked.
+        self.assertFalse(revocations.contains(self.b))
+        self.assertFalse(revocations.contains(self.b))
+        self.assertEqual(threads, ['revocations-refresh'])
+        release.set()
+        self.assertTrue(self._eventually(lambda: revocations.contains(self.b)))
+        self._close(repo)
+
+if __name__ == '__main__':
+    unittest.main()
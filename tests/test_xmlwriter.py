@@ -0,0 +1,59 @@
+import unittest
+import datetime
+import logging
+import sys
+import os
+from decimal import Decimal
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import dicttoxml
+from api.xmlwriter import iter_xml, rows_xml, to_xml
+
+logging.getLogger('dicttoxml').setLevel(logging.WARNING)
+
+
+def reference(data):
+    return dicttoxml.dicttoxml(data, custom_root='response', attr_type=False).decode()
+
+
+STUDENTS = [
+    {'student_id': 1, 'student_name': 'Ann "A" <O\'Neil> & co', 'year_level': 1, 'gpa': Decimal('3.50'), 'dept_id': 1},
+    {'student_id': 2, 'student_name': 'Ben', 'year_level': 2, 'gpa': 2.75, 'dept_id': None},
+    {'student_id': 3, 'student_name': 'Zoë', 'year_level': 4, 'gpa': 4.0, 'dept_id': 3},
+]
+
+
+class TestXmlWriter(unittest.TestCase):
+    def test_01_response_shapes_match_dicttoxml(self):
+        print("\n[TEST] Matching dicttoxml output for every response shape...")
+        shapes = [
+            {'students': STUDENTS, 'next': 3},
+            {'students': [], 'next': None},
+            {'student': STUDENTS[0]},
+            {'message': 'Student <1> not found'},
+            {'created': 1, 'updated': 0, 'rejected': 1, 'results': [
+                {'index': 0, 'student_id': 1, 'status': 'created'},
+                {'index': 1, 'student_id': None, 'status': 'rejected', 'reason': 'Missing field: gpa'},
+            ], 'message': 'bad'},
+            {'ok': True, 'flag': False, 'when': datetime.datetime(2024, 5, 1, 12, 30)},
+            {'nested': {'list': [{'a b': 'x'}, 2]}, '1x': 'odd key'},
+        ]
+        for data in shapes:
+            self.assertEqual(to_xml(data), reference(data))
+
+    def test_02_rows_fast_path(self):
+        print("\n[TEST] Writing row tuples through the fast path...")
+        columns = list(STUDENTS[0])
+        rows = [tuple(s.values()) for s in STUDENTS]
+        body = '<?xml version="1.0" encoding="UTF-8" ?><response><students>' + rows_xml(columns, rows) + '</students></response>'
+        self.assertEqual(body, reference({'students': STUDENTS}))
+
+    def test_03_large_lists_are_chunked(self):
+        print("\n[TEST] Streaming large lists in chunks...")
+        data = {'students': STUDENTS * 5, 'next': None}
+        chunks = list(iter_xml(data, chunk_items=4))
+        self.assertGreater(len(chunks), 5)
+        self.assertEqual(''.join(chunks), reference(data))
+
+
+if __name__ == '__main__':
+    unittest.main()